@@ -0,0 +1,226 @@
+# Software License Agreement (BSD)
+#
+# @author    Luis Camero <lcamero@clearpathrobotics.com>
+# @copyright (c) 2023, Clearpath Robotics, Inc., All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# * Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of Clearpath Robotics nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+from clearpath_config.bandwidth import estimate_bandwidth
+from clearpath_config.clearpath_config import ClearpathConfig
+from clearpath_config.common.utils.yaml import write_yaml
+from clearpath_config.dds_profile import DEFAULTS as PROFILE_DEFAULTS
+from clearpath_config.dds_profile import SEGMENT_SIZE, SHARED_MEMORY
+from clearpath_config.sensors.types.cameras import BaseCamera, Republisher
+from typing import List
+import argparse
+import json
+import os
+import sys
+
+
+# QoS Advisor
+#  - recommends QoS, shared memory and camera republishers for every sensor
+#    topic from its message rate and size (see bandwidth)
+#  - the link is the network between the robot and its remote hosts, local
+#    when the robot is the only host
+#  - camera images are compressed, largest first, until the topics fit in
+#    the share of the link available to sensors
+RELIABLE = "reliable"
+BEST_EFFORT = "best_effort"
+KEEP_LAST = "keep_last"
+
+LOCAL = "local"
+ETHERNET = "ethernet"
+WIFI = "wifi"
+LINK_MBPS = {
+    LOCAL: None,
+    ETHERNET: 1000.0,
+    WIFI: 50.0,
+}
+# Share of the link available to sensor topics
+LINK_SHARE = 0.8
+
+# Messages this large are dropped rather than retransmitted
+LARGE_MESSAGE = 64 * 1024
+# Small messages this frequent tolerate loss
+HIGH_RATE = 50.0
+DEPTH = 10
+
+# Bandwidth of the republished image relative to the raw image
+COMPRESSION = {
+    Republisher.Compress.TYPE: 0.1,
+    Republisher.Theora.TYPE: 0.01,
+}
+REPUBLISHED = "color_image"
+
+MiB = 1024 * 1024
+
+
+def recommend_qos(rate: float, size: int) -> dict:
+    if size >= LARGE_MESSAGE:
+        # Latest sample only, never stall on retransmits
+        reliability, depth = BEST_EFFORT, 1
+    elif rate >= HIGH_RATE:
+        reliability, depth = BEST_EFFORT, DEPTH
+    else:
+        reliability, depth = RELIABLE, DEPTH
+    return {"reliability": reliability, "history": KEEP_LAST, "depth": depth}
+
+
+def get_link(config: ClearpathConfig, link: str = None) -> str:
+    if link is None:
+        link = LOCAL if len(config.system.hosts.get_all()) <= 1 else ETHERNET
+    assert link in LINK_MBPS, (
+        "Link '%s' is invalid, must be one of %s" % (link, list(LINK_MBPS))
+    )
+    return link
+
+
+def recommend_republishers(
+        cameras: dict,
+        topics: List[dict],
+        budget: float
+        ) -> List[dict]:
+    # Raw color image of each camera, largest first
+    images = sorted(
+        (t for t in topics if t["key"] == REPUBLISHED and t["sensor"] in cameras),
+        key=lambda t: t["bandwidth"], reverse=True)
+    total = sum(t["remote_bandwidth"] for t in topics)
+    chosen = {}
+    for _type in COMPRESSION:
+        for image in images:
+            if total <= budget:
+                break
+            bandwidth = image["bandwidth"] * COMPRESSION[_type]
+            total -= image["remote_bandwidth"] - bandwidth
+            image["remote_bandwidth"] = bandwidth
+            chosen[image["sensor"]] = (_type, image)
+    return [{
+        "sensor": sensor,
+        "topic": image["topic"],
+        "republisher": _type,
+        "enabled": cameras[sensor].has_republisher(_type),
+        "bandwidth": image["remote_bandwidth"],
+    } for sensor, (_type, image) in chosen.items()]
+
+
+def recommend_segment_size(size: int) -> int:
+    # Room for a few samples of the largest message, in whole MiB
+    segment = -(-4 * size // MiB) * MiB
+    return max(PROFILE_DEFAULTS[SEGMENT_SIZE], segment)
+
+
+def advise(config: ClearpathConfig, link: str = None) -> dict:
+    link = get_link(config, link)
+    link_mbps = LINK_MBPS[link]
+    estimate = estimate_bandwidth(config)
+    topics = estimate["topics"]
+    for topic in topics:
+        topic["qos"] = recommend_qos(topic["rate"], topic["size"])
+        topic["remote_bandwidth"] = topic["bandwidth"] if link_mbps else 0.0
+    cameras = {
+        s.name: s for s in config.sensors.get_all_sensors() if isinstance(s, BaseCamera)}
+    republishers = []
+    budget = None
+    if link_mbps:
+        budget = link_mbps * LINK_SHARE * 1e6 / 8
+        republishers = recommend_republishers(cameras, topics, budget)
+    remote = sum(t["remote_bandwidth"] for t in topics)
+    for topic in topics:
+        # Topic alone does not fit in the link, e.g. point clouds over wifi
+        topic["over_budget"] = budget is not None and topic["remote_bandwidth"] > budget
+    largest = max((t["size"] for t in topics), default=0)
+    # Shared memory pays off once messages are large
+    shared_memory = largest >= LARGE_MESSAGE
+    profile_options = {SHARED_MEMORY: shared_memory}
+    if shared_memory:
+        profile_options[SEGMENT_SIZE] = recommend_segment_size(largest)
+    return {
+        "serial_number": config.get_serial_number(),
+        "link": link,
+        "link_mbps": link_mbps,
+        "topics": topics,
+        "republishers": republishers,
+        "shared_memory": shared_memory,
+        "profile_options": profile_options,
+        "bandwidth_mbps": estimate["bandwidth_mbps"],
+        "remote_bandwidth_mbps": remote * 8 / 1e6,
+        "over_budget": budget is not None and remote > budget,
+    }
+
+
+def qos_overrides(report: dict) -> dict:
+    # ROS 2 parameter files, one per sensor, applied to all nodes
+    # - nodes only honour overrides of publishers created with overrides enabled
+    overrides = {}
+    for topic in report["topics"]:
+        name = "/" + topic["topic"].lstrip("/")
+        params = overrides.setdefault(topic["sensor"], {
+            "/**": {"ros__parameters": {"qos_overrides": {}}}})
+        params["/**"]["ros__parameters"]["qos_overrides"][name] = {
+            "publisher": dict(topic["qos"])}
+    return overrides
+
+
+def write_qos_overrides(report: dict, directory: str) -> List[str]:
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for sensor, params in qos_overrides(report).items():
+        path = os.path.join(directory, "%s_qos_overrides.yaml" % sensor)
+        write_yaml(path, params)
+        paths.append(path)
+    return paths
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Recommend QoS and transport settings for sensor topics."
+    )
+    parser.add_argument(
+        "path",
+        help="robot.yaml file")
+    parser.add_argument(
+        "-l", "--link", choices=list(LINK_MBPS), default=None,
+        help="link to remote hosts (default: local for one host, otherwise ethernet)")
+    parser.add_argument(
+        "-o", "--output", default="-",
+        help="JSON report file (default: stdout)")
+    parser.add_argument(
+        "-q", "--qos-overrides", default=None,
+        help="directory to write QoS override parameter files to")
+    args = parser.parse_args(argv)
+
+    report = advise(ClearpathConfig(args.path), args.link)
+    if args.qos_overrides:
+        report["qos_overrides"] = write_qos_overrides(report, args.qos_overrides)
+    output = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        output.write(json.dumps(report, indent=2) + "\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 1 if report["over_budget"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,256 @@
+# Software License Agreement (BSD)
+#
+# @author    Luis Camero <lcamero@clearpathrobotics.com>
+# @copyright (c) 2023, Clearpath Robotics, Inc., All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# * Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of Clearpath Robotics nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+from clearpath_config.clearpath_config import ClearpathConfig
+from clearpath_config.sensors.sensors import SensorConfig
+from clearpath_config.sensors.types.cameras import (
+    BaseCamera,
+    FlirBlackfly,
+    IntelRealsense,
+    LuxonisOAKD,
+    StereolabsZed,
+)
+from clearpath_config.sensors.types.lidars_2d import BaseLidar2D, HokuyoUST, SickLMS1XX
+from clearpath_config.sensors.types.lidars_3d import VelodyneLidar
+from clearpath_config.sensors.types.sensor import BaseSensor
+from math import degrees
+from typing import Callable, Dict
+
+
+# Bandwidth Estimator
+#  - message rate and approximate bandwidth of every sensor topic
+#  - rates are the rates declared by each sensor, camera streams use the
+#    frame rate of the camera instance
+#  - message sizes come from a per-model table, topics without an entry use
+#    the size of their message type
+#  - only sensors with launch enabled publish
+BUDGET_MBPS = 1000.0
+
+# Approximate serialized sizes in bytes
+HEADER = 48
+CAMERA_INFO = 350
+IMU = 330
+MAGNETIC_FIELD = 120
+BOOL = 8
+NAV_SAT_FIX = 130
+IMAGE = HEADER + 40
+POINT_CLOUD = HEADER + 80
+LASER_SCAN = HEADER + 40
+
+# Sizes by topic key for models without an entry
+TOPIC_SIZE = {
+    "color_camera_info": CAMERA_INFO,
+    "depth_camera_info": CAMERA_INFO,
+    "imu": IMU,
+    "raw": IMU,
+    "data": IMU,
+    "mag": MAGNETIC_FIELD,
+    "calibrated": BOOL,
+    "fix": NAV_SAT_FIX,
+}
+
+# Bytes per pixel of Blackfly pixel formats
+PIXEL_FORMAT = {
+    FlirBlackfly.MONO_8: 1.0,
+    FlirBlackfly.MONO_16: 2.0,
+    FlirBlackfly.YUV_411_PACKED: 1.5,
+    FlirBlackfly.YUV_422_PACKED: 2.0,
+    FlirBlackfly.YUV_444_PACKED: 3.0,
+    FlirBlackfly.YCBCR_8: 3.0,
+    FlirBlackfly.YCBCR_422_8: 2.0,
+    FlirBlackfly.YCBCR_411_8: 1.5,
+    FlirBlackfly.BGR_8: 3.0,
+    FlirBlackfly.BGRA_8: 4.0,
+    FlirBlackfly.RGB_8_PACKED: 3.0,
+}
+BLACKFLY_RESOLUTION = (1440, 1080)
+
+# ZED resolution presets, AUTO is HD720
+ZED_RESOLUTION = {
+    "AUTO": (1280, 720),
+    "HD2K": (2208, 1242),
+    "HD1080": (1920, 1080),
+    "HD720": (1280, 720),
+    "VGA": (672, 376),
+}
+
+# Angular resolution of 2D lidars in degrees
+LIDAR_2D_RESOLUTION = {
+    HokuyoUST.SENSOR_MODEL: 0.25,
+    SickLMS1XX.SENSOR_MODEL: 0.5,
+}
+
+# Velodyne points per rotation, XYZIRT points
+VELODYNE_POINTS = {
+    VelodyneLidar.VLP_16: 16 * 1808,
+    VelodyneLidar.VLP_32C: 32 * 1808,
+    VelodyneLidar.HDL_32E: 32 * 2170,
+    VelodyneLidar.HDL_64E: 64 * 2083,
+    VelodyneLidar.HDL_64E_S2: 64 * 2083,
+    VelodyneLidar.HDL_64E_S3: 64 * 2083,
+}
+VELODYNE_POINT_STEP = 22
+VELODYNE_SCAN_POINTS = 1808
+
+
+def image(width: int, height: int, pixel: float) -> int:
+    return int(IMAGE + width * height * pixel)
+
+
+def points(count: int, step: int = 16) -> int:
+    return POINT_CLOUD + count * step
+
+
+def blackfly_pixel(encoding: str) -> float:
+    if encoding in PIXEL_FORMAT:
+        return PIXEL_FORMAT[encoding]
+    # Bayer and mono variants by bit depth
+    if "16" in encoding:
+        return 2.0
+    if "12" in encoding:
+        return 1.5
+    return 1.0
+
+
+def lidar_2d_scan(lidar: BaseLidar2D) -> int:
+    resolution = LIDAR_2D_RESOLUTION.get(lidar.SENSOR_MODEL, 0.25)
+    span = degrees(lidar.get_max_angle() - lidar.get_min_angle())
+    # Ranges and intensities
+    return LASER_SCAN + (int(span / resolution) + 1) * 8
+
+
+def zed_resolution(zed: StereolabsZed) -> tuple:
+    return ZED_RESOLUTION.get(zed.resolution, ZED_RESOLUTION["AUTO"])
+
+
+# Message Size Table
+# - model -> topic key -> size of one message in bytes
+SIZE: Dict[str, Dict[str, Callable[[BaseSensor], int]]] = {
+    IntelRealsense.SENSOR_MODEL: {
+        "color_image": lambda s: image(s.get_color_width(), s.get_color_height(), 3),
+        "depth_image": lambda s: image(s.get_depth_width(), s.get_depth_height(), 2),
+        "points": lambda s: points(s.get_depth_width() * s.get_depth_height()),
+    },
+    StereolabsZed.SENSOR_MODEL: {
+        "color_image": lambda s: image(*zed_resolution(s), 4),
+        "depth_image": lambda s: image(*zed_resolution(s), 4),
+        "points": lambda s: points(zed_resolution(s)[0] * zed_resolution(s)[1]),
+    },
+    LuxonisOAKD.SENSOR_MODEL: {
+        "color_image": lambda s: image(s.width, s.height, 3),
+    },
+    FlirBlackfly.SENSOR_MODEL: {
+        "color_image": lambda s: image(*BLACKFLY_RESOLUTION, blackfly_pixel(s.get_encoding())),
+    },
+    HokuyoUST.SENSOR_MODEL: {
+        "scan": lidar_2d_scan,
+    },
+    SickLMS1XX.SENSOR_MODEL: {
+        "scan": lidar_2d_scan,
+    },
+    VelodyneLidar.SENSOR_MODEL: {
+        "points": lambda s: points(
+            VELODYNE_POINTS.get(s.get_device_type(), 32 * 1808), VELODYNE_POINT_STEP),
+        "scan": lambda s: LASER_SCAN + VELODYNE_SCAN_POINTS * 8,
+    },
+}
+
+# Topics disabled by a camera setting
+REALSENSE_ENABLED = {
+    "color_image": IntelRealsense.get_color_enabled,
+    "color_camera_info": IntelRealsense.get_color_enabled,
+    "depth_image": IntelRealsense.get_depth_enabled,
+    "depth_camera_info": IntelRealsense.get_depth_enabled,
+    "points": IntelRealsense.get_pointcloud_enabled,
+}
+
+
+def topic_rate(sensor: BaseSensor, topic: str) -> float:
+    # Camera streams run at the frame rate of this camera
+    if isinstance(sensor, IntelRealsense):
+        if topic.startswith("color"):
+            return float(sensor.get_color_fps())
+        if topic.startswith("depth") or topic == "points":
+            return float(sensor.get_depth_fps())
+    elif isinstance(sensor, BaseCamera) and topic != "imu":
+        return float(sensor.fps)
+    return float(sensor.get_topic_rate(topic))
+
+
+def message_size(sensor: BaseSensor, topic: str) -> int:
+    size = SIZE.get(sensor.SENSOR_MODEL, {}).get(topic)
+    if size is not None:
+        return int(size(sensor))
+    return TOPIC_SIZE.get(topic, HEADER)
+
+
+def topic_enabled(sensor: BaseSensor, topic: str) -> bool:
+    if isinstance(sensor, IntelRealsense) and topic in REALSENSE_ENABLED:
+        return REALSENSE_ENABLED[topic](sensor)
+    return True
+
+
+def estimate_bandwidth(
+        config: ClearpathConfig,
+        budget_mbps: float = BUDGET_MBPS
+        ) -> dict:
+    """Return per topic, per sensor and total message rates and bandwidth."""
+    sensors = config if isinstance(config, SensorConfig) else config.sensors
+    topics = []
+    per_sensor = {}
+    for sensor in sensors.get_all_sensors():
+        if not sensor.get_launch_enabled():
+            continue
+        totals = per_sensor.setdefault(sensor.name, {
+            "model": sensor.SENSOR_MODEL, "rate": 0.0, "bandwidth": 0.0})
+        for topic in sensor.TOPICS.NAME:
+            if not topic_enabled(sensor, topic):
+                continue
+            rate = topic_rate(sensor, topic)
+            size = message_size(sensor, topic)
+            topics.append({
+                "sensor": sensor.name,
+                "key": topic,
+                "topic": sensor.get_topic(topic),
+                "rate": rate,
+                "size": size,
+                "bandwidth": rate * size,
+            })
+            totals["rate"] += rate
+            totals["bandwidth"] += rate * size
+    rate = sum(t["rate"] for t in topics)
+    bandwidth = sum(t["bandwidth"] for t in topics)
+    budget = budget_mbps * 1e6 / 8
+    return {
+        "topics": topics,
+        "sensors": per_sensor,
+        "rate": rate,
+        "bandwidth": bandwidth,
+        "bandwidth_mbps": bandwidth * 8 / 1e6,
+        "budget_mbps": budget_mbps,
+        "over_budget": bandwidth > budget,
+    }
@@ -26,7 +26,16 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 from clearpath_config.common.types.config import BaseConfig
-from clearpath_config.common.utils.yaml import read_yaml, write_yaml
+from clearpath_config.common.types.context import (
+    ConfigContext,
+    config_context,
+    has_active_context,
+    set_default_context
+)
+from clearpath_config.common.types.namespace import Namespace
+from clearpath_config.common.utils import snapshot
+from clearpath_config.common.utils.dictionary import unflatten_dict
+from clearpath_config.common.utils.yaml import read_config, write_config
 from clearpath_config.system.system import SystemConfig
 from clearpath_config.platform.platform import PlatformConfig
 from clearpath_config.links.links import LinksConfig
@@ -73,18 +82,53 @@ class ClearpathConfig(BaseConfig):
         SENSORS: SensorConfig.DEFAULTS,
     }
 
-    def __init__(self, config: dict | str = None) -> None:
+    # Sub-Configs
+    # - in order of initialization
+    SECTIONS = {
+        SYSTEM: SystemConfig,
+        PLATFORM: PlatformConfig,
+        LINKS: LinksConfig,
+        MANIPULATORS: ManipulatorConfig,
+        MOUNTS: MountsConfig,
+        SENSORS: SensorConfig,
+    }
+
+    # Sub-Configs updated when the serial number changes
+    SERIAL_NUMBER_SECTIONS = (SYSTEM, PLATFORM, LINKS, MOUNTS, SENSORS)
+
+    def __init__(self, config: dict | str = None, lazy: bool = False) -> None:
         # Read YAML
         if isinstance(config, str):
             config = self.read(config)
-        # Initialization of Sub-Configs
+        # Serial number and namespace of this robot
+        # - shared by all sub-configs, independent of other ClearpathConfig objects
+        # - also the default for class level lookups unless created in an active context
+        self._context = ConfigContext()
+        if not has_active_context():
+            set_default_context(self._context)
+        with config_context(self._context):
+            self._init(config, lazy)
+
+    def _init(self, config: dict, lazy: bool) -> None:
+        # Revision of each sub-config when it was last serialized
+        self._revisions = {}
+        # Revision and fingerprint of each sub-config when it was last hashed
+        self._fingerprints = {}
+        # Sub-Configs
+        # - lazy: each sub-config is built from its raw config on first access
+        # - materialized: keys of sub-configs that have been built, in order
         self._config = {}
-        self._system = SystemConfig(self.DEFAULTS[self.SYSTEM])
-        self._platform = PlatformConfig(self.DEFAULTS[self.PLATFORM])
-        self._links = LinksConfig(self.DEFAULTS[self.LINKS])
-        self._manipulators = ManipulatorConfig(self.DEFAULTS[self.MANIPULATORS])
-        self._mounts = MountsConfig(self.DEFAULTS[self.MOUNTS])
-        self._sensors = SensorConfig(self.DEFAULTS[self.SENSORS])
+        self._sections = {}
+        self._pending = {}
+        self._materialized = []
+        if lazy:
+            config = unflatten_dict(config or {})
+            self._pending = {
+                key: config.pop(key) for key in self.SECTIONS if key in config
+            }
+        else:
+            for key in self.SECTIONS:
+                self._build(key)
         # Initialization
         self.serial_number = self.DEFAULTS[self.SERIAL_NUMBER]
         self.version = self.DEFAULTS[self.VERSION]
@@ -102,15 +146,99 @@ class ClearpathConfig(BaseConfig):
         # Set from Config
         super().__init__(setters, config)
 
-    def read(self, file: str | dict) -> None:
+    def read(self, file: str | dict, fmt: str = None) -> None:
+        # Format from file extension unless given: yaml, json or msgpack
         self._file = None
         if isinstance(file, dict):
             return file
         self._file = file
-        return read_yaml(file)
+        return read_config(file, fmt)
+
+    def write(self, file: str, fmt: str = None) -> None:
+        write_config(file, self.config, fmt)
 
-    def write(self, file: str) -> None:
-        write_yaml(file, self.config)
+    # Snapshot
+    # - binary image of a loaded config, restored without re-validation
+    # - only valid for the same snapshot schema, package and python version
+    # - only load snapshots from a trusted source, state is restored without validation
+    def to_snapshot(self, file: str = None) -> bytes:
+        data = snapshot.dumps(self)
+        if file is not None:
+            with open(file, "wb") as f:
+                f.write(data)
+        return data
+
+    @classmethod
+    def from_snapshot(cls, data: bytes | str) -> "ClearpathConfig":
+        if isinstance(data, str):
+            with open(data, "rb") as f:
+                data = f.read()
+        config = snapshot.loads(data)
+        assert isinstance(config, cls), (
+            "Snapshot is of type '%s' not '%s'" % (
+                type(config).__name__, cls.__name__)
+        )
+        if not has_active_context():
+            set_default_context(config._context)
+        return config
+
+    # Fingerprint
+    # - hash of the canonical config, defaults included
+    # - each section hash is kept until that section changes
+    # - hashing module is imported on first use to keep import time down
+    def section_fingerprints(self) -> dict:
+        from clearpath_config.common.utils.fingerprint import fingerprint
+        fingerprints = {}
+        for key in self.SECTIONS:
+            section = getattr(self, key)
+            revision = section.get_revision()
+            cached = self._fingerprints.get(key)
+            if cached is None or cached[0] != revision:
+                cached = (revision, fingerprint(self._config[key]))
+                self._fingerprints[key] = cached
+            fingerprints[key] = cached[1]
+        return fingerprints
+
+    def fingerprint(self) -> str:
+        from clearpath_config.common.utils.fingerprint import fingerprint
+        return fingerprint({
+            self.SERIAL_NUMBER: self.serial_number,
+            self.VERSION: self.version,
+            **self.section_fingerprints()
+        })
+
+    @property
+    def materialized(self) -> list:
+        return list(self._materialized)
+
+    def _build(self, key: str) -> BaseConfig:
+        section = self.SECTIONS[key](self.DEFAULTS[key])
+        self._sections[key] = section
+        self._materialized.append(key)
+        return section
+
+    def _section(self, key: str) -> BaseConfig:
+        section = self._sections.get(key)
+        if section is not None:
+            return section
+        # Build on first access, as if the serial number was set after default initialization
+        with config_context(self._context):
+            with self._context.generic():
+                section = self._build(key)
+            if key in self.SERIAL_NUMBER_SECTIONS:
+                section.update(serial_number=True)
+            if key in self._pending:
+                section.config = self._pending.pop(key)
+        return section
+
+    def _serialize(self, key: str, config: BaseConfig) -> None:
+        """Serialize sub-config into config if modified since last read."""
+        # Sub-configs track their context, which holds serial number and namespace
+        revision = config.get_revision()
+        if key in self._config and self._revisions.get(key) == revision:
+            return
+        self.set_config_param(key, config.config[key])
+        self._revisions[key] = revision
 
     @property
     def serial_number(self) -> str:
@@ -123,11 +251,22 @@ class ClearpathConfig(BaseConfig):
     @serial_number.setter
     def serial_number(self, sn: str) -> None:
         self.set_serial_number(sn)
-        self._system.update(serial_number=True)
-        self._platform.update(serial_number=True)
-        self._links.update(serial_number=True)
-        self._mounts.update(serial_number=True)
-        self._sensors.update(serial_number=True)
+        with config_context(self._context):
+            for key in self.SERIAL_NUMBER_SECTIONS:
+                if key in self._sections:
+                    self._sections[key].update(serial_number=True)
+        self._update_pending_namespace()
+
+    def _update_pending_namespace(self) -> None:
+        # Namespace is held by the context, while the system section is not built
+        # set it as building the system section would: from its config or serial number
+        if self.SYSTEM in self._sections:
+            return
+        ros2 = self._pending.get(self.SYSTEM, {}).get(SystemConfig.ROS2) or {}
+        namespace = ros2.get(SystemConfig.NAMESPACE)
+        if namespace is None:
+            namespace = Namespace.clean(self.get_serial_number(prefix=True))
+        self._context.set_namespace(namespace)
 
     @property
     def version(self) -> int:
@@ -144,66 +283,60 @@ class ClearpathConfig(BaseConfig):
 
     @property
     def system(self) -> SystemConfig:
-        self.set_config_param(
-            self.SYSTEM,
-            self._system.config[self.SYSTEM])
-        return self._system
+        section = self._section(self.SYSTEM)
+        self._serialize(self.SYSTEM, section)
+        return section
 
     @system.setter
     def system(self, config: dict) -> None:
-        self._system.config = config
+        self._section(self.SYSTEM).config = config
 
     @property
     def platform(self) -> PlatformConfig:
-        self.set_config_param(
-            self.PLATFORM,
-            self._platform.config[self.PLATFORM])
-        return self._platform
+        section = self._section(self.PLATFORM)
+        self._serialize(self.PLATFORM, section)
+        return section
 
     @platform.setter
     def platform(self, config: dict) -> None:
-        self._platform.config = config
+        self._section(self.PLATFORM).config = config
 
     @property
     def links(self) -> LinksConfig:
-        self.set_config_param(
-            self.LINKS,
-            self._links.config[self.LINKS])
-        return self._links
+        section = self._section(self.LINKS)
+        self._serialize(self.LINKS, section)
+        return section
 
     @links.setter
     def links(self, config: dict) -> None:
-        self._links.config = config
+        self._section(self.LINKS).config = config
 
     @property
     def manipulators(self) -> ManipulatorConfig:
-        self.set_config_param(
-            self.MANIPULATORS,
-            self._manipulators.config[self.MANIPULATORS])
-        return self._manipulators
+        section = self._section(self.MANIPULATORS)
+        self._serialize(self.MANIPULATORS, section)
+        return section
 
     @manipulators.setter
     def manipulators(self, config: dict) -> None:
-        self._manipulators.config = config
+        self._section(self.MANIPULATORS).config = config
 
     @property
     def mounts(self) -> MountsConfig:
-        self.set_config_param(
-            self.MOUNTS,
-            self._mounts.config[self.MOUNTS])
-        return self._mounts
+        section = self._section(self.MOUNTS)
+        self._serialize(self.MOUNTS, section)
+        return section
 
     @mounts.setter
     def mounts(self, config: dict) -> None:
-        self._mounts.config = config
+        self._section(self.MOUNTS).config = config
 
     @property
     def sensors(self) -> SensorConfig:
-        self.set_config_param(
-            self.SENSORS,
-            self._sensors.config[self.SENSORS])
-        return self._sensors
+        section = self._section(self.SENSORS)
+        self._serialize(self.SENSORS, section)
+        return section
 
     @sensors.setter
     def sensors(self, config: dict) -> None:
-        self._sensors.config = config
+        self._section(self.SENSORS).config = config
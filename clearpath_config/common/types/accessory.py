@@ -25,10 +25,12 @@
 # CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
+from clearpath_config.common.types.context import get_context
+from clearpath_config.common.types.revision import RevisionTracked
 from typing import List
 
 
-class Accessory():
+class Accessory(RevisionTracked):
     # Defaults
     PARENT = "default_mount"
     XYZ = [0.0, 0.0, 0.0]
@@ -41,6 +43,8 @@ class Accessory():
             xyz: List[float] = XYZ,
             rpy: List[float] = RPY
             ) -> None:
+        # Context of the robot this accessory belongs to
+        self._context = get_context(self)
         self.name = str()
         self.parent = str()
         self.xyz = list()
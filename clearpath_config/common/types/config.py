@@ -25,8 +25,13 @@
 # CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
-from clearpath_config.common.types.serial_number import SerialNumber
-from clearpath_config.common.types.namespace import Namespace
+from clearpath_config.common.types.context import (
+    ConfigContext,
+    ContextMethod,
+    config_context,
+    get_context
+)
+from clearpath_config.common.types.revision import RevisionTracked
 from clearpath_config.common.utils.dictionary import (
     flatten_dict,
     get_from_dict,
@@ -34,14 +39,19 @@ from clearpath_config.common.utils.dictionary import (
     set_in_dict,
     unflatten_dict
 )
-from typing import Any
+from typing import Any, Callable, Tuple
+
+
+# Compiled Template Entry
+# - (key path, property getter, property setter)
+TemplateEntry = Tuple[Tuple[str, ...], Callable, Callable]
 
 
-class BaseConfig:
-    _SERIAL_NUMBER = SerialNumber("generic")
-    _NAMESPACE = Namespace()
+class BaseConfig(RevisionTracked):
     _VERSION = 0
     DLIM = "."
+    # Compiled templates shared by all instances, keyed on class and template
+    _TEMPLATE_TABLES = {}
 
     def __init__(
             self,
@@ -49,6 +59,8 @@ class BaseConfig:
             config: dict = {},
             parent_key: str = None,
             ) -> None:
+        # Context of the robot this config belongs to
+        self._context = get_context(self)
         # Dictionaries are Stored Flat
         self._config = {}
         self.template = template
@@ -57,6 +69,16 @@ class BaseConfig:
             self._config = {self._parent_key: {}}
         self.config = config
 
+    def __getstate__(self) -> dict:
+        # Compiled template is shared, rebuilt from the template on restore
+        state = dict(self.__dict__)
+        state.pop("_template_table", None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.__dict__["_template_table"] = self.compile_template(self._template)
+
     def update(
             self,
             serial_number=False,
@@ -74,20 +96,42 @@ class BaseConfig:
         assert isinstance(value, dict), (
             "template must of type 'dict'"
         )
+        self._template_table = self.compile_template(value)
+        self._template = value
+
+    @classmethod
+    def compile_template(cls, template: dict) -> Tuple[TemplateEntry, ...]:
+        """Return the cached (key path, fget, fset) table for a template."""
+        signature = (cls, BaseConfig._template_signature(template))
+        table = BaseConfig._TEMPLATE_TABLES.get(signature)
+        if table is not None:
+            return table
         # Check that template has all properties
-        flat_template = flatten_dict(d=value, dlim=BaseConfig.DLIM)
+        flat_template = flatten_dict(d=template, dlim=BaseConfig.DLIM)
         for _, val in flat_template.items():
             assert isinstance(val, property), (
                 "All entries in template must be properties"
             )
-        self._template = value
+        table = tuple(
+            (tuple(key.split(BaseConfig.DLIM)), prop.fget, prop.fset)
+            for key, prop in flat_template.items()
+        )
+        BaseConfig._TEMPLATE_TABLES[signature] = table
+        return table
+
+    @staticmethod
+    def _template_signature(template: dict) -> tuple:
+        return tuple(
+            (key, BaseConfig._template_signature(val)
+             if isinstance(val, dict) else val)
+            for key, val in template.items()
+        )
 
     @property
     def config(self) -> dict:
         """Return configuration dictionary."""
-        for _, prop in flatten_dict(
-                d=self.template, dlim=BaseConfig.DLIM).items():
-            self.getter(prop)()
+        for _, fget, _ in self._template_table:
+            fget(self)
         return self._config
 
     @config.setter
@@ -100,11 +144,11 @@ class BaseConfig:
         if self._parent_key is not None and self._parent_key not in value:
             value = {self._parent_key: value}
         value = unflatten_dict(value)
-        for map, prop in flatten_dict(
-                d=self.template, dlim=BaseConfig.DLIM).items():
-            keys = map.split(BaseConfig.DLIM)
-            if is_in_dict(value, keys):
-                self.setter(prop)(get_from_dict(value, keys))
+        # Objects created from the config are bound to this config's context
+        with config_context(self._context):
+            for keys, _, fset in self._template_table:
+                if is_in_dict(value, keys):
+                    fset(self, get_from_dict(value, keys))
 
     def setter(self, prop: property):
         return prop.fset.__get__(self)
@@ -116,33 +160,16 @@ class BaseConfig:
         keys = key.split(BaseConfig.DLIM)
         set_in_dict(d=self._config, map=keys, val=value)
 
-    @classmethod
-    def get_serial_number(cls, prefix: bool = False) -> str:
-        return BaseConfig._SERIAL_NUMBER.get_serial(prefix=prefix)
-
-    @classmethod
-    def set_serial_number(cls, sn: str) -> None:
-        BaseConfig._SERIAL_NUMBER = SerialNumber(sn)
-
-    @classmethod
-    def get_unit_number(cls) -> str:
-        return BaseConfig._SERIAL_NUMBER.get_unit()
-
-    @classmethod
-    def get_platform_model(cls) -> str:
-        return BaseConfig._SERIAL_NUMBER.get_model()
-
-    @classmethod
-    def get_namespace(cls) -> str:
-        return str(BaseConfig._NAMESPACE)
-
-    @classmethod
-    def set_namespace(cls, namespace: str | Namespace) -> None:
-        if isinstance(namespace, Namespace):
-            BaseConfig._NAMESPACE = namespace
-        elif isinstance(namespace, str):
-            BaseConfig._NAMESPACE = Namespace(namespace)
-        else:
-            assert isinstance(namespace, str) or isinstance(namespace, Namespace), (
-                "Namespace must be of type 'str' or 'Namespace'"
-            )
+    @property
+    def context(self) -> ConfigContext:
+        return self._context
+
+    # Serial Number and Namespace
+    # - resolved from the context of the instance, or the active context
+    #   when called on the class
+    get_serial_number = ContextMethod(ConfigContext.get_serial_number)
+    set_serial_number = ContextMethod(ConfigContext.set_serial_number)
+    get_unit_number = ContextMethod(ConfigContext.get_unit_number)
+    get_platform_model = ContextMethod(ConfigContext.get_platform_model)
+    get_namespace = ContextMethod(ConfigContext.get_namespace)
+    set_namespace = ContextMethod(ConfigContext.set_namespace)
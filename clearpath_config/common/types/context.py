@@ -0,0 +1,141 @@
+# Software License Agreement (BSD)
+#
+# @author    Luis Camero <lcamero@clearpathrobotics.com>
+# @copyright (c) 2023, Clearpath Robotics, Inc., All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# * Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of Clearpath Robotics nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+from clearpath_config.common.types.namespace import Namespace
+from clearpath_config.common.types.revision import RevisionTracked
+from clearpath_config.common.types.serial_number import SerialNumber
+from contextlib import contextmanager
+from contextvars import ContextVar
+from types import MethodType
+from typing import Callable, Iterator
+
+
+# ConfigContext
+# - serial number and namespace of a single robot configuration
+# - shared by the root ClearpathConfig and all of its sub-configs
+# - copies of a config keep pointing at the same context
+class ConfigContext(RevisionTracked):
+
+    def __init__(
+            self,
+            serial_number: str = "generic",
+            namespace: str | Namespace = "/",
+            ) -> None:
+        self.set_serial_number(serial_number)
+        self.set_namespace(namespace)
+
+    def __copy__(self) -> "ConfigContext":
+        return self
+
+    def __deepcopy__(self, memo: dict) -> "ConfigContext":
+        return self
+
+    @contextmanager
+    def generic(self) -> Iterator["ConfigContext"]:
+        # Temporarily use the generic serial number (e.g. to initialize from defaults)
+        serial_number = self._serial_number
+        self.set_serial_number("generic")
+        try:
+            yield self
+        finally:
+            self._serial_number = serial_number
+
+    def get_serial_number(self, prefix: bool = False) -> str:
+        return self._serial_number.get_serial(prefix=prefix)
+
+    def set_serial_number(self, sn: str) -> None:
+        self._serial_number = SerialNumber(sn)
+
+    def get_unit_number(self) -> str:
+        return self._serial_number.get_unit()
+
+    def get_platform_model(self) -> str:
+        return self._serial_number.get_model()
+
+    def get_namespace(self) -> str:
+        return str(self._namespace)
+
+    def set_namespace(self, namespace: str | Namespace) -> None:
+        if isinstance(namespace, Namespace):
+            self._namespace = namespace
+        elif isinstance(namespace, str):
+            self._namespace = Namespace(namespace)
+        else:
+            assert isinstance(namespace, str) or isinstance(namespace, Namespace), (
+                "Namespace must be of type 'str' or 'Namespace'"
+            )
+
+
+# Active Context
+# - set while a root config is being loaded or modified
+# - outside of any active context, the most recently loaded root config is used
+_ACTIVE_CONTEXT = ContextVar("clearpath_config_context", default=None)
+_DEFAULT_CONTEXT = ConfigContext()
+
+
+def get_context(obj: object = None) -> ConfigContext:
+    # Context bound to object
+    context = getattr(obj, "__dict__", {}).get("_context")
+    if context is not None:
+        return context
+    # Active or default context
+    context = _ACTIVE_CONTEXT.get()
+    if context is not None:
+        return context
+    return _DEFAULT_CONTEXT
+
+
+def set_default_context(context: ConfigContext) -> None:
+    global _DEFAULT_CONTEXT
+    _DEFAULT_CONTEXT = context
+
+
+def has_active_context() -> bool:
+    return _ACTIVE_CONTEXT.get() is not None
+
+
+@contextmanager
+def config_context(context: ConfigContext) -> Iterator[ConfigContext]:
+    token = _ACTIVE_CONTEXT.set(context)
+    try:
+        yield context
+    finally:
+        _ACTIVE_CONTEXT.reset(token)
+
+
+# ContextMethod
+# - exposes a ConfigContext method on a config class
+# - called on an instance: uses the context the instance is bound to
+# - called on the class: uses the active context
+class ContextMethod:
+
+    def __init__(self, method: Callable) -> None:
+        self.method = method
+        self.__doc__ = method.__doc__
+
+    def __get__(self, obj: object, objtype: type = None) -> Callable:
+        return MethodType(self.method, get_context(obj))
@@ -25,9 +25,10 @@
 # CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
-from copy import deepcopy
+from clearpath_config.common.types.revision import RevisionTracked, listed_revision
 from typing import (
     Callable,
+    Dict,
     Generic,
     List,
     TypeVar
@@ -42,7 +43,7 @@ U = TypeVar("U")
 # ListConfigs
 # - holds a list of an object type
 # - generic class
-class ListConfig(Generic[T, U]):
+class ListConfig(RevisionTracked, Generic[T, U]):
 
     def __init__(
             self,
@@ -51,12 +52,48 @@ class ListConfig(Generic[T, U]):
             uid_type: type
             ) -> None:
         self.__list: List[T] = []
+        # Index:
+        # - maps unique ID to position in list
+        # - objects can be renamed in place after being added, the index is
+        #   rebuilt when a lookup hits a renamed object, or misses after any
+        #   listed object changed since the index was last checked
+        self.__index: Dict[U, int] = {}
+        self.__checked: int = listed_revision()
         self.__uid: Callable = uid
         self.__type_T: type = obj_type
         self.__type_U: type = uid_type
 
+    def __getstate__(self) -> dict:
+        # Unique ID getter is set by the list type, taken from a new list on restore
+        # Listed revisions of another process mean nothing, index is checked on restore
+        state = dict(self.__dict__)
+        state.pop("_ListConfig__uid", None)
+        state.pop("_ListConfig__checked", None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.__dict__["_ListConfig__uid"] = type(self)()._ListConfig__uid
+        self.__dict__["_ListConfig__checked"] = -1
+
+    @staticmethod
+    def listed(obj: T) -> T:
+        if isinstance(obj, RevisionTracked):
+            obj.set_listed()
+        return obj
+
+    def reindex(self) -> None:
+        self.__checked = listed_revision()
+        self.__index = {}
+        for idx, obj in enumerate(self.__list):
+            self.__index.setdefault(self.__uid(obj), idx)
+
     def extend(self, other: list):
-        self.__list.extend(other)
+        start = len(self.__list)
+        self.__list.extend(self.listed(obj) for obj in other)
+        for idx, obj in enumerate(other, start):
+            self.__index.setdefault(self.__uid(obj), idx)
+        self.touch()
         return self
 
     def find(
@@ -77,10 +114,16 @@ class ListConfig(Generic[T, U]):
                     self.__type_U.__name__
                 )
             )
-        for idx, obj in enumerate(self.__list):
-            if self.__uid(obj) == uid:
+        idx = self.__index.get(uid)
+        if idx is not None:
+            if self.__uid(self.__list[idx]) == uid:
                 return idx
-        return None
+        elif self.__checked == listed_revision():
+            # No listed object changed, so none was renamed to this uid
+            return None
+        # Rebuild index in case an object was renamed in place
+        self.reindex()
+        return self.__index.get(uid)
 
     def add(
             self,
@@ -96,7 +139,9 @@ class ListConfig(Generic[T, U]):
                 self.__uid(obj)
             )
         )
-        self.__list.append(obj)
+        self.__index[self.__uid(obj)] = len(self.__list)
+        self.__list.append(self.listed(obj))
+        self.touch()
 
     def replace(
             self,
@@ -105,12 +150,14 @@ class ListConfig(Generic[T, U]):
         assert isinstance(obj, self.__type_T), (
             "Object must be of type %s" % T
         )
-        assert self.find(obj) is not None, (
+        idx = self.find(obj)
+        assert idx is not None, (
             "Object with uid %s cannot be replaced. Does not exist." % (
                 self.__uid(obj)
             )
         )
-        self.__list[self.find(obj)] = obj
+        self.__list[idx] = self.listed(obj)
+        self.touch()
 
     def remove(
             self,
@@ -118,10 +165,14 @@ class ListConfig(Generic[T, U]):
             ) -> None:
         idx = self.find(_obj)
         if idx is not None:
-            self.__list.remove(self.__list[idx])
+            del self.__list[idx]
+            self.reindex()
+            self.touch()
 
     def remove_all(self) -> None:
         self.__list.clear()
+        self.__index.clear()
+        self.touch()
 
     def get(
             self,
@@ -148,16 +199,29 @@ class ListConfig(Generic[T, U]):
             self,
             _list: List[T],
             ) -> None:
-        # Copy and Clear
-        tmp_list = deepcopy(self.__list)
-        self.__list.clear()
-        # Add One-by-One
+        # Stage New List and Index
+        # - current list is left untouched if any object is rejected
+        staged_list = []
+        staged_index = {}
         try:
             for obj in _list:
-                self.add(obj)
-        # Restore Save if Failure
+                assert isinstance(obj, self.__type_T), (
+                    "Object must be of type %s" % (
+                        self.__type_T.__name__
+                    )
+                )
+                uid = self.__uid(obj)
+                assert uid not in staged_index, (
+                    "Object with uid %s is not unique." % uid
+                )
+                staged_index[uid] = len(staged_list)
+                staged_list.append(obj)
         except AssertionError:
-            self.__list = tmp_list
+            return
+        # Swap
+        self.__list[:] = [self.listed(obj) for obj in staged_list]
+        self.__index = staged_index
+        self.touch()
 
     # TODO: the below UID methods are not supported by most implementations of this class
     # Unique Identifier: Name
@@ -180,7 +244,7 @@ class ListConfig(Generic[T, U]):
 # - T must have the following methods:
 #   - get_idx(): return an index from members
 #   - set_idx(idx): set an index and update members
-class OrderedListConfig(Generic[T]):
+class OrderedListConfig(RevisionTracked, Generic[T]):
 
     def __init__(self, obj_type: type, start_idx: int = 0) -> None:
         self.start_idx = start_idx
@@ -223,6 +287,7 @@ class OrderedListConfig(Generic[T]):
             "Object must be of type %s" % T
         )
         self.__list.append(obj)
+        self.touch()
         self.update()
 
     def replace(
@@ -234,6 +299,7 @@ class OrderedListConfig(Generic[T]):
             "Object not found. Cannot be replaced"
         )
         self.__list[idx - self.start_idx] = obj
+        self.touch()
         self.update()
 
     def remove(
@@ -243,10 +309,12 @@ class OrderedListConfig(Generic[T]):
         idx = self.find(obj)
         if idx is not None:
             self.__list.remove(self.__list[idx - self.start_idx])
+            self.touch()
         self.update()
 
     def remove_all(self) -> None:
         self.__list.clear()
+        self.touch()
 
     def get(
             self,
@@ -273,17 +341,17 @@ class OrderedListConfig(Generic[T]):
             self,
             _list: List[T],
             ) -> None:
-        # Copy and Clear
-        tmp_list = deepcopy(self.__list)
-        self.__list.clear()
-        # If Empty Keep Empty
-        if not _list:
-            return
-        # Add One-by-One
+        # Validate and Swap
+        # - previous objects are restored if any object or index is rejected
+        previous = self.__list[:]
         try:
             for obj in _list:
-                self.add(obj)
-        # Restore Save if Failure
+                assert isinstance(obj, self.__type_T), (
+                    "Object must be of type %s" % T
+                )
+            self.__list[:] = _list
+            self.update()
         except AssertionError:
-            self.__list = tmp_list
-        self.update()
+            self.__list[:] = previous
+            self.update()
+        self.touch()
@@ -0,0 +1,103 @@
+# Software License Agreement (BSD)
+#
+# @author    Luis Camero <lcamero@clearpathrobotics.com>
+# @copyright (c) 2023, Clearpath Robotics, Inc., All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# * Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of Clearpath Robotics nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+from itertools import count
+
+
+# Global Revision Counter
+# - shared by all tracked objects so revisions are comparable across them
+_REVISIONS = count(1)
+
+
+# Listed Revision
+# - latest revision stamped on any object held in a ListConfig
+# - lists compare it before trusting a lookup miss, an object may have been renamed
+_LISTED = [0]
+
+
+def listed_revision() -> int:
+    return _LISTED[0]
+
+
+def next_revision() -> int:
+    return next(_REVISIONS)
+
+
+def advance_revision(revision: int) -> None:
+    """Make sure all following revisions are greater than revision."""
+    global _REVISIONS
+    current = next(_REVISIONS)
+    if current <= revision:
+        _REVISIONS = count(revision + 1)
+
+
+# RevisionTracked
+# - stamps a new global revision on the object every time one of its
+#   attributes is assigned (i.e. every property setter)
+# - mutations that do not assign an attribute (list methods) must call touch()
+class RevisionTracked:
+    _revision = 0
+    # Set once the object is added to a ListConfig
+    _listed = False
+
+    def __setattr__(self, name: str, value) -> None:
+        object.__setattr__(self, name, value)
+        revision = next(_REVISIONS)
+        object.__setattr__(self, "_revision", revision)
+        if self._listed:
+            _LISTED[0] = revision
+
+    def touch(self) -> None:
+        """Mark object as modified."""
+        revision = next(_REVISIONS)
+        object.__setattr__(self, "_revision", revision)
+        if self._listed:
+            _LISTED[0] = revision
+
+    def set_listed(self) -> None:
+        """Mark object as held by a list, changes to it are reported to lists."""
+        object.__setattr__(self, "_listed", True)
+
+    def get_revision(self) -> int:
+        """Return latest revision of this object and all tracked members."""
+        revision = 0
+        seen = set()
+        stack = [self]
+        while stack:
+            obj = stack.pop()
+            if id(obj) in seen:
+                continue
+            seen.add(id(obj))
+            if obj._revision > revision:
+                revision = obj._revision
+            for value in vars(obj).values():
+                if isinstance(value, RevisionTracked):
+                    stack.append(value)
+                elif isinstance(value, list):
+                    stack.extend(
+                        i for i in value if isinstance(i, RevisionTracked))
+        return revision
@@ -0,0 +1,231 @@
+# Software License Agreement (BSD)
+#
+# @author    Luis Camero <lcamero@clearpathrobotics.com>
+# @copyright (c) 2023, Clearpath Robotics, Inc., All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# * Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of Clearpath Robotics nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+from collections import OrderedDict
+import hashlib
+import marshal
+import os
+import stat
+import sys
+import tempfile
+import threading
+from typing import Callable
+
+
+# Parsed File Cache
+#  - caches the result of parsing a file
+#  - keyed on python version, absolute path, modification time, size and content hash
+#  - in-process LRU of marshalled results, optionally backed by a directory on disk
+#  - one disk entry per python version and path, a changed file replaces its entry
+#  - least recently used disk entries are pruned beyond DISK_SIZE
+#  - only builtin types are cached, results marshal cannot store are parsed every time
+#  - every lookup returns a new copy, callers can modify it freely
+#  - the directory must be trusted: owned by the current user, not writable by others
+class ParsedFileCache():
+    SIZE = 64
+    DISK_SIZE = 256
+    SUFFIX = ".marshal"
+
+    def __init__(
+            self,
+            directory: str = None,
+            size: int = SIZE,
+            disk_size: int = DISK_SIZE
+            ) -> None:
+        assert size >= 0, "Cache size must be zero or positive"
+        assert disk_size > 0, "Cache disk size must be positive"
+        self._directory = directory
+        self._size = size
+        self._disk_size = disk_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            self.check_directory(directory)
+        self.reset_stats()
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def reset_stats(self) -> None:
+        self._stats = {
+            "hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "disk_evictions": 0,
+            "disk_errors": 0,
+        }
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        return stats
+
+    def clear(self, disk: bool = False) -> None:
+        with self._lock:
+            self._entries.clear()
+        if disk and self._directory:
+            for name in os.listdir(self._directory):
+                if name.endswith(self.SUFFIX):
+                    os.remove(os.path.join(self._directory, name))
+
+    @staticmethod
+    def check_directory(directory: str) -> None:
+        # Entries are loaded as is, others must not be able to write them
+        info = os.stat(directory)
+        if hasattr(os, "getuid"):
+            assert info.st_uid == os.getuid(), (
+                "Cache directory '%s' must be owned by the current user" % directory
+            )
+        assert not info.st_mode & (stat.S_IWGRP | stat.S_IWOTH), (
+            "Cache directory '%s' must not be writable by group or others" % directory
+        )
+
+    @staticmethod
+    def key(path: str) -> tuple:
+        # Marshal format is only stable for the same python version
+        path = os.path.abspath(path)
+        info = os.stat(path)
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        return (sys.implementation.cache_tag, path, info.st_mtime_ns, info.st_size, digest)
+
+    def load(self, path: str, parse: Callable[[str], object]) -> object:
+        key = self.key(path)
+        # In-Process
+        with self._lock:
+            blob = self._entries.get(key)
+            if blob is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return marshal.loads(blob)
+        # On-Disk
+        blob = self._read_disk(key)
+        if blob is not None:
+            with self._lock:
+                self._stats["disk_hits"] += 1
+            self._store(key, blob)
+            return marshal.loads(blob)
+        # Parse
+        with self._lock:
+            self._stats["misses"] += 1
+        value = parse(path)
+        try:
+            blob = marshal.dumps(value)
+        except ValueError:
+            # Not builtin types only, e.g. YAML timestamps
+            return value
+        self._store(key, blob)
+        self._write_disk(key, blob)
+        return marshal.loads(blob)
+
+    def _store(self, key: tuple, blob: bytes) -> None:
+        if not self._size:
+            return
+        with self._lock:
+            self._entries[key] = blob
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._size:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def _disk_path(self, key: tuple) -> str:
+        # Python version and path only, the stored key is checked on read
+        name = hashlib.sha256(repr(key[:2]).encode("utf-8")).hexdigest()
+        return os.path.join(self._directory, name + self.SUFFIX)
+
+    def _read_disk(self, key: tuple) -> bytes:
+        if not self._directory:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as f:
+                stored_key, blob = marshal.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            with self._lock:
+                self._stats["disk_errors"] += 1
+            return None
+        if stored_key != key or type(blob) is not bytes:
+            return None
+        # Mark as recently used for pruning
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return blob
+
+    def _write_disk(self, key: tuple, blob: bytes) -> None:
+        if not self._directory:
+            return
+        # Write to temporary file then move into place
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+        except OSError:
+            with self._lock:
+                self._stats["disk_errors"] += 1
+            return
+        try:
+            with os.fdopen(fd, "wb") as f:
+                marshal.dump((key, blob), f)
+            os.replace(tmp, self._disk_path(key))
+        except OSError:
+            os.remove(tmp)
+            with self._lock:
+                self._stats["disk_errors"] += 1
+            return
+        self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        # Remove least recently used entries beyond the disk size
+        entries = []
+        try:
+            for entry in os.scandir(self._directory):
+                if entry.name.endswith(self.SUFFIX):
+                    entries.append((entry.stat().st_mtime_ns, entry.path))
+        except OSError:
+            with self._lock:
+                self._stats["disk_errors"] += 1
+            return
+        if len(entries) <= self._disk_size:
+            return
+        entries.sort()
+        for _, path in entries[:len(entries) - self._disk_size]:
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            with self._lock:
+                self._stats["disk_evictions"] += 1
@@ -25,68 +25,103 @@
 # CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
+from collections import abc
 from typing import MutableMapping
 from functools import reduce
 import operator
-
-
-def _flatten_dict_gen(d, parent_key, dlim):
-    for k, v in d.items():
-        new_key = parent_key + dlim + str(k) if parent_key else str(k)
-        if isinstance(v, MutableMapping):
-            yield from flatten_dict(v, new_key, dlim=dlim).items()
-        else:
-            yield new_key, v
+import re
 
 
 def flatten_dict(d: MutableMapping, parent_key: str = '', dlim: str = '.'):
-    return dict(_flatten_dict_gen(d, parent_key, dlim))
+    flat = {}
+    # Mapping check by value type; avoids repeated abstract base class checks
+    is_mapping = {dict: True}
+    # Stack of (key prefix, items iterator) for every dictionary being visited
+    stack = [(parent_key, iter(d.items()))]
+    while stack:
+        prefix, items = stack[-1]
+        for k, v in items:
+            key = prefix + dlim + str(k) if prefix else str(k)
+            t = type(v)
+            if t not in is_mapping:
+                is_mapping[t] = issubclass(t, abc.MutableMapping)
+            if is_mapping[t]:
+                stack.append((key, iter(v.items())))
+                break
+            flat[key] = v
+        else:
+            stack.pop()
+    return flat
 
 
 def merge_dict(a, b, path=None, priority=0):
     """Merge dict b into dict a."""
-    if path is None:
-        path = []
-    for key in b:
-        if key in a:
-            if isinstance(a[key], dict) and isinstance(b[key], dict):
-                merge_dict(a[key], b[key], path + [str(key)])
-            elif a[key] == b[key]:
+    # Stack of (destination, source, source keys iterator, priority)
+    # - priority only applies to the top level
+    stack = [(a, b, iter(b), priority)]
+    while stack:
+        dst, src, keys, level_priority = stack[-1]
+        for key in keys:
+            if key not in dst:
+                dst[key] = src[key]
+                continue
+            dst_val = dst[key]
+            src_val = src[key]
+            if isinstance(dst_val, dict) and isinstance(src_val, dict):
+                stack.append((dst_val, src_val, iter(src_val), 0))
+                break
+            elif dst_val == src_val:
                 # same leaf value
                 pass
-            else:
-                # assign leaf value of priority
-                if isinstance(a[key], list) and isinstance(b[key], list):
-                    val = a[key]
-                    val.extend(b[key])
-                    a[key] = val
-                elif priority:
-                    a[key] = b[key]
+            # assign leaf value of priority
+            elif isinstance(dst_val, list) and isinstance(src_val, list):
+                dst_val.extend(src_val)
+            elif level_priority:
+                dst[key] = src_val
         else:
-            a[key] = b[key]
+            stack.pop()
     return a
 
 
-def _unflatten_dict_gen(d: dict, k: str, v: object, dlim: str = '.'):
-    keys = k.split(dlim)
-    if len(keys) > 1:
-        return _unflatten_dict_gen()
+def _unflatten_insert(d: dict, keys: list, v: object) -> None:
+    # Insert value at keys path with the same rules as merge_dict
+    for key in keys[:-1]:
+        if key not in d:
+            d[key] = d = {}
+            continue
+        d = d[key]
+        if not isinstance(d, dict):
+            # existing leaf value takes priority
+            return
+    key = keys[-1]
+    if key not in d:
+        d[key] = v
+        return
+    val = d[key]
+    if isinstance(val, dict) and isinstance(v, dict):
+        merge_dict(val, v)
+    elif val == v:
+        pass
+    elif isinstance(val, list) and isinstance(v, list):
+        val.extend(v)
 
 
 def unflatten_dict(d: MutableMapping, parent_key: str = '', dlim: str = '.'):
     _d = {}
-    for k, v in d.items():
-        if isinstance(v, dict):
-            v = unflatten_dict(v, parent_key, dlim)
-        _d_curr = {}
-        _d_next = {}
-        keys = k.split(dlim)
-        keys.reverse()
-        for i, _ in enumerate(keys):
-            _d_next[keys[i]] = v if i == 0 else _d_curr
-            _d_curr = _d_next
-            _d_next = {}
-        merge_dict(_d, _d_curr)
+    # Stack of (destination, items iterator, parent destination, parent key)
+    # - nested dictionaries are expanded on their own, then inserted into their parent
+    stack = [(_d, iter(d.items()), None, None)]
+    while stack:
+        dst, items, _, _ = stack[-1]
+        for k, v in items:
+            if isinstance(v, dict):
+                stack.append(({}, iter(v.items()), dst, k))
+                break
+            _unflatten_insert(dst, k.split(dlim), v)
+        else:
+            dst, _, parent, k = stack.pop()
+            if parent is not None:
+                _unflatten_insert(parent, k.split(dlim), dst)
     return _d
 
 
@@ -134,11 +169,19 @@ def extend_flat_dict(a: dict, b: dict):
 
 def replace_dict_keys(d: dict, replacements: dict):
     new_d = dict()
+    if not replacements:
+        return unflatten_dict(flatten_dict(d))
+    # Single scan to find keys containing any of the replacements
+    pattern = re.compile("|".join(re.escape(r) for r in replacements))
+    # Last matching replacement takes priority
+    ordered = list(reversed(replacements.items()))
     for key, value in flatten_dict(d).items():
         new_key = key
-        for r in replacements:
-            if r in key:
-                new_key = key.replace(r, replacements[r])
+        if pattern.search(key):
+            for r, replacement in ordered:
+                if r in key:
+                    new_key = key.replace(r, replacement)
+                    break
         new_d[new_key] = value
     return unflatten_dict(new_d)
 
@@ -0,0 +1,85 @@
+# Software License Agreement (BSD)
+#
+# @author    Luis Camero <lcamero@clearpathrobotics.com>
+# @copyright (c) 2023, Clearpath Robotics, Inc., All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# * Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of Clearpath Robotics nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+from collections import abc
+from importlib import import_module
+from threading import Lock
+from typing import Callable, Iterator
+
+
+# Lazy Registry
+#  - read-only mapping of name to class
+#  - classes are given as "package.module:Class" strings
+#  - modules are only imported when their class is first looked up
+#  - optional wrap callable builds the stored value from the class
+class LazyRegistry(abc.Mapping):
+
+    def __init__(self, entries: dict, wrap: Callable = None) -> None:
+        self._entries = dict(entries)
+        self._wrap = wrap
+        self._resolved = {}
+        self._lock = Lock()
+
+    @staticmethod
+    def resolve(target: str) -> type:
+        module, _, attr = target.partition(":")
+        obj = import_module(module)
+        for name in attr.split("."):
+            obj = getattr(obj, name)
+        return obj
+
+    def __getitem__(self, name: str):
+        try:
+            return self._resolved[name]
+        except KeyError:
+            pass
+        target = self._entries[name]
+        with self._lock:
+            if name not in self._resolved:
+                value = self.resolve(target)
+                if self._wrap is not None:
+                    value = self._wrap(value)
+                self._resolved[name] = value
+        return self._resolved[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return repr(list(self._entries))
+
+    def is_resolved(self, name: str) -> bool:
+        return name in self._resolved
+
+    def resolved(self) -> list:
+        return [name for name in self._entries if name in self._resolved]
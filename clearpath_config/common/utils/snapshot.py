@@ -0,0 +1,283 @@
+# Software License Agreement (BSD)
+#
+# @author    Luis Camero <lcamero@clearpathrobotics.com>
+# @copyright (c) 2023, Clearpath Robotics, Inc., All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# * Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of Clearpath Robotics nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+from importlib import import_module
+import marshal
+import sys
+
+from clearpath_config.common.types.revision import RevisionTracked, advance_revision
+
+
+# Snapshot
+#  - binary image of an object graph, restored without running any setters
+#  - header: magic, schema version, package version, python cache tag
+#  - body: marshal of the encoded graph, built only from builtin types
+#  - objects are restored from their __getstate__ with __setstate__ or __dict__
+#  - only classes defined in clearpath_config (and a few builtins) are restored
+#  - snapshots must still come from a trusted source, state is restored as is
+SNAPSHOT_MAGIC = b"CPCFGSNP"
+SNAPSHOT_SCHEMA = 1
+PACKAGE = "clearpath_config"
+
+# Encoded Node Tags
+# - scalars (None, bool, int, float, str, bytes) are stored as is
+# - every other node is a tuple starting with one of these tags
+REF = 0
+LIST = 1
+TUPLE = 2
+DICT = 3
+SET = 4
+OBJECT = 5
+CLASS = 6
+PROPERTY = 7
+
+SCALARS = (type(None), bool, int, float, str, bytes)
+
+# Builtin classes that may be referenced by a snapshot
+ALLOWED_BUILTINS = frozenset(
+    ("builtins", t.__name__) for t in (bool, int, float, str, bytes, list, tuple, dict, set)
+)
+
+_PACKAGE_VERSION = []
+
+
+def package_version() -> str:
+    if not _PACKAGE_VERSION:
+        try:
+            from importlib.metadata import PackageNotFoundError, version
+            try:
+                _PACKAGE_VERSION.append(version(PACKAGE))
+            except PackageNotFoundError:
+                _PACKAGE_VERSION.append(None)
+        except ImportError:
+            _PACKAGE_VERSION.append(None)
+    return _PACKAGE_VERSION[0]
+
+
+def header() -> tuple:
+    return (SNAPSHOT_SCHEMA, package_version(), sys.implementation.cache_tag)
+
+
+# Resolved classes, functions and properties by qualified name
+_QUALIFIED = {}
+
+
+def qualified(module: str, qualname: str) -> object:
+    key = (module, qualname)
+    if key in _QUALIFIED:
+        return _QUALIFIED[key]
+    obj = import_module(module)
+    for name in qualname.split("."):
+        obj = getattr(obj, name)
+    _QUALIFIED[key] = obj
+    return obj
+
+
+def allowed(module: str, qualname: str) -> object:
+    # Resolve a name stored in a snapshot, only clearpath_config classes are allowed.
+    # Checked before importing, and every step must be a class defined in the package
+    if (module, qualname) in ALLOWED_BUILTINS:
+        return qualified(module, qualname)
+    assert isinstance(module, str) and isinstance(qualname, str) and (
+        module == PACKAGE or module.startswith(PACKAGE + ".")), (
+        "Snapshot references '%s:%s' outside of %s" % (module, qualname, PACKAGE)
+    )
+    try:
+        obj = import_module(module)
+        for name in qualname.split("."):
+            assert isinstance(obj, type) or obj.__name__ == module, (
+                "Snapshot references '%s:%s' through a non-class" % (module, qualname)
+            )
+            obj = getattr(obj, name)
+    except (ImportError, AttributeError) as e:
+        raise AssertionError("Snapshot references unknown '%s:%s': %s" % (module, qualname, e))
+    assert isinstance(obj, (type, property)), (
+        "Snapshot references '%s:%s' which is not a class" % (module, qualname)
+    )
+    defined = obj.fget if isinstance(obj, property) else obj
+    assert (getattr(defined, "__module__", None) == module
+            and getattr(defined, "__qualname__", None) == qualname), (
+        "Snapshot references '%s:%s' which is not defined there" % (module, qualname)
+    )
+    return obj
+
+
+def get_state(obj: object) -> dict:
+    getstate = getattr(obj, "__getstate__", None)
+    state = getstate() if getstate is not None else vars(obj)
+    assert isinstance(state, dict), (
+        "Snapshot of '%s' requires a dictionary state" % type(obj).__qualname__
+    )
+    return state
+
+
+class SnapshotEncoder():
+
+    def __init__(self) -> None:
+        self._memo = {}
+        # Keep encoded objects alive so their ids stay unique
+        self._keep = []
+
+    def encode(self, obj: object) -> object:
+        t = type(obj)
+        if t in SCALARS:
+            return obj
+        key = id(obj)
+        if key in self._memo:
+            return (REF, self._memo[key])
+        idx = self._memo[key] = len(self._memo)
+        self._keep.append(obj)
+        if t is list:
+            return (LIST, idx, [self.encode(i) for i in obj])
+        if t is tuple:
+            return (TUPLE, idx, [self.encode(i) for i in obj])
+        if t is dict:
+            return (DICT, idx, [(self.encode(k), self.encode(v)) for k, v in obj.items()])
+        if t is set:
+            return (SET, idx, [self.encode(i) for i in obj])
+        if isinstance(obj, type):
+            return (CLASS, idx, self.name(obj, obj))
+        if t is property:
+            module, qualname = self.name(obj.fget, None)
+            owner, _, name = qualname.rpartition(".")
+            assert getattr(qualified(module, owner), name, None) is obj, (
+                "Property '%s' is not reachable by name" % qualname
+            )
+            return (PROPERTY, idx, (module, owner, name))
+        assert not (callable(obj) and hasattr(obj, "__qualname__")), (
+            "Snapshot cannot store function '%s'" % obj.__qualname__
+        )
+        state = get_state(obj)
+        return (OBJECT, idx, self.name(t, t), self.encode(dict(state)))
+
+    @staticmethod
+    def name(obj: object, expected: object) -> tuple:
+        module, qualname = obj.__module__, obj.__qualname__
+        assert "<" not in qualname, (
+            "Snapshot cannot store local object '%s'" % qualname
+        )
+        if expected is not None:
+            assert qualified(module, qualname) is expected, (
+                "Object '%s' is not reachable by name" % qualname
+            )
+        return (module, qualname)
+
+
+class SnapshotDecoder():
+
+    def __init__(self) -> None:
+        self._memo = {}
+        self.revision = 0
+
+    def decode(self, node: object) -> object:
+        if type(node) is not tuple:
+            return node
+        tag = node[0]
+        if tag == REF:
+            return self._memo[node[1]]
+        idx = node[1]
+        # Scalars are returned as is, skip the call for them
+        decode = self.decode
+        if tag == LIST:
+            obj = self._memo[idx] = []
+            obj.extend(i if type(i) is not tuple else decode(i) for i in node[2])
+        elif tag == TUPLE:
+            obj = self._memo[idx] = tuple(
+                i if type(i) is not tuple else decode(i) for i in node[2])
+        elif tag == DICT:
+            obj = self._memo[idx] = {}
+            for k, v in node[2]:
+                obj[k if type(k) is not tuple else decode(k)] = (
+                    v if type(v) is not tuple else decode(v))
+        elif tag == SET:
+            obj = self._memo[idx] = set(
+                i if type(i) is not tuple else decode(i) for i in node[2])
+        elif tag == CLASS:
+            obj = self._memo[idx] = self.resolve(node[2], type)
+        elif tag == PROPERTY:
+            module, owner, name = node[2]
+            obj = self._memo[idx] = self.resolve((module, owner + "." + name), property)
+        elif tag == OBJECT:
+            cls = self.resolve(node[2], type)
+            obj = self._memo[idx] = cls.__new__(cls)
+            state = self.decode(node[3])
+            setstate = getattr(obj, "__setstate__", None)
+            if setstate is not None:
+                setstate(state)
+            else:
+                obj.__dict__.update(state)
+            if isinstance(obj, RevisionTracked):
+                self.revision = max(self.revision, obj.__dict__.get("_revision", 0))
+        else:
+            # Functions are never restored, they could be called later
+            raise AssertionError("Snapshot node tag '%s' is unknown" % tag)
+        return obj
+
+    @staticmethod
+    def resolve(name: tuple, kind: type) -> object:
+        assert type(name) is tuple and len(name) == 2, (
+            "Snapshot name '%s' is malformed" % (name,)
+        )
+        obj = allowed(*name)
+        assert isinstance(obj, kind), (
+            "Snapshot references '%s:%s' which is not a %s" % (name + (kind.__name__,))
+        )
+        return obj
+
+
+def dumps(obj: object) -> bytes:
+    return SNAPSHOT_MAGIC + marshal.dumps((header(), SnapshotEncoder().encode(obj)))
+
+
+def loads(data: bytes) -> object:
+    assert isinstance(data, (bytes, bytearray, memoryview)), (
+        "Snapshot must be of type 'bytes'"
+    )
+    data = bytes(data)
+    assert data.startswith(SNAPSHOT_MAGIC), (
+        "Snapshot is not a clearpath_config snapshot"
+    )
+    try:
+        snapshot_header, body = marshal.loads(data[len(SNAPSHOT_MAGIC):])
+    except (EOFError, ValueError, TypeError) as e:
+        raise AssertionError("Snapshot is corrupt: %s" % e)
+    schema, version, cache_tag = snapshot_header
+    assert schema == SNAPSHOT_SCHEMA, (
+        "Snapshot schema version %s does not match %s" % (schema, SNAPSHOT_SCHEMA)
+    )
+    assert version == package_version(), (
+        "Snapshot package version %s does not match %s" % (version, package_version())
+    )
+    assert cache_tag == sys.implementation.cache_tag, (
+        "Snapshot python version %s does not match %s" % (
+            cache_tag, sys.implementation.cache_tag)
+    )
+    decoder = SnapshotDecoder()
+    obj = decoder.decode(body)
+    # Restored revisions come from another process, keep new ones above them
+    advance_revision(decoder.revision)
+    return obj
@@ -25,10 +25,78 @@
 # CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
+from typing import Iterator, NamedTuple, TextIO
+import importlib
+import json
+import math
 import os
+import re
+import warnings
 import yaml
 
 
+# Use libyaml bindings when available
+try:
+    from yaml import CSafeLoader as SafeLoader, CDumper
+except ImportError:
+    from yaml import SafeLoader
+    CDumper = None
+
+
+# Dumpers that never write anchors and aliases
+class NoAliasDumper(yaml.Dumper):
+
+    def ignore_aliases(self, data):
+        return True
+
+
+if CDumper is not None:
+    class CNoAliasDumper(CDumper):
+
+        def ignore_aliases(self, data):
+            return True
+else:
+    CNoAliasDumper = None
+
+
+# Check that libyaml emits the same output as the Python emitter
+# - libyaml measures and folds long keys differently and escapes more characters
+def is_c_dumper_safe(config: dict) -> bool:
+    stack = [config]
+    seen = set()
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            if not is_c_dumper_safe_str(node):
+                return False
+            continue
+        elif isinstance(node, (bool, int, float, type(None))):
+            continue
+        # Shared and recursive structures are only checked once
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        if isinstance(node, dict):
+            for key in node:
+                if isinstance(key, str):
+                    if not key or len(key.encode("utf-8")) >= 80:
+                        return False
+                stack.append(key)
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+        elif type(node).__reduce_ex__ is object.__reduce_ex__ and hasattr(node, "__dict__"):
+            # Plain objects are represented by their attributes
+            stack.append(vars(node))
+        else:
+            return False
+    return True
+
+
+def is_c_dumper_safe_str(value: str) -> bool:
+    return value.isprintable() and (value.isascii() or max(value) < "\U00010000")
+
+
 # Get Valid Path
 def find_valid_path(path, cwd=None):
     abspath = path
@@ -46,18 +114,85 @@ def find_valid_path(path, cwd=None):
     return path
 
 
-def read_yaml(path: str) -> dict:
+# Parsed YAML Cache
+#  - disabled by default
+#  - enabled by setting CLEARPATH_CONFIG_CACHE_DIR or calling enable_yaml_cache
+#  - cache module is imported on enable, it pulls in hashlib and tempfile
+#  - the cache directory must be trusted, see ParsedFileCache
+#  - an untrusted or unusable directory from the environment disables the cache
+CACHE_DIR_ENV = "CLEARPATH_CONFIG_CACHE_DIR"
+_YAML_CACHE = None
+
+
+def enable_yaml_cache(
+        directory: str = None,
+        size: int = None
+        ) -> 'ParsedFileCache':  # noqa: F821
+    global _YAML_CACHE
+    from clearpath_config.common.utils.cache import ParsedFileCache
+    if size is None:
+        size = ParsedFileCache.SIZE
+    _YAML_CACHE = ParsedFileCache(directory, size)
+    return _YAML_CACHE
+
+
+def disable_yaml_cache() -> None:
+    global _YAML_CACHE
+    _YAML_CACHE = None
+
+
+def get_yaml_cache() -> 'ParsedFileCache':  # noqa: F821
+    return _YAML_CACHE
+
+
+def yaml_cache_stats() -> dict:
+    if _YAML_CACHE is None:
+        return {}
+    return _YAML_CACHE.stats()
+
+
+def enable_yaml_cache_from_env() -> 'ParsedFileCache':  # noqa: F821
+    # An unusable directory must not break the import, the cache stays disabled
+    directory = os.environ.get(CACHE_DIR_ENV)
+    if not directory:
+        return None
+    try:
+        return enable_yaml_cache(directory)
+    except (AssertionError, OSError) as e:
+        disable_yaml_cache()
+        warnings.warn("%s: YAML cache disabled, %s" % (CACHE_DIR_ENV, e), RuntimeWarning)
+        return None
+
+
+enable_yaml_cache_from_env()
+
+
+def find_config_path(path: str, name: str = "YAML") -> str:
     orig = path
-    # Check YAML Path
     try:
         path = find_valid_path(path, os.getcwd())
-        assert path, "YAML file '%s' could not be found" % orig
+        assert path, "%s file '%s' could not be found" % (name, orig)
     except FileNotFoundError:
         raise AssertionError(
-            "YAML file '%s' could not be found" % orig)
+            "%s file '%s' could not be found" % (name, orig))
+    return path
+
+
+def read_yaml(path: str) -> dict:
+    orig = path
+    # Check YAML Path
+    path = find_config_path(path)
+    if _YAML_CACHE is not None:
+        return _YAML_CACHE.load(path, lambda path: load_yaml(path, orig))
+    return load_yaml(path, orig)
+
+
+def load_yaml(path: str, orig: str = None) -> dict:
+    orig = orig or path
     # Check YAML can be Opened
     try:
-        config = yaml.load(open(path), Loader=yaml.SafeLoader)
+        with open(path) as yaml_file:
+            config = yaml.load(yaml_file, Loader=SafeLoader)
     except yaml.scanner.ScannerError:
         raise AssertionError(
             "YAML file '%s' is not well formed" % orig)
@@ -72,12 +207,291 @@ def read_yaml(path: str) -> dict:
 
 
 def write_yaml(path: str, config: dict) -> None:
-    yaml_file = open(path, "w+")
-    yaml.Dumper.ignore_aliases = lambda *args: True
-    yaml.dump(
-        config,
-        yaml_file,
-        sort_keys=False,
-        default_flow_style=False,
-        allow_unicode=True,
-    )
+    dumper = NoAliasDumper
+    if CNoAliasDumper is not None and is_c_dumper_safe(config):
+        dumper = CNoAliasDumper
+    with open(path, "w+") as yaml_file:
+        yaml.dump(
+            config,
+            yaml_file,
+            Dumper=dumper,
+            sort_keys=False,
+            default_flow_style=False,
+            allow_unicode=True,
+        )
+
+
+# Serialization Formats
+#  - configs can also be read and written as JSON and msgpack, e.g. to
+#    exchange configs between machines without the cost of parsing YAML
+#  - format is chosen by file extension unless given, other extensions are YAML
+#  - orjson is used for JSON when installed, msgpack must be installed to use it
+#  - optional modules are imported on first use
+#  - only YAML files are cached, the other formats are cheaper to parse than
+#    to restore from the cache
+YAML = "yaml"
+JSON = "json"
+MSGPACK = "msgpack"
+
+FORMATS = {
+    ".yaml": YAML,
+    ".yml": YAML,
+    ".json": JSON,
+    ".msgpack": MSGPACK,
+    ".mpk": MSGPACK,
+}
+FORMAT_NAMES = {
+    YAML: "YAML",
+    JSON: "JSON",
+    MSGPACK: "msgpack",
+}
+
+# orjson only supports 64 bit integers
+ORJSON_INT_MIN = -(2 ** 63)
+ORJSON_INT_MAX = 2 ** 64 - 1
+
+_MODULES = {}
+
+
+def import_optional(name: str) -> object:
+    # Module or None, failed imports are not retried
+    if name not in _MODULES:
+        try:
+            _MODULES[name] = importlib.import_module(name)
+        except ImportError:
+            _MODULES[name] = None
+    return _MODULES[name]
+
+
+def get_format(path: str, fmt: str = None) -> str:
+    if fmt is None:
+        fmt = FORMATS.get(os.path.splitext(path)[1].lower(), YAML)
+    assert fmt in FORMAT_NAMES, (
+        "Format '%s' is invalid, must be one of %s" % (fmt, list(FORMAT_NAMES)))
+    return fmt
+
+
+def get_msgpack() -> object:
+    msgpack = import_optional("msgpack")
+    assert msgpack is not None, (
+        "Format '%s' requires the msgpack package" % MSGPACK)
+    return msgpack
+
+
+# Check that orjson writes the same values the json module would
+# - orjson writes NaN and infinity as null and rejects non-string keys
+def is_orjson_safe(config: dict) -> bool:
+    stack = [config]
+    seen = set()
+    while stack:
+        node = stack.pop()
+        t = type(node)
+        if t is str or t is bool or node is None:
+            continue
+        elif t is int:
+            if not ORJSON_INT_MIN <= node <= ORJSON_INT_MAX:
+                return False
+            continue
+        elif t is float:
+            if not math.isfinite(node):
+                return False
+            continue
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        if t is dict:
+            if not all(type(key) is str for key in node):
+                return False
+            stack.extend(node.values())
+        elif t is list:
+            stack.extend(node)
+        else:
+            return False
+    return True
+
+
+def load_json(path: str, orig: str = None) -> dict:
+    orig = orig or path
+    orjson = import_optional("orjson")
+    with open(path, "rb") as f:
+        data = f.read()
+    config = None
+    try:
+        if orjson is not None:
+            try:
+                config = orjson.loads(data)
+            except orjson.JSONDecodeError:
+                # Non-standard values (NaN, infinity) written by the json module
+                config = json.loads(data)
+        else:
+            config = json.loads(data)
+    except ValueError:
+        raise AssertionError(
+            "JSON file '%s' is not well formed" % orig)
+    assert isinstance(config, dict), (
+        "JSON file '%s' is not a dictionary" % orig)
+    return config
+
+
+def write_json(path: str, config: dict) -> None:
+    orjson = import_optional("orjson")
+    if orjson is not None and is_orjson_safe(config):
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+            f.write(b"\n")
+        return
+    with open(path, "w") as f:
+        json.dump(config, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def load_msgpack(path: str, orig: str = None) -> dict:
+    orig = orig or path
+    msgpack = get_msgpack()
+    with open(path, "rb") as f:
+        data = f.read()
+    try:
+        config = msgpack.unpackb(data, raw=False, strict_map_key=False)
+    except (ValueError, msgpack.UnpackException):
+        raise AssertionError(
+            "msgpack file '%s' is not well formed" % orig)
+    assert isinstance(config, dict), (
+        "msgpack file '%s' is not a dictionary" % orig)
+    return config
+
+
+def write_msgpack(path: str, config: dict) -> None:
+    msgpack = get_msgpack()
+    with open(path, "wb") as f:
+        f.write(msgpack.packb(config, use_bin_type=True))
+
+
+def read_config(path: str, fmt: str = None) -> dict:
+    fmt = get_format(path, fmt)
+    if fmt == YAML:
+        return read_yaml(path)
+    orig = path
+    path = find_config_path(path, FORMAT_NAMES[fmt])
+    if fmt == JSON:
+        return load_json(path, orig)
+    return load_msgpack(path, orig)
+
+
+def write_config(path: str, config: dict, fmt: str = None) -> None:
+    fmt = get_format(path, fmt)
+    if fmt == YAML:
+        write_yaml(path, config)
+    elif fmt == JSON:
+        write_json(path, config)
+    else:
+        write_msgpack(path, config)
+
+
+# Document Stream
+#  - reads many configurations from one multi-document YAML or JSON lines file
+#  - one document is held in memory at a time, memory does not grow with the
+#    number of documents
+#  - a malformed document is reported with its index and line number (1-based)
+#    and reading continues with the next document
+#  - YAML documents are split on '---' and '...' markers at the start of a
+#    line and each is parsed on its own, so a parse error cannot end the stream
+#  - empty and comment-only documents are skipped without being parsed
+JSONL_EXTENSIONS = (".jsonl", ".ndjson")
+DOCUMENT_START = re.compile(r"---(\s|$)")
+DOCUMENT_END = re.compile(r"\.\.\.(\s|$)")
+
+
+class Document(NamedTuple):
+    index: int
+    line: int
+    config: object
+    error: str = None
+
+
+def document_error(index: int, line: int, message: str) -> Document:
+    return Document(index, line, None, "Document %d (line %d): %s" % (index, line, message))
+
+
+def parse_yaml_document(index: int, line: int, text: str) -> Document:
+    try:
+        config = yaml.load(text, Loader=SafeLoader)
+    except yaml.MarkedYAMLError as e:
+        mark = e.problem_mark or e.context_mark
+        if mark is not None:
+            line += mark.line
+        return document_error(index, line, e.problem or e.context or type(e).__name__)
+    except yaml.YAMLError as e:
+        return document_error(index, line, str(e))
+    if not isinstance(config, dict):
+        return document_error(index, line, "document is not a dictionary")
+    return Document(index, line, config)
+
+
+def iter_yaml_documents(stream: TextIO) -> Iterator[Document]:
+    index = 0
+    lines = []
+    start = 1
+    # Current chunk has content, or only directives for the next document
+    has_content = False
+    has_directive = False
+    explicit = False
+    for number, text in enumerate(stream, 1):
+        marker_start = DOCUMENT_START.match(text)
+        marker_end = DOCUMENT_END.match(text)
+        # A start marker always closes the current document, empty ones are skipped
+        if marker_start and not (has_directive and not has_content):
+            if has_content:
+                yield parse_yaml_document(index, start, "".join(lines))
+                index += 1
+            lines, has_content, has_directive = [], False, False
+        if not lines:
+            start = number
+        lines.append(text)
+        # Content after a start marker belongs to the document
+        if marker_start:
+            rest = text[3:].strip()
+            has_directive, explicit = False, True
+        elif marker_end:
+            rest = ""
+        else:
+            rest = text.strip()
+        if rest.startswith("%") and not (has_content or explicit):
+            has_directive = True
+        elif rest and not rest.startswith("#"):
+            has_content = True
+        if marker_end:
+            if has_content:
+                yield parse_yaml_document(index, start, "".join(lines))
+                index += 1
+            lines, has_content, has_directive, explicit = [], False, False, False
+    if has_content:
+        yield parse_yaml_document(index, start, "".join(lines))
+
+
+def iter_jsonl_documents(stream: TextIO) -> Iterator[Document]:
+    index = 0
+    for number, text in enumerate(stream, 1):
+        if not text.strip():
+            continue
+        try:
+            config = json.loads(text)
+        except ValueError as e:
+            yield document_error(index, number, str(e))
+        else:
+            if isinstance(config, dict):
+                yield Document(index, number, config)
+            else:
+                yield document_error(index, number, "document is not a dictionary")
+        index += 1
+
+
+def iter_documents(path: str, jsonl: bool = None) -> Iterator[Document]:
+    # JSON lines by extension unless specified
+    if jsonl is None:
+        jsonl = path.endswith(JSONL_EXTENSIONS)
+    assert os.path.isfile(path), "Fleet file '%s' could not be found" % path
+    with open(path) as stream:
+        if jsonl:
+            yield from iter_jsonl_documents(stream)
+        else:
+            yield from iter_yaml_documents(stream)
@@ -0,0 +1,282 @@
+# Software License Agreement (BSD)
+#
+# @author    Luis Camero <lcamero@clearpathrobotics.com>
+# @copyright (c) 2023, Clearpath Robotics, Inc., All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# * Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of Clearpath Robotics nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+from clearpath_config.common.types.discovery import Discovery
+from clearpath_config.common.types.rmw_implementation import RMWImplementation
+from clearpath_config.common.utils.fingerprint import fingerprint
+from clearpath_config.system.system import SystemConfig
+from collections import OrderedDict
+from xml.etree import ElementTree
+import os
+import stat
+import tempfile
+
+
+# DDS Profile
+#  - Fast-DDS and CycloneDDS profile XML generated from the system config:
+#    hosts, discovery servers, domain id and transport settings
+#  - generated profiles are cached on the fingerprint of every input, so a
+#    profile is only rebuilt when the middleware settings change
+#  - profiles are written atomically and only when their content changes
+FAST_DDS = "fastdds"
+CYCLONE_DDS = "cyclonedds"
+
+VENDOR = {
+    RMWImplementation.FAST_RTPS: FAST_DDS,
+    RMWImplementation.CYCLONE_DDS: CYCLONE_DDS,
+}
+
+# Transport Settings
+SHARED_MEMORY = "shared_memory"
+SEGMENT_SIZE = "segment_size"
+SEND_BUFFER_SIZE = "send_buffer_size"
+RECEIVE_BUFFER_SIZE = "receive_buffer_size"
+ASYNC_PUBLISHING = "async_publishing"
+# SUPER_CLIENT receives all discovery information, required by the ROS 2 CLI
+DISCOVERY_PROTOCOL = "discovery_protocol"
+
+DEFAULTS = {
+    SHARED_MEMORY: True,
+    SEGMENT_SIZE: 8 * 1024 * 1024,
+    SEND_BUFFER_SIZE: 4 * 1024 * 1024,
+    RECEIVE_BUFFER_SIZE: 4 * 1024 * 1024,
+    ASYNC_PUBLISHING: True,
+    DISCOVERY_PROTOCOL: "SUPER_CLIENT",
+}
+
+FAST_DDS_NAMESPACE = "http://www.eprosima.com/XMLSchemas/fastRTPS_Profiles"
+CYCLONE_DDS_NAMESPACE = "https://cdds.io/config"
+# Default GUID prefix of Fast-DDS discovery servers, server id at index 2
+SERVER_PREFIX = "44.53.%02x.5f.45.50.52.4f.53.49.4d.41"
+LOCALHOST_IP = "127.0.0.1"
+
+CACHE_SIZE = 32
+_CACHE = OrderedDict()
+
+
+def get_system(config) -> SystemConfig:
+    return config if isinstance(config, SystemConfig) else config.system
+
+
+def get_options(options: dict) -> dict:
+    for key in options:
+        assert key in DEFAULTS, (
+            "Profile option '%s' is invalid, must be one of %s" % (key, list(DEFAULTS))
+        )
+    return {**DEFAULTS, **options}
+
+
+def get_vendor(system: SystemConfig, vendor: str = None) -> str:
+    if vendor is None:
+        rmw = system.middleware.rmw_implementation
+        assert rmw in VENDOR, (
+            "RMW '%s' has no profile generator" % rmw
+        )
+        vendor = VENDOR[rmw]
+    assert vendor in (FAST_DDS, CYCLONE_DDS), (
+        "Profile vendor '%s' is invalid, must be one of %s" % (
+            vendor, [FAST_DDS, CYCLONE_DDS])
+    )
+    return vendor
+
+
+def get_servers(system: SystemConfig) -> list:
+    # Enabled discovery servers as (server id, address, port)
+    middleware = system.middleware
+    if middleware.discovery != Discovery.SERVER:
+        return []
+    servers = []
+    for server in middleware.servers.get_all():
+        if not server.enabled:
+            continue
+        if server.hostname == system.localhost:
+            address = LOCALHOST_IP
+        else:
+            address = server.ip_address
+        servers.append((server.server_id, address, server.port))
+    return sorted(servers)
+
+
+def middleware_fingerprint(config, vendor: str = None, **options) -> str:
+    system = get_system(config)
+    middleware = system.middleware
+    return fingerprint({
+        "vendor": get_vendor(system, vendor),
+        "options": get_options(options),
+        "middleware": middleware.config[middleware.MIDDLEWARE],
+        "domain_id": system.domain_id,
+        "hosts": system.hosts.to_dict(),
+        "localhost": system.localhost,
+    })
+
+
+def element(parent: ElementTree.Element, tag: str, text: object = None, **attrib):
+    e = ElementTree.SubElement(parent, tag, {k: str(v) for k, v in attrib.items()})
+    if text is not None:
+        e.text = str(text).lower() if isinstance(text, bool) else str(text)
+    return e
+
+
+def to_xml(root: ElementTree.Element) -> str:
+    ElementTree.indent(root, space="  ")
+    return (
+        '<?xml version="1.0" encoding="UTF-8" ?>\n' +
+        ElementTree.tostring(root, encoding="unicode") + "\n"
+    )
+
+
+def fastdds_profile(config, **options) -> str:
+    system = get_system(config)
+    options = get_options(options)
+    dds = ElementTree.Element("dds", xmlns=FAST_DDS_NAMESPACE)
+    profiles = element(dds, "profiles")
+    # Transports
+    transports = element(profiles, "transport_descriptors")
+    udp = element(transports, "transport_descriptor")
+    element(udp, "transport_id", "udp_transport")
+    element(udp, "type", "UDPv4")
+    element(udp, "sendBufferSize", options[SEND_BUFFER_SIZE])
+    element(udp, "receiveBufferSize", options[RECEIVE_BUFFER_SIZE])
+    transport_ids = ["udp_transport"]
+    if options[SHARED_MEMORY]:
+        shm = element(transports, "transport_descriptor")
+        element(shm, "transport_id", "shm_transport")
+        element(shm, "type", "SHM")
+        element(shm, "segment_size", options[SEGMENT_SIZE])
+        transport_ids.insert(0, "shm_transport")
+    # Participant
+    participant = element(
+        profiles, "participant", profile_name="clearpath_participant", is_default_profile="true")
+    element(participant, "domainId", system.domain_id)
+    rtps = element(participant, "rtps")
+    user_transports = element(rtps, "userTransports")
+    for transport_id in transport_ids:
+        element(user_transports, "transport_id", transport_id)
+    element(rtps, "useBuiltinTransports", False)
+    element(rtps, "sendSocketBufferSize", options[SEND_BUFFER_SIZE])
+    element(rtps, "listenSocketBufferSize", options[RECEIVE_BUFFER_SIZE])
+    # Discovery servers
+    servers = get_servers(system)
+    if servers:
+        builtin = element(rtps, "builtin")
+        discovery = element(builtin, "discovery_config")
+        element(discovery, "discoveryProtocol", options[DISCOVERY_PROTOCOL])
+        servers_list = element(discovery, "discoveryServersList")
+        for server_id, address, port in servers:
+            remote = element(servers_list, "RemoteServer", prefix=SERVER_PREFIX % server_id)
+            locators = element(remote, "metatrafficUnicastLocatorList")
+            udpv4 = element(element(locators, "locator"), "udpv4")
+            element(udpv4, "address", address)
+            element(udpv4, "port", port)
+    # Publishers
+    writer = element(
+        profiles, "data_writer", profile_name="clearpath_data_writer", is_default_profile="true")
+    publish_mode = element(element(writer, "qos"), "publishMode")
+    element(publish_mode, "kind", "ASYNCHRONOUS" if options[ASYNC_PUBLISHING] else "SYNCHRONOUS")
+    return to_xml(dds)
+
+
+def cyclonedds_profile(config, **options) -> str:
+    # CycloneDDS has no discovery servers, every host is a unicast peer
+    # Publishing mode is not configurable, async_publishing is ignored
+    system = get_system(config)
+    options = get_options(options)
+    cyclone = ElementTree.Element("CycloneDDS", xmlns=CYCLONE_DDS_NAMESPACE)
+    domain = element(cyclone, "Domain", Id=system.domain_id)
+    discovery = element(domain, "Discovery")
+    element(discovery, "ParticipantIndex", "auto")
+    hosts = system.hosts.get_all()
+    if hosts:
+        peers = element(discovery, "Peers")
+        for host in hosts:
+            address = LOCALHOST_IP if host.hostname == system.localhost else host.ip_address
+            element(peers, "Peer", address=address)
+    internal = element(domain, "Internal")
+    element(internal, "SocketSendBufferSize", min=options[SEND_BUFFER_SIZE])
+    element(internal, "SocketReceiveBufferSize", min=options[RECEIVE_BUFFER_SIZE])
+    shared_memory = element(domain, "SharedMemory")
+    element(shared_memory, "Enable", options[SHARED_MEMORY])
+    return to_xml(cyclone)
+
+
+GENERATOR = {
+    FAST_DDS: fastdds_profile,
+    CYCLONE_DDS: cyclonedds_profile,
+}
+
+
+def generate_profile(config, vendor: str = None, **options) -> str:
+    system = get_system(config)
+    vendor = get_vendor(system, vendor)
+    key = middleware_fingerprint(system, vendor, **options)
+    if key in _CACHE:
+        _CACHE.move_to_end(key)
+        return _CACHE[key]
+    profile = GENERATOR[vendor](system, **options)
+    _CACHE[key] = profile
+    while len(_CACHE) > CACHE_SIZE:
+        _CACHE.popitem(last=False)
+    return profile
+
+
+def file_mode(path: str) -> int:
+    # Mode of an existing file, or 0644 less the umask for a new one
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o644 & ~umask
+
+
+def write_profile(config, path: str, vendor: str = None, **options) -> bool:
+    """Write profile to path, return whether the file was modified."""
+    profile = generate_profile(config, vendor, **options)
+    try:
+        with open(path, "r") as f:
+            if f.read() == profile:
+                return False
+    except OSError:
+        pass
+    # Write to temporary file then move into place
+    # - temporary files are owner-only, keep the mode of the file it replaces
+    directory = os.path.dirname(os.path.abspath(path))
+    mode = file_mode(path)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(profile)
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except OSError:
+        os.remove(tmp)
+        raise
+    return True
+
+
+def clear_cache() -> None:
+    _CACHE.clear()
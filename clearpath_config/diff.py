@@ -0,0 +1,152 @@
+# Software License Agreement (BSD)
+#
+# @author    Luis Camero <lcamero@clearpathrobotics.com>
+# @copyright (c) 2023, Clearpath Robotics, Inc., All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# * Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of Clearpath Robotics nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+from clearpath_config.clearpath_config import ClearpathConfig
+from typing import List, NamedTuple
+
+
+# Diff
+#  - structural comparison of two robot configurations
+#  - list entries are matched by identity (see MATCH), not only by position
+#  - sections with equal fingerprints are skipped
+ADDED = "added"
+REMOVED = "removed"
+MODIFIED = "modified"
+
+# List Entry Identity
+# - by path of the list, "*" matches any key
+# - INDEX is the position of the entry in the list
+# - lists without a rule are matched by position
+INDEX = "__index__"
+ANY = "*"
+MATCH = {
+    (ClearpathConfig.SENSORS, ANY): (INDEX, "model"),
+    (ClearpathConfig.LINKS, ANY): ("name",),
+    (ClearpathConfig.SYSTEM, "hosts"): ("hostname",),
+    (ClearpathConfig.SYSTEM, "ros2", "middleware", "servers"): ("server_id",),
+    (ClearpathConfig.PLATFORM, "attachments"): ("name",),
+    (ClearpathConfig.MANIPULATORS, "arms"): (INDEX, "model"),
+}
+
+
+class Change(NamedTuple):
+    op: str
+    path: tuple
+    old: object = None
+    new: object = None
+
+    @property
+    def section(self) -> str:
+        return self.path[0]
+
+    def to_dict(self) -> dict:
+        return {
+            "op": self.op,
+            "path": ".".join(str(p) for p in self.path),
+            "old": self.old,
+            "new": self.new,
+        }
+
+
+def match_rule(path: tuple) -> tuple:
+    for pattern, rule in MATCH.items():
+        if len(pattern) == len(path) and all(
+                p == ANY or p == k for p, k in zip(pattern, path)):
+            return rule
+    return (INDEX,)
+
+
+def index_entries(entries: list, rule: tuple) -> dict:
+    # Identity -> (path key, entry), None if identities are not unique
+    index = {}
+    for i, entry in enumerate(entries):
+        identity = tuple(i if k == INDEX else entry.get(k) for k in rule)
+        if identity in index:
+            return None
+        index[identity] = (identity[0], entry)
+    return index
+
+
+def diff_value(old: object, new: object, path: tuple, changes: List[Change]) -> None:
+    if old == new:
+        return
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            if key not in new:
+                changes.append(Change(REMOVED, path + (key,), old=old[key]))
+            else:
+                diff_value(old[key], new[key], path + (key,), changes)
+        for key in new:
+            if key not in old:
+                changes.append(Change(ADDED, path + (key,), new=new[key]))
+        return
+    if (isinstance(old, list) and isinstance(new, list) and
+            all(isinstance(e, dict) for e in old) and
+            all(isinstance(e, dict) for e in new)):
+        rule = match_rule(path)
+        old_index = index_entries(old, rule)
+        new_index = index_entries(new, rule)
+        if old_index is None or new_index is None:
+            old_index = index_entries(old, (INDEX,))
+            new_index = index_entries(new, (INDEX,))
+        for identity, (key, entry) in old_index.items():
+            if identity not in new_index:
+                changes.append(Change(REMOVED, path + (key,), old=entry))
+            else:
+                diff_value(entry, new_index[identity][1], path + (key,), changes)
+        for identity, (key, entry) in new_index.items():
+            if identity not in old_index:
+                changes.append(Change(ADDED, path + (key,), new=entry))
+        return
+    changes.append(Change(MODIFIED, path, old=old, new=new))
+
+
+def diff_dicts(old: dict, new: dict) -> List[Change]:
+    changes = []
+    diff_value(old, new, (), changes)
+    return changes
+
+
+def diff(old: ClearpathConfig, new: ClearpathConfig) -> List[Change]:
+    if old.fingerprint() == new.fingerprint():
+        return []
+    old_sections = old.section_fingerprints()
+    new_sections = new.section_fingerprints()
+    old_config = old.config
+    new_config = new.config
+    changes = []
+    keys = list(old_config) + [key for key in new_config if key not in old_config]
+    for key in keys:
+        if key in old_sections and old_sections[key] == new_sections.get(key):
+            continue
+        if key not in new_config:
+            changes.append(Change(REMOVED, (key,), old=old_config[key]))
+        elif key not in old_config:
+            changes.append(Change(ADDED, (key,), new=new_config[key]))
+        else:
+            diff_value(old_config[key], new_config[key], (key,), changes)
+    return changes
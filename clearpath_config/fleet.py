@@ -0,0 +1,321 @@
+# Software License Agreement (BSD)
+#
+# @author    Luis Camero <lcamero@clearpathrobotics.com>
+# @copyright (c) 2023, Clearpath Robotics, Inc., All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# * Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of Clearpath Robotics nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+from clearpath_config.clearpath_config import ClearpathConfig
+from clearpath_config.common.types.discovery import Discovery
+from clearpath_config.common.utils.yaml import Document, iter_documents
+from clearpath_config.system.middleware import (
+    get_servers_string,
+    server_sort_key,
+)
+from clearpath_config.system.servers import ServerConfig
+from clearpath_config.validation import validate
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Iterable, Iterator, List
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+
+# Fleet
+#  - loads and validates many robot configurations in parallel
+#  - results are streamed as each file finishes, one dictionary per file
+OK = "ok"
+ERROR = "error"
+PATTERN = "*.yaml"
+
+
+def find_configs(paths: Iterable[str], pattern: str = PATTERN) -> List[str]:
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            # Directory: search recursively for pattern
+            files.extend(glob.glob(os.path.join(path, "**", pattern), recursive=True))
+        elif glob.has_magic(path):
+            files.extend(glob.glob(path, recursive=True))
+        else:
+            files.append(path)
+    # Remove duplicates, keep order
+    return list(dict.fromkeys(os.path.abspath(f) for f in files if not os.path.isdir(f)))
+
+
+def validate_config(path: str) -> dict:
+    return validate_loaded({"path": path}, lambda: ClearpathConfig(path))
+
+
+def validate_loaded(result: dict, load: Callable[[], ClearpathConfig]) -> dict:
+    start = time.perf_counter()
+    try:
+        cc = load()
+        cc.config
+        sensors = cc.sensors
+        result.update({
+            "status": OK,
+            "serial_number": cc.get_serial_number(),
+            "platform": cc.get_platform_model(),
+            "namespace": cc.get_namespace(),
+            "sensors": {
+                "camera": len(sensors.get_all_cameras()),
+                "gps": len(sensors.get_all_gps()),
+                "imu": len(sensors.get_all_imu()),
+                "lidar2d": len(sensors.get_all_lidar_2d()),
+                "lidar3d": len(sensors.get_all_lidar_3d()),
+            },
+        })
+        # Parent issues would only show up when the URDF is built
+        issues = validate(cc)
+        if issues:
+            result.update({
+                "status": ERROR,
+                "error": "%s: %s" % (issues[0].path, issues[0].message),
+                "issues": [issue._asdict() for issue in issues],
+            })
+    except Exception as e:
+        result.update({
+            "status": ERROR,
+            "error": "%s: %s" % (type(e).__name__, e),
+        })
+    result["time"] = round(time.perf_counter() - start, 6)
+    return result
+
+
+def validate_configs(paths: List[str]) -> List[dict]:
+    return [validate_config(path) for path in paths]
+
+
+# Fleet File
+#  - many robot configurations in one multi-document YAML or JSON lines file
+#  - configurations are yielded one at a time, see iter_documents
+def iter_fleet(path: str, jsonl: bool = None) -> Iterator[Document]:
+    for document in iter_documents(path, jsonl):
+        if document.error:
+            yield document
+            continue
+        try:
+            config = ClearpathConfig(document.config)
+        except Exception as e:
+            yield document._replace(config=None, error="Document %d (line %d): %s: %s" % (
+                document.index, document.line, type(e).__name__, e))
+        else:
+            yield document._replace(config=config)
+
+
+def validate_fleet_file(path: str, jsonl: bool = None) -> Iterator[dict]:
+    for document in iter_documents(path, jsonl):
+        result = {"path": path, "index": document.index, "line": document.line}
+        if document.error:
+            result.update({"status": ERROR, "error": document.error, "time": 0.0})
+            yield result
+        else:
+            yield validate_loaded(result, lambda: ClearpathConfig(document.config))
+
+
+def load_fleet(
+        paths: Iterable[str],
+        workers: int = None,
+        chunksize: int = 1,
+        ) -> Iterator[dict]:
+    paths = list(paths)
+    assert chunksize > 0, "Chunk size must be a positive integer"
+    assert workers is None or workers >= 0, "Workers must be zero or a positive integer"
+    chunks = (paths[i:i + chunksize] for i in range(0, len(paths), chunksize))
+    # No workers: load in this process
+    if workers == 0:
+        for chunk in chunks:
+            yield from validate_configs(chunk)
+        return
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Limit chunks in flight to keep memory bounded for large fleets
+        limit = 4 * workers
+        pending = set()
+        for chunk in chunks:
+            pending.add(executor.submit(validate_configs, chunk))
+            if len(pending) < limit:
+                continue
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+
+def summarize(results: Iterable[dict]) -> dict:
+    summary = {
+        "total": 0,
+        OK: 0,
+        ERROR: 0,
+        "platforms": {},
+        "time": 0.0,
+    }
+    for result in results:
+        summary["total"] += 1
+        summary[result["status"]] += 1
+        summary["time"] += result["time"]
+        if result["status"] == OK:
+            platform = result["platform"]
+            summary["platforms"][platform] = summary["platforms"].get(platform, 0) + 1
+    summary["time"] = round(summary["time"], 6)
+    return summary
+
+
+# Discovery Plan
+#  - discovery servers of all robots are merged by ip address and port
+#  - server ids are assigned once for the whole fleet, so every robot uses
+#    the same id for the same server
+#  - servers pinned with override_server_id keep their id, the others are
+#    numbered in host/ip and port order using the remaining ids
+MAX_SERVER_ID = 254
+
+
+def plan_discovery(configs: Iterable[ClearpathConfig]) -> dict:
+    servers = {}
+    pinned = {}
+    robots = []
+    for cc in configs:
+        middleware = cc.system.middleware
+        if middleware.discovery != Discovery.SERVER:
+            continue
+        robot_servers = middleware.servers.get_all()
+        robots.append((cc, robot_servers))
+        for server in robot_servers:
+            address = (server.ip_address, server.port)
+            servers.setdefault(address, server)
+            if not middleware.override_server_id:
+                continue
+            assert pinned.get(address, server.server_id) == server.server_id, (
+                f"Discovery server {server} is pinned to different server ids"
+            )
+            pinned[address] = server.server_id
+    # Pinned ids
+    ids = {}
+    used = {}
+    for address, server_id in pinned.items():
+        assert server_id not in used, (
+            f"Discovery server id {server_id} is pinned by more than one server"
+        )
+        ids[address] = server_id
+        used[server_id] = address
+    # Remaining ids in host/ip and port order
+    free = (i for i in range(MAX_SERVER_ID + 1) if i not in used)
+    for address in sorted(servers, key=lambda a: server_sort_key(servers[a])):
+        if address in ids:
+            continue
+        server_id = next(free, None)
+        assert server_id is not None, (
+            f"Fleet has {len(servers)} discovery servers, at most "
+            f"{MAX_SERVER_ID + 1} server ids are available"
+        )
+        ids[address] = server_id
+    # Fleet servers
+    fleet_servers = {}
+    for address, server in servers.items():
+        fleet_servers[address] = ServerConfig(
+            hostname=server.hostname,
+            ip_address=server.ip_address,
+            port=server.port,
+            server_id=ids[address])
+    # ROS_DISCOVERY_SERVER of each robot
+    # - the robot's own server entries decide which one is its localhost
+    # - servers in fleet id order, so each one is placed at its id
+    discovery = {}
+    for cc, robot_servers in robots:
+        plan = sorted((
+            ServerConfig(
+                hostname=s.hostname,
+                ip_address=s.ip_address,
+                port=s.port,
+                server_id=ids[(s.ip_address, s.port)])
+            for s in robot_servers if s.enabled),
+            key=lambda s: s.server_id)
+        discovery[cc.get_serial_number()] = get_servers_string(
+            plan, cc.system.localhost)
+    return {
+        "servers": sorted(
+            (s.config for s in fleet_servers.values()),
+            key=lambda s: s[ServerConfig.SERVER_ID]),
+        "robots": discovery,
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="clearpath_fleet",
+        description="Load and validate robot configurations in parallel."
+    )
+    parser.add_argument(
+        "paths", nargs="+",
+        help="robot.yaml files, directories or glob patterns")
+    parser.add_argument(
+        "-p", "--pattern", default=PATTERN,
+        help="file pattern used when searching directories (default: %(default)s)")
+    parser.add_argument(
+        "-j", "--workers", type=int, default=None,
+        help="number of worker processes, 0 to load in this process (default: CPU count)")
+    parser.add_argument(
+        "-c", "--chunksize", type=int, default=1,
+        help="number of files sent to a worker at a time (default: %(default)s)")
+    parser.add_argument(
+        "-o", "--output", default="-",
+        help="JSON lines report file (default: stdout)")
+    parser.add_argument(
+        "-s", "--stream", action="store_true",
+        help="paths are multi-document YAML or JSON lines fleet files, read in this process")
+    args = parser.parse_args(argv)
+
+    paths = find_configs(args.paths, args.pattern)
+    output = sys.stdout if args.output == "-" else open(args.output, "w")
+    start = time.perf_counter()
+
+    def report(results: Iterable[dict]) -> Iterator[dict]:
+        # Results are written as they arrive, only the summary is kept
+        for result in results:
+            output.write(json.dumps(result) + "\n")
+            output.flush()
+            yield result
+
+    try:
+        if args.stream:
+            results = (r for path in paths for r in validate_fleet_file(path))
+        else:
+            results = load_fleet(paths, args.workers, args.chunksize)
+        summary = summarize(report(results))
+        summary["elapsed"] = round(time.perf_counter() - start, 6)
+        output.write(json.dumps({"summary": summary}) + "\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 1 if summary[ERROR] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
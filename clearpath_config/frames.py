@@ -0,0 +1,253 @@
+# Software License Agreement (BSD)
+#
+# @author    Luis Camero <lcamero@clearpathrobotics.com>
+# @copyright (c) 2023, Clearpath Robotics, Inc., All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# * Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of Clearpath Robotics nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+from clearpath_config.clearpath_config import ClearpathConfig
+from clearpath_config.common.types.accessory import Accessory
+from math import cos, sin
+from typing import Dict, List, NamedTuple
+
+# NumPy is optional, transforms are computed in pure Python without it
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# Frame Tree
+#  - frames of all accessories: links, mounts, sensors, manipulators and
+#    platform attachments, named as in the generated URDF
+#  - world transforms of all frames, relative to the root of their tree
+#  - parents that are not an accessory frame (e.g. platform mount points)
+#    are roots, unless given as fixed frames
+#  - offsets inside accessory meshes (e.g. height of a mount) are not modelled
+LINKS = "links"
+MOUNTS = "mounts"
+SENSORS = "sensors"
+ARMS = "arms"
+GRIPPERS = "grippers"
+ATTACHMENTS = "attachments"
+
+# Suffix added to the accessory name for its URDF frame
+SUFFIX = {
+    LINKS: "_link",
+    MOUNTS: "_mount",
+    SENSORS: "_link",
+    ARMS: "_base_link",
+    GRIPPERS: "_link",
+    ATTACHMENTS: "_link",
+}
+
+
+class Frame(NamedTuple):
+    name: str
+    parent: str
+    xyz: tuple
+    rpy: tuple
+    # Kind of accessory and its name, None for fixed and root frames
+    kind: str = None
+    accessory: str = None
+
+
+def collect_accessories(config: ClearpathConfig) -> List[tuple]:
+    # (kind, accessory) for every accessory in the configuration
+    accessories = [(LINKS, a) for a in config.links.get_all_links()]
+    accessories += [(MOUNTS, a) for a in config.mounts.get_all_mounts()]
+    accessories += [(SENSORS, a) for a in config.sensors.get_all_sensors()]
+    for arm in config.manipulators.get_all_arms():
+        accessories.append((ARMS, arm))
+        if arm.gripper:
+            accessories.append((GRIPPERS, arm.gripper))
+    accessories += [(ATTACHMENTS, a) for a in config.platform.attachments.get_all()]
+    return accessories
+
+
+def local_transform(xyz: tuple, rpy: tuple) -> List[List[float]]:
+    # URDF convention: R = Rz(yaw) * Ry(pitch) * Rx(roll)
+    cr, sr = cos(rpy[0]), sin(rpy[0])
+    cp, sp = cos(rpy[1]), sin(rpy[1])
+    cy, sy = cos(rpy[2]), sin(rpy[2])
+    return [
+        [cy * cp, cy * sp * sr - sy * cr, cy * sp * cr + sy * sr, xyz[0]],
+        [sy * cp, sy * sp * sr + cy * cr, sy * sp * cr - cy * sr, xyz[1]],
+        [-sp, cp * sr, cp * cr, xyz[2]],
+        [0.0, 0.0, 0.0, 1.0],
+    ]
+
+
+def multiply(a: List[List[float]], b: List[List[float]]) -> List[List[float]]:
+    return [
+        [sum(a[i][k] * b[k][j] for k in range(4)) for j in range(4)]
+        for i in range(4)
+    ]
+
+
+def batched_local_transforms(xyz, rpy):
+    # Local 4x4 transforms of all frames at once, xyz and rpy are (N, 3) arrays
+    cr, cp, cy = numpy.cos(rpy).T
+    sr, sp, sy = numpy.sin(rpy).T
+    local = numpy.zeros((len(xyz), 4, 4))
+    local[:, 0, 0] = cy * cp
+    local[:, 0, 1] = cy * sp * sr - sy * cr
+    local[:, 0, 2] = cy * sp * cr + sy * sr
+    local[:, 1, 0] = sy * cp
+    local[:, 1, 1] = sy * sp * sr + cy * cr
+    local[:, 1, 2] = sy * sp * cr - cy * sr
+    local[:, 2, 0] = -sp
+    local[:, 2, 1] = cp * sr
+    local[:, 2, 2] = cp * cr
+    local[:, :3, 3] = xyz
+    local[:, 3, 3] = 1.0
+    return local
+
+
+class FrameTree():
+
+    def __init__(
+            self,
+            config: ClearpathConfig,
+            fixed: Dict[str, tuple] = None,
+            use_numpy: bool = None
+            ) -> None:
+        """
+        Build the frame tree of a configuration.
+
+        fixed maps extra frame names to (parent, xyz, rpy), e.g. platform mount
+        points. use_numpy defaults to True when NumPy is installed.
+        """
+        if use_numpy is None:
+            use_numpy = numpy is not None
+        assert not use_numpy or numpy is not None, (
+            "NumPy is not installed"
+        )
+        self._use_numpy = use_numpy
+        self._frames: Dict[str, Frame] = {}
+        self._duplicates: List[Frame] = []
+        for name, (parent, xyz, rpy) in (fixed or {}).items():
+            self._add(Frame(name, parent, tuple(xyz), tuple(rpy)))
+        for kind, accessory in collect_accessories(config):
+            self._add(Frame(
+                accessory.get_name() + SUFFIX[kind],
+                accessory.get_parent(),
+                tuple(accessory.get_xyz()),
+                tuple(accessory.get_rpy()),
+                kind,
+                accessory.get_name()
+            ))
+        # Parents without a frame become roots
+        for frame in list(self._frames.values()):
+            if frame.parent not in self._frames:
+                self._frames[frame.parent] = Frame(
+                    frame.parent, None, tuple(Accessory.XYZ), tuple(Accessory.RPY))
+        self._order, self._depth = self._sort()
+        self._transforms = None
+
+    def _add(self, frame: Frame) -> None:
+        if frame.name in self._frames:
+            self._duplicates.append(frame)
+        else:
+            self._frames[frame.name] = frame
+
+    def _sort(self) -> tuple:
+        # Topological order and depth of every frame, roots first
+        children = {}
+        for frame in self._frames.values():
+            if frame.parent is not None:
+                children.setdefault(frame.parent, []).append(frame.name)
+        order = [f.name for f in self._frames.values() if f.parent is None]
+        depth = dict.fromkeys(order, 0)
+        for name in order:
+            for child in children.get(name, []):
+                depth[child] = depth[name] + 1
+                order.append(child)
+        cyclic = [name for name in self._frames if name not in depth]
+        assert not cyclic, (
+            "Frames '%s' form a cycle" % "', '".join(cyclic)
+        )
+        return order, depth
+
+    @property
+    def frames(self) -> Dict[str, Frame]:
+        return dict(self._frames)
+
+    @property
+    def order(self) -> List[str]:
+        return list(self._order)
+
+    @property
+    def duplicates(self) -> List[Frame]:
+        return list(self._duplicates)
+
+    def get_roots(self) -> List[str]:
+        return [name for name in self._order if self._frames[name].parent is None]
+
+    def get_root(self, name: str) -> str:
+        while self._frames[name].parent is not None:
+            name = self._frames[name].parent
+        return name
+
+    def get_children(self, name: str) -> List[str]:
+        return [f.name for f in self._frames.values() if f.parent == name]
+
+    def transforms(self) -> dict:
+        """Return the 4x4 transform of every frame relative to its root."""
+        if self._transforms is None:
+            if self._use_numpy:
+                self._transforms = self._resolve_numpy()
+            else:
+                self._transforms = self._resolve()
+        return self._transforms
+
+    def get_transform(self, name: str):
+        return self.transforms()[name]
+
+    def get_position(self, name: str) -> List[float]:
+        transform = self.get_transform(name)
+        return [float(transform[i][3]) for i in range(3)]
+
+    def _resolve(self) -> dict:
+        world = {}
+        for name in self._order:
+            frame = self._frames[name]
+            local = local_transform(frame.xyz, frame.rpy)
+            world[name] = local if frame.parent is None else multiply(world[frame.parent], local)
+        return world
+
+    def _resolve_numpy(self) -> dict:
+        # One batched matrix product per depth level of the tree
+        if not self._order:
+            return {}
+        index = {name: i for i, name in enumerate(self._order)}
+        frames = [self._frames[name] for name in self._order]
+        world = batched_local_transforms(
+            numpy.array([f.xyz for f in frames], dtype=float),
+            numpy.array([f.rpy for f in frames], dtype=float))
+        parents = numpy.array([index.get(f.parent, -1) for f in frames])
+        depth = numpy.array([self._depth[name] for name in self._order])
+        for level in range(1, int(depth.max()) + 1):
+            rows = numpy.nonzero(depth == level)[0]
+            world[rows] = numpy.matmul(world[parents[rows]], world[rows])
+        return {name: world[i] for name, i in index.items()}
@@ -26,6 +26,7 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 from clearpath_config.common.types.list import ListConfig
+from clearpath_config.common.types.revision import RevisionTracked
 from clearpath_config.common.utils.dictionary import merge_dict
 from clearpath_config.platform.types.attachment import BaseAttachment
 from typing import List
@@ -48,7 +49,7 @@ class AttachmentListConfig(ListConfig[BaseAttachment, str]):
 
 # Attachments Config
 # - to be used by all platforms.
-class AttachmentsConfig:
+class AttachmentsConfig(RevisionTracked):
     def __init__(
             self,
             attachment,
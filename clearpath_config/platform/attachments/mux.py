@@ -26,31 +26,25 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 from clearpath_config.common.types.platform import Platform
-from clearpath_config.platform.attachments.a200 import A200Attachment
+from clearpath_config.common.utils.registry import LazyRegistry
 from clearpath_config.platform.attachments.config import AttachmentsConfig
-from clearpath_config.platform.attachments.dd100 import DD100Attachment
-from clearpath_config.platform.attachments.do100 import DO100Attachment
-from clearpath_config.platform.attachments.dd150 import DD150Attachment
-from clearpath_config.platform.attachments.do150 import DO150Attachment
-from clearpath_config.platform.attachments.generic import GENERICAttachment
-from clearpath_config.platform.attachments.j100 import J100Attachment
-from clearpath_config.platform.attachments.r100 import R100Attachment
-from clearpath_config.platform.attachments.w200 import W200Attachment
 from clearpath_config.platform.types.attachment import BaseAttachment
 
 
 class AttachmentsConfigMux:
-    PLATFORM = {
-        Platform.A200: AttachmentsConfig(A200Attachment),
-        Platform.DD100: AttachmentsConfig(DD100Attachment),
-        Platform.DO100: AttachmentsConfig(DO100Attachment),
-        Platform.DD150: AttachmentsConfig(DD150Attachment),
-        Platform.DO150: AttachmentsConfig(DO150Attachment),
-        Platform.GENERIC: AttachmentsConfig(GENERICAttachment),
-        Platform.J100: AttachmentsConfig(J100Attachment),
-        Platform.W200: AttachmentsConfig(W200Attachment),
-        Platform.R100: AttachmentsConfig(R100Attachment),
-    }
+    # Platform attachment modules are imported on first use
+    # - registry holds attachment classes, every robot gets its own AttachmentsConfig
+    PLATFORM = LazyRegistry({
+        Platform.A200: "clearpath_config.platform.attachments.a200:A200Attachment",
+        Platform.DD100: "clearpath_config.platform.attachments.dd100:DD100Attachment",
+        Platform.DO100: "clearpath_config.platform.attachments.do100:DO100Attachment",
+        Platform.DD150: "clearpath_config.platform.attachments.dd150:DD150Attachment",
+        Platform.DO150: "clearpath_config.platform.attachments.do150:DO150Attachment",
+        Platform.GENERIC: "clearpath_config.platform.attachments.generic:GENERICAttachment",
+        Platform.J100: "clearpath_config.platform.attachments.j100:J100Attachment",
+        Platform.W200: "clearpath_config.platform.attachments.w200:W200Attachment",
+        Platform.R100: "clearpath_config.platform.attachments.r100:R100Attachment",
+    })
 
     def __new__(cls, platform: str, attachments: dict = None) -> AttachmentsConfig:
         # Check Platform is Supported
@@ -61,14 +55,16 @@ class AttachmentsConfigMux:
             )
         )
         if not attachments:
-            return cls.PLATFORM[platform]
+            return AttachmentsConfig(cls.PLATFORM[platform])
         # Pre-Process Entries
         attachments = AttachmentsConfigMux.preprocess(platform, attachments)
         # Add All Attachments
         attachments_config = AttachmentsConfig(BaseAttachment)
+        # Only platforms that are referenced can have attachments
+        referenced = set(a['type'].split('.')[0] for a in attachments)
         for p in cls.PLATFORM:
-            cls.PLATFORM[p].config = attachments
-            attachments_config += cls.PLATFORM[p]
+            if p in referenced:
+                attachments_config += AttachmentsConfig(cls.PLATFORM[p], attachments)
         return attachments_config
 
     @staticmethod
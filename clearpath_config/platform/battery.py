@@ -153,10 +153,14 @@ class BatteryConfig(BaseConfig):
         super().__init__(setters, config, self.BATTERY)
 
     def update_defaults(self) -> None:
-        platform = BaseConfig.get_platform_model()
-        self.DEFAULTS[self.MODEL] = list(self.VALID[platform])[0]
-        self.DEFAULTS[self.CONFIGURATION] = list(
-            self.VALID[platform][self.DEFAULTS[self.MODEL]])[0]
+        platform = self.get_platform_model()
+        model = list(self.VALID[platform])[0]
+        # Update defaults of this instance only
+        self.DEFAULTS = {
+            **self.DEFAULTS,
+            self.MODEL: model,
+            self.CONFIGURATION: list(self.VALID[platform][model])[0],
+        }
 
     def update(self, serial_number: bool = False) -> None:
         if serial_number:
@@ -174,7 +178,7 @@ class BatteryConfig(BaseConfig):
 
     @model.setter
     def model(self, value: str) -> None:
-        platform = BaseConfig.get_platform_model()
+        platform = self.get_platform_model()
         assert platform in self.VALID, ((
             "Platform %s is invalid. " % platform +
             "Platform must be one of: %s" % list(self.VALID)
@@ -196,7 +200,7 @@ class BatteryConfig(BaseConfig):
 
     @configuration.setter
     def configuration(self, value: str) -> None:
-        platform = BaseConfig.get_platform_model()
+        platform = self.get_platform_model()
         assert platform in self.VALID, ((
             "Platform %s is invalid. " % platform +
             "Platform must be one of: %s" % list(self.VALID)
@@ -309,7 +309,11 @@ class ExtrasConfig(BaseConfig):
                     continue
                 setter = self.setter(self._ros_parameters_setters[extended_key])
                 setter(default_parameters[default_parameters_key])
-        self.DEFAULTS[self.ROS_PARAMETERS] = ROSParameterDefaults(self.get_platform_model())
+        # Update defaults of this instance only
+        self.DEFAULTS = {
+            **self.DEFAULTS,
+            self.ROS_PARAMETERS: ROSParameterDefaults(self.get_platform_model()),
+        }
 
     """ROS parameters with node names and flattened dictionaries"""
     @property
@@ -164,7 +164,7 @@ class PlatformConfig(BaseConfig):
             # Reload extras
             self.extras.update(serial_number=serial_number)
             # Generic Robot Launch and URDF
-            if BaseConfig.get_platform_model() == Platform.GENERIC:
+            if self.get_platform_model() == Platform.GENERIC:
                 # Add to Template
                 template = self.template
                 if self.KEYS[self.DESCRIPTION] not in template:
@@ -0,0 +1,172 @@
+# Software License Agreement (BSD)
+#
+# @author    Luis Camero <lcamero@clearpathrobotics.com>
+# @copyright (c) 2023, Clearpath Robotics, Inc., All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# * Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of Clearpath Robotics nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+from clearpath_config.clearpath_config import ClearpathConfig
+from clearpath_config.common.types.discovery import Discovery
+from clearpath_config.diff import Change, diff
+from clearpath_config.system.middleware import MiddlewareConfig
+from typing import Dict, List, NamedTuple
+
+
+# Restart Planner
+#  - maps the changes between two configurations to the generated artifacts
+#    they invalidate, so only the affected processes are restarted
+SENSOR_LAUNCH = "sensor_launch"
+PLATFORM_LAUNCH = "platform_launch"
+URDF = "urdf"
+DISCOVERY_SERVER = "discovery_server"
+MIDDLEWARE_PROFILE = "middleware_profile"
+
+# Every running node: platform launch and all sensor launches
+NODES = "nodes"
+
+
+class Artifact(NamedTuple):
+    kind: str
+    # Sensor name for sensor launch files
+    name: str = None
+
+
+# Artifacts by Key Path
+# - first matching prefix applies, sensors are handled separately
+# - paths in SERVER_PATHS only matter while discovery servers are used
+MIDDLEWARE = (ClearpathConfig.SYSTEM, "ros2", MiddlewareConfig.MIDDLEWARE)
+RULES = (
+    ((ClearpathConfig.SERIAL_NUMBER,), (URDF, DISCOVERY_SERVER, MIDDLEWARE_PROFILE, NODES)),
+    ((ClearpathConfig.VERSION,), ()),
+    (MIDDLEWARE + (MiddlewareConfig.DISCOVERY,), (DISCOVERY_SERVER, MIDDLEWARE_PROFILE, NODES)),
+    (MIDDLEWARE + (MiddlewareConfig.SERVERS,), (DISCOVERY_SERVER, NODES)),
+    (MIDDLEWARE + (MiddlewareConfig.OVERRIDE_SERVER_ID,), (DISCOVERY_SERVER, NODES)),
+    (MIDDLEWARE + (MiddlewareConfig.RMW,), (MIDDLEWARE_PROFILE, NODES)),
+    (MIDDLEWARE + (MiddlewareConfig.PROFILE,), (MIDDLEWARE_PROFILE, NODES)),
+    ((ClearpathConfig.SYSTEM, "ros2"), (NODES,)),
+    ((ClearpathConfig.SYSTEM, "hosts"), (DISCOVERY_SERVER,)),
+    ((ClearpathConfig.SYSTEM, "localhost"), (DISCOVERY_SERVER,)),
+    ((ClearpathConfig.SYSTEM,), (PLATFORM_LAUNCH,)),
+    ((ClearpathConfig.PLATFORM, "attachments"), (URDF,)),
+    ((ClearpathConfig.PLATFORM, "extras", "urdf"), (URDF,)),
+    ((ClearpathConfig.PLATFORM, "wheel"), (URDF, PLATFORM_LAUNCH)),
+    ((ClearpathConfig.PLATFORM,), (PLATFORM_LAUNCH,)),
+    ((ClearpathConfig.LINKS,), (URDF,)),
+    ((ClearpathConfig.MOUNTS,), (URDF,)),
+    ((ClearpathConfig.MANIPULATORS,), (URDF, PLATFORM_LAUNCH)),
+)
+SERVER_PATHS = (
+    MIDDLEWARE + (MiddlewareConfig.SERVERS,),
+    MIDDLEWARE + (MiddlewareConfig.OVERRIDE_SERVER_ID,),
+    (ClearpathConfig.SYSTEM, "hosts"),
+    (ClearpathConfig.SYSTEM, "localhost"),
+)
+
+# Sensor Fields
+# - enable flags of BaseSensor
+# - fields that only affect the robot description
+URDF_ENABLED = "urdf_enabled"
+LAUNCH_ENABLED = "launch_enabled"
+SENSOR_URDF_FIELDS = ("parent", "xyz", "rpy")
+
+
+def uses_discovery_server(config: ClearpathConfig) -> bool:
+    return config.system.middleware.discovery == Discovery.SERVER
+
+
+def sensor_artifacts(change: Change, old: dict, new: dict) -> tuple:
+    _type, idx = change.path[1], change.path[2]
+    name = "%s_%s" % (_type, idx)
+    launch = Artifact(SENSOR_LAUNCH, name)
+    # Entry of this sensor before and after the change
+    entries = [e for e in (old, new) if e is not None]
+    launch_enabled = any(e.get(LAUNCH_ENABLED, True) for e in entries)
+    urdf_enabled = any(e.get(URDF_ENABLED, True) for e in entries)
+    if len(change.path) == 3:
+        # Sensor added or removed
+        return tuple(a for a, enabled in (
+            (launch, launch_enabled), (Artifact(URDF), urdf_enabled)) if enabled)
+    field = change.path[3]
+    if field == URDF_ENABLED:
+        return (Artifact(URDF),)
+    if field == LAUNCH_ENABLED:
+        return (launch,)
+    if field in SENSOR_URDF_FIELDS:
+        return (Artifact(URDF),) if urdf_enabled else ()
+    # ROS parameters and any other driver setting
+    return (launch,) if launch_enabled else ()
+
+
+def sensor_entry(config: dict, path: tuple) -> dict:
+    entries = config.get(ClearpathConfig.SENSORS, {}).get(path[1], [])
+    return entries[path[2]] if path[2] < len(entries) else None
+
+
+def running_nodes(config: dict) -> List[Artifact]:
+    nodes = [Artifact(PLATFORM_LAUNCH)]
+    for _type, entries in config.get(ClearpathConfig.SENSORS, {}).items():
+        for idx, entry in enumerate(entries):
+            if entry.get(LAUNCH_ENABLED, True):
+                nodes.append(Artifact(SENSOR_LAUNCH, "%s_%s" % (_type, idx)))
+    return nodes
+
+
+def plan_restart(
+        old: ClearpathConfig,
+        new: ClearpathConfig
+        ) -> Dict[Artifact, List[Change]]:
+    """Return the invalidated artifacts, each with the changes that caused it."""
+    plan = {}
+    changes = diff(old, new)
+    if not changes:
+        return plan
+    old_config, new_config = old.config, new.config
+    servers = uses_discovery_server(old) or uses_discovery_server(new)
+    for change in changes:
+        path = change.path
+        if path[0] == ClearpathConfig.SENSORS and len(path) >= 3:
+            if len(path) == 3:
+                # Sensor added or removed, the change holds its entry
+                old_entry, new_entry = change.old, change.new
+            else:
+                old_entry = sensor_entry(old_config, path)
+                new_entry = sensor_entry(new_config, path)
+            artifacts = sensor_artifacts(change, old_entry, new_entry)
+        else:
+            artifacts = (PLATFORM_LAUNCH, URDF)
+            for prefix, kinds in RULES:
+                if path[:len(prefix)] == prefix:
+                    artifacts = kinds
+                    break
+            if not servers and any(path[:len(p)] == p for p in SERVER_PATHS):
+                artifacts = ()
+            expanded = []
+            for kind in artifacts:
+                if kind == NODES:
+                    expanded.extend(running_nodes(new_config))
+                else:
+                    expanded.append(Artifact(kind))
+            artifacts = expanded
+        for artifact in artifacts:
+            plan.setdefault(artifact, []).append(change)
+    return plan
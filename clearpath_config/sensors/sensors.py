@@ -27,6 +27,7 @@
 # POSSIBILITY OF SUCH DAMAGE.
 from clearpath_config.common.types.accessory import Accessory
 from clearpath_config.common.types.config import BaseConfig
+from clearpath_config.common.types.context import get_context
 from clearpath_config.common.types.list import OrderedListConfig
 from clearpath_config.common.types.platform import Platform
 from clearpath_config.common.utils.dictionary import flip_dict
@@ -63,7 +64,7 @@ from clearpath_config.sensors.types.lidars_3d import (
     VelodyneLidar,
 )
 
-from typing import List
+from typing import Dict, List, NamedTuple
 
 
 class InertialMeasurementUnit():
@@ -224,6 +225,14 @@ class Sensor():
 class SensorListConfig(OrderedListConfig[BaseSensor]):
     def __init__(self) -> None:
         super().__init__(obj_type=BaseSensor)
+        # Sensors in the list use the context of the list
+        self._context = get_context()
+
+    def update(self) -> None:
+        super().update()
+        for sensor in self.get_all():
+            if sensor._context is not self._context:
+                sensor._context = self._context
 
     def to_dict(self) -> List[dict]:
         d = []
@@ -232,6 +241,15 @@ class SensorListConfig(OrderedListConfig[BaseSensor]):
         return d
 
 
+# Topic Entry
+# - single sensor topic of the topic table
+class TopicEntry(NamedTuple):
+    sensor: str
+    key: str
+    topic: str
+    rate: float
+
+
 # Sensor Config
 class SensorConfig(BaseConfig):
     LIDAR2D_INDEX = 0
@@ -298,6 +316,12 @@ class SensorConfig(BaseConfig):
         }
         super().__init__(template, config, self.SENSORS)
 
+    def __getstate__(self) -> dict:
+        # Topic table is rebuilt on demand
+        state = super().__getstate__()
+        state.pop("_topic_table", None)
+        return state
+
     def update(self, serial_number=False) -> None:
         if serial_number:
             platform = self.get_platform_model()
@@ -438,6 +462,51 @@ class SensorConfig(BaseConfig):
         sensors.extend(self.get_all_gps())
         return sensors
 
+    # Topic Table
+    # - full name and rate of every sensor topic, keyed by full topic name
+    # - rebuilt only when the namespace or a sensor list changes, sensor
+    #   names follow their position in the list
+    def _topic_table_key(self) -> tuple:
+        return (
+            self._context.get_namespace(),
+            self._lidar2d._revision,
+            self._lidar3d._revision,
+            self._camera._revision,
+            self._imu._revision,
+            self._gps._revision,
+        )
+
+    def _get_topic_table(self) -> tuple:
+        key = self._topic_table_key()
+        cached = self.__dict__.get("_topic_table")
+        if cached is not None and cached[0] == key:
+            return cached
+        sensors = self.get_all_sensors()
+        table = {}
+        by_sensor = {}
+        for sensor in sensors:
+            for topic in sensor.TOPICS.NAME:
+                entry = TopicEntry(
+                    sensor.name,
+                    topic,
+                    sensor.get_topic(topic),
+                    sensor.get_topic_rate(topic))
+                table[entry.topic] = entry
+                by_sensor[entry.topic] = sensor
+        cached = (key, table, by_sensor)
+        # Cache is not part of the config, do not stamp a revision
+        object.__setattr__(self, "_topic_table", cached)
+        return cached
+
+    def topic_table(self) -> Dict[str, TopicEntry]:
+        return self._get_topic_table()[1]
+
+    def get_topic_entry(self, topic: str) -> TopicEntry:
+        return self.topic_table().get(topic)
+
+    def get_sensor_by_topic(self, topic: str) -> BaseSensor:
+        return self._get_topic_table()[2].get(topic)
+
     # Lidar2D: Add Lidar2D by Object or Common Lidar2D Parameters
     def add_lidar2d(
             self,
@@ -226,6 +226,9 @@ class BaseCamera(BaseSensor):
         for republisher in republishers:
             self._republishers.append(Republisher(republisher))
 
+    def has_republisher(self, _type: str) -> bool:
+        return any(republisher.TYPE == _type for republisher in self._republishers)
+
     def to_dict(self) -> dict:
         config = super().to_dict()
         config['republishers'] = self.republishers
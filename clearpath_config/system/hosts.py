@@ -105,7 +105,7 @@ class HostConfig(BaseConfig):
     def ip_address(self) -> IP:
         self.set_config_param(
             key=self.KEYS[self.IP_ADDRESS],
-            value=self._ip
+            value=str(self._ip)
         )
         return self._ip
 
@@ -27,7 +27,7 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 import os
-from typing import List
+from typing import Iterable, List
 
 from clearpath_config.common.types.config import BaseConfig
 from clearpath_config.common.types.discovery import Discovery
@@ -38,6 +38,44 @@ from clearpath_config.system.hosts import HostListConfig
 from clearpath_config.system.servers import ServerListConfig, ServerConfig
 
 
+def server_sort_key(server: ServerConfig) -> tuple:
+    # Servers are numbered by host/ip address and then port
+    return (str.lower(server.hostname), server.ip_address, server.port)
+
+
+def assert_unique_servers(servers: Iterable[ServerConfig]) -> None:
+    # Each combination of host/ip and port number must be unique
+    addresses = set()
+    for server in servers:
+        address = (server.ip_address, server.port)
+        assert address not in addresses, (
+            f"Discovery server {server} conflicts with another discovery server. " +
+            "Each combination of host/ip and port number must be unique."
+        )
+        addresses.add(address)
+
+
+def get_servers_string(servers: Iterable[ServerConfig], localhost: str = None) -> str:
+    # ROS_DISCOVERY_SERVER: servers in list order, padded up to their server id
+    # - servers on the localhost are reached over 127.0.0.1
+    # - a server id below the current position is not padded, so servers out
+    #   of id order (override_server_id) keep their list order
+    servers_str = ''
+    i = 0
+    for s in servers:
+        if not s.enabled:
+            continue
+        while i < s.server_id:
+            servers_str += ';'
+            i += 1
+        if localhost is not None and s.hostname == localhost:
+            servers_str += f'127.0.0.1:{s.port};'
+        else:
+            servers_str += f'{s.ip_address}:{s.port};'
+        i += 1
+    return servers_str
+
+
 class MiddlewareConfig(BaseConfig):
     MIDDLEWARE = "middleware"
     RMW = "implementation"
@@ -212,31 +250,29 @@ class MiddlewareConfig(BaseConfig):
             server_list = value.get_all()
 
         # set IP addresses based on the host names provided
+        # - hosts are indexed by name, the first host with a name is used
+        hosts = {}
+        if self.hosts:
+            for host in self.hosts.get_all():
+                hosts.setdefault(host.hostname, host)
         for server in server_list:
             # if a host name was provided, use the look up to determine the ip address
             if server.hostname:
-                assert any(server.hostname == s.hostname for s in self.hosts.get_all()), (
+                assert server.hostname in hosts, (
                     f"Provided hostname: {server.hostname} is not listed in the hosts list"
                 )
-                match = next((s for s in self.hosts.get_all() if s.hostname == server.hostname))
-                server.ip_address = match.ip_address
+                server.ip_address = hosts[server.hostname].ip_address
             else:
                 assert server.ip_address, (
                     f"Server {server} is listed without a host name or IP address."
                 )
 
-        for server in server_list:
-            # Ensure no duplicate server host/ip + port
-            count = sum(((s.ip_address == server.ip_address) and (s.port == server.port))
-                        for s in server_list)
-            assert count == 1, (
-                f"Discovery server {server} conflicts with another discovery server. " +
-                "Each combination of host/ip and port number must be unique."
-            )
+        # Ensure no duplicate server host/ip + port
+        assert_unique_servers(server_list)
 
         # sort the servers by host/ip address and then port
         # required for consistent server id numbering
-        server_list.sort(key=lambda s: (str.lower(s.hostname), s.ip_address, s.port))
+        server_list.sort(key=server_sort_key)
 
         if not self.override_server_id:
             # assign server id numbering - this numbering must be consistent across all devices
@@ -246,35 +282,20 @@ class MiddlewareConfig(BaseConfig):
             # Only for edge cases where server id is needed to be manually specified in the config
             # Ensure no duplicate server server_id
             # (unspecified ones will default and show up as duplicates)
+            ids = set()
             for server in server_list:
-                count = sum(s.server_id == server.server_id for s in server_list)
-                assert count == 1, (
+                assert server.server_id not in ids, (
                     f"Server {server} does not have a unique server id. While " +
                     "override_server_id is true, each server must have a unique id specified."
                 )
+                ids.add(server.server_id)
 
         servers = ServerListConfig()
         servers.set_all(server_list)
         self._servers = servers
 
     def get_servers_string(self) -> str:
-        server_list = self.servers.get_all()
-
-        servers_str = ''
-        i = 0
-        for s in server_list:
-            if not s.enabled:
-                continue
-            while i < s.server_id:
-                servers_str += ';'
-                i += 1
-            if s.hostname == self.localhost:
-                servers_str += f'127.0.0.1:{s.port};'
-            else:
-                servers_str += f'{s.ip_address}:{s.port};'
-            i += 1
-
-        return servers_str
+        return get_servers_string(self._servers.get_all(), self.localhost)
 
     def get_local_server(self) -> ServerConfig:
         # check for the localhost in the server list
@@ -121,18 +121,16 @@ class SystemConfig(BaseConfig):
 
     def update(self, serial_number=False) -> None:
         if serial_number:
-            # check if hosts list is set to default, if so update it
-            hosts = self.DEFAULTS[self.HOSTS]
-            hosts[0][HostConfig.HOSTNAME] = BaseConfig.get_serial_number()
-            if self.hosts.to_dict() == self.DEFAULTS[self.HOSTS]:
-                self.hosts = hosts
+            # Default hosts list is left as is, its hostname is not the serial number
             # Update if still defaults
-            namespace = Namespace.clean(BaseConfig.get_serial_number(prefix=True))
+            namespace = Namespace.clean(self.get_serial_number(prefix=True))
             if self.namespace == self.DEFAULTS[self.NAMESPACE]:
                 self.namespace = namespace
-            # Update defaults
-            self.DEFAULTS[self.HOSTS] = hosts
-            self.DEFAULTS[self.NAMESPACE] = namespace
+            # Update defaults of this instance only
+            self.DEFAULTS = {
+                **self.DEFAULTS,
+                self.NAMESPACE: namespace,
+            }
 
     @property
     def hosts(self) -> HostListConfig:
@@ -212,13 +210,13 @@ class SystemConfig(BaseConfig):
     def namespace(self) -> str:
         self.set_config_param(
             key=self.KEYS[self.NAMESPACE],
-            value=BaseConfig.get_namespace()
+            value=self.get_namespace()
         )
-        return BaseConfig.get_namespace()
+        return self.get_namespace()
 
     @namespace.setter
     def namespace(self, value: str | Namespace) -> None:
-        BaseConfig.set_namespace(value)
+        self.set_namespace(value)
 
     @property
     def domain_id(self) -> int:
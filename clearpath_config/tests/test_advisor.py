@@ -0,0 +1,87 @@
+# Software License Agreement (BSD)
+#
+# @author    Luis Camero <lcamero@clearpathrobotics.com>
+# @copyright (c) 2023, Clearpath Robotics, Inc., All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# * Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of Clearpath Robotics nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+from clearpath_config.advisor import (
+    BEST_EFFORT,
+    LOCAL,
+    RELIABLE,
+    WIFI,
+    advise,
+    main,
+    write_qos_overrides,
+)
+from clearpath_config.clearpath_config import ClearpathConfig
+from clearpath_config.common.utils.yaml import read_yaml
+from clearpath_config.dds_profile import DEFAULTS, SEGMENT_SIZE
+import json
+import os
+
+SAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "sample")
+SAMPLE = os.path.join(SAMPLE_DIR, "a200", "a200_sample.yaml")
+
+
+def test_advise_local():
+    report = advise(ClearpathConfig(SAMPLE))
+    assert report["link"] == LOCAL
+    assert report["republishers"] == []
+    assert report["remote_bandwidth_mbps"] == 0.0
+    assert not report["over_budget"]
+    assert report["shared_memory"]
+    assert report["profile_options"][SEGMENT_SIZE] >= DEFAULTS[SEGMENT_SIZE]
+    qos = {t["topic"].split("/")[-1]: t["qos"] for t in report["topics"]}
+    assert qos["points"]["reliability"] == BEST_EFFORT
+    assert qos["points"]["depth"] == 1
+    assert qos["imu"]["reliability"] == RELIABLE
+
+
+def test_advise_wifi():
+    config = ClearpathConfig(SAMPLE)
+    report = advise(config, WIFI)
+    assert report["over_budget"]
+    assert report["remote_bandwidth_mbps"] < report["bandwidth_mbps"]
+    republisher = report["republishers"][0]
+    assert republisher["sensor"] == "camera_0"
+    assert not republisher["enabled"]
+    assert any(t["over_budget"] for t in report["topics"])
+    # Dropping the point clouds fits the rest into the link
+    config.sensors.get_camera(0).set_pointcloud_enabled(False)
+    config.sensors.get_camera(0).set_depth_enabled(False)
+    config.sensors.get_lidar_3d(0).set_launch_enabled(False)
+    report = advise(config, WIFI)
+    assert not report["over_budget"]
+
+
+def test_qos_overrides(tmp_path):
+    report = advise(ClearpathConfig(SAMPLE))
+    paths = write_qos_overrides(report, str(tmp_path))
+    assert len(paths) == 3
+    overrides = read_yaml(str(tmp_path / "lidar3d_0_qos_overrides.yaml"))
+    qos = overrides["/**"]["ros__parameters"]["qos_overrides"]
+    assert qos["/a200_0000/sensors/lidar3d_0/points"]["publisher"]["depth"] == 1
+    output = tmp_path / "report.json"
+    assert main([SAMPLE, "-l", "wifi", "-o", str(output)]) == 1
+    assert json.loads(output.read_text())["link"] == WIFI
@@ -0,0 +1,72 @@
+# Software License Agreement (BSD)
+#
+# @author    Luis Camero <lcamero@clearpathrobotics.com>
+# @copyright (c) 2023, Clearpath Robotics, Inc., All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# * Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of Clearpath Robotics nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+from clearpath_config.bandwidth import estimate_bandwidth
+from clearpath_config.clearpath_config import ClearpathConfig
+import os
+
+SAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "sample")
+SAMPLE = os.path.join(SAMPLE_DIR, "a200", "a200_sample.yaml")
+
+
+class TestBandwidth:
+
+    def test_estimate(self):
+        config = ClearpathConfig(SAMPLE)
+        report = estimate_bandwidth(config)
+        topics = {t["topic"]: t for t in report["topics"]}
+        scan = topics["a200_0000/sensors/lidar2d_0/scan"]
+        assert scan["rate"] == 10.0
+        assert scan["bandwidth"] == scan["rate"] * scan["size"]
+        assert report["rate"] == sum(s["rate"] for s in report["sensors"].values())
+        assert report["bandwidth"] == sum(t["bandwidth"] for t in report["topics"])
+
+    def test_camera_fps(self):
+        config = ClearpathConfig(SAMPLE)
+        camera = config.sensors.get_camera(0)
+        before = estimate_bandwidth(config)["sensors"][camera.name]["bandwidth"]
+        camera.set_color_fps(15)
+        camera.set_depth_fps(15)
+        after = estimate_bandwidth(config)["sensors"][camera.name]
+        # Every camera stream halves, the imu is unchanged
+        assert after["bandwidth"] < before * 0.51
+
+    def test_budget(self):
+        config = ClearpathConfig(SAMPLE)
+        report = estimate_bandwidth(config, budget_mbps=1e6)
+        assert not report["over_budget"]
+        report = estimate_bandwidth(config, budget_mbps=1.0)
+        assert report["over_budget"]
+        assert report["bandwidth_mbps"] > 1.0
+
+    def test_launch_disabled(self):
+        config = ClearpathConfig(SAMPLE)
+        for sensor in config.sensors.get_all_sensors():
+            sensor.set_launch_enabled(False)
+        report = estimate_bandwidth(config.sensors)
+        assert report["topics"] == []
+        assert report["bandwidth"] == 0.0
@@ -0,0 +1,233 @@
+# Software License Agreement (BSD)
+#
+# @author    Luis Camero <lcamero@clearpathrobotics.com>
+# @copyright (c) 2023, Clearpath Robotics, Inc., All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# * Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of Clearpath Robotics nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+from copy import deepcopy
+import glob
+import os
+from typing import MutableMapping
+
+import pytest
+
+from clearpath_config.common.utils.dictionary import (
+    flatten_dict,
+    merge_dict,
+    replace_dict_keys,
+    unflatten_dict,
+)
+from clearpath_config.common.utils.yaml import read_yaml
+
+pytest.importorskip("pytest_benchmark")
+
+SAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "sample")
+SAMPLES = sorted(glob.glob(os.path.join(SAMPLE_DIR, "**", "*.yaml"), recursive=True))
+REPLACEMENTS = {"camera_0": "camera_1", "lidar2d_0": "lidar2d_1", "ros_parameters": "params"}
+
+
+# Reference: recursive implementations the iterative versions must match
+def reference_flatten_dict(d: MutableMapping, parent_key: str = '', dlim: str = '.'):
+    flat = {}
+    for k, v in d.items():
+        new_key = parent_key + dlim + str(k) if parent_key else str(k)
+        if isinstance(v, MutableMapping):
+            flat.update(reference_flatten_dict(v, new_key, dlim))
+        else:
+            flat[new_key] = v
+    return flat
+
+
+def reference_merge_dict(a, b, path=None, priority=0):
+    if path is None:
+        path = []
+    for key in b:
+        if key in a:
+            if isinstance(a[key], dict) and isinstance(b[key], dict):
+                reference_merge_dict(a[key], b[key], path + [str(key)])
+            elif a[key] == b[key]:
+                pass
+            else:
+                if isinstance(a[key], list) and isinstance(b[key], list):
+                    a[key].extend(b[key])
+                elif priority:
+                    a[key] = b[key]
+        else:
+            a[key] = b[key]
+    return a
+
+
+def reference_unflatten_dict(d: MutableMapping, parent_key: str = '', dlim: str = '.'):
+    _d = {}
+    for k, v in d.items():
+        if isinstance(v, dict):
+            v = reference_unflatten_dict(v, parent_key, dlim)
+        _d_curr = {}
+        _d_next = {}
+        keys = k.split(dlim)
+        keys.reverse()
+        for i, _ in enumerate(keys):
+            _d_next[keys[i]] = v if i == 0 else _d_curr
+            _d_curr = _d_next
+            _d_next = {}
+        reference_merge_dict(_d, _d_curr)
+    return _d
+
+
+def reference_replace_dict_keys(d: dict, replacements: dict):
+    new_d = dict()
+    for key, value in reference_flatten_dict(d).items():
+        new_key = key
+        for r in replacements:
+            if r in key:
+                new_key = key.replace(r, replacements[r])
+        new_d[new_key] = value
+    return reference_unflatten_dict(new_d)
+
+
+# Synthetic Inputs
+def make_deep(depth: int = 200) -> dict:
+    d = leaf = {}
+    for i in range(depth):
+        leaf["level_%s" % i] = {"value": i, "values": [i]}
+        leaf = leaf["level_%s" % i]
+    return d
+
+
+def make_wide(width: int = 2000) -> dict:
+    return {
+        "node_%s" % i: {"a": i, "b.c": [i], "d": {"e": "camera_0", "f": None}}
+        for i in range(width)
+    }
+
+
+def load_samples() -> dict:
+    merged = {}
+    for path in SAMPLES:
+        merged[os.path.relpath(path, SAMPLE_DIR)] = read_yaml(path)
+    return merged
+
+
+INPUTS = {
+    "samples": load_samples(),
+    "deep": make_deep(),
+    "wide": make_wide(),
+}
+PARAMS = pytest.mark.parametrize("name", list(INPUTS))
+
+
+# Equivalence
+@PARAMS
+def test_flatten_matches_reference(name):
+    d = INPUTS[name]
+    flat = flatten_dict(d)
+    assert flat == reference_flatten_dict(d)
+    assert list(flat) == list(reference_flatten_dict(d))
+
+
+@PARAMS
+def test_unflatten_matches_reference(name):
+    flat = flatten_dict(INPUTS[name])
+    assert unflatten_dict(deepcopy(flat)) == reference_unflatten_dict(deepcopy(flat))
+
+
+@PARAMS
+@pytest.mark.parametrize("priority", [0, 1])
+def test_merge_matches_reference(name, priority):
+    a = INPUTS[name]
+    b = replace_dict_keys(a, {"0": "1"})
+    assert (
+        merge_dict(deepcopy(a), deepcopy(b), priority=priority) ==
+        reference_merge_dict(deepcopy(a), deepcopy(b), priority=priority)
+    )
+
+
+@PARAMS
+def test_replace_keys_matches_reference(name):
+    d = INPUTS[name]
+    assert replace_dict_keys(d, REPLACEMENTS) == reference_replace_dict_keys(d, REPLACEMENTS)
+
+
+def test_edge_cases():
+    # Top level priority only
+    assert merge_dict({"a": 1, "b": {"c": 1}}, {"a": 2, "b": {"c": 2}}, priority=1) == {
+        "a": 2, "b": {"c": 1}}
+    # Lists are extended
+    assert merge_dict({"a": [1]}, {"a": [2]}) == {"a": [1, 2]}
+    # Existing leaf wins over a new branch
+    assert unflatten_dict({"a": 1, "a.b": 2}) == {"a": 1}
+    # Last matching replacement wins
+    assert replace_dict_keys({"ab": 1}, {"a": "x", "b": "y"}) == {"ay": 1}
+
+
+# Benchmarks
+@PARAMS
+@pytest.mark.benchmark(group="flatten_dict")
+def test_flatten_iterative(benchmark, name):
+    benchmark(flatten_dict, INPUTS[name])
+
+
+@PARAMS
+@pytest.mark.benchmark(group="flatten_dict")
+def test_flatten_reference(benchmark, name):
+    benchmark(reference_flatten_dict, INPUTS[name])
+
+
+@PARAMS
+@pytest.mark.benchmark(group="unflatten_dict")
+def test_unflatten_iterative(benchmark, name):
+    benchmark(unflatten_dict, flatten_dict(INPUTS[name]))
+
+
+@PARAMS
+@pytest.mark.benchmark(group="unflatten_dict")
+def test_unflatten_reference(benchmark, name):
+    benchmark(reference_unflatten_dict, flatten_dict(INPUTS[name]))
+
+
+@PARAMS
+@pytest.mark.benchmark(group="merge_dict")
+def test_merge_iterative(benchmark, name):
+    benchmark.pedantic(
+        merge_dict, setup=lambda: ((deepcopy(INPUTS[name]), INPUTS[name]), {}), rounds=20)
+
+
+@PARAMS
+@pytest.mark.benchmark(group="merge_dict")
+def test_merge_reference(benchmark, name):
+    benchmark.pedantic(
+        reference_merge_dict, setup=lambda: ((deepcopy(INPUTS[name]), INPUTS[name]), {}),
+        rounds=20)
+
+
+@PARAMS
+@pytest.mark.benchmark(group="replace_dict_keys")
+def test_replace_keys_iterative(benchmark, name):
+    benchmark(replace_dict_keys, INPUTS[name], REPLACEMENTS)
+
+
+@PARAMS
+@pytest.mark.benchmark(group="replace_dict_keys")
+def test_replace_keys_reference(benchmark, name):
+    benchmark(reference_replace_dict_keys, INPUTS[name], REPLACEMENTS)
@@ -0,0 +1,79 @@
+# Software License Agreement (BSD)
+#
+# @author    Luis Camero <lcamero@clearpathrobotics.com>
+# @copyright (c) 2023, Clearpath Robotics, Inc., All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# * Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of Clearpath Robotics nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+import glob
+import os
+
+import pytest
+
+from clearpath_config.clearpath_config import ClearpathConfig
+from clearpath_config.common.utils.yaml import (
+    JSON,
+    MSGPACK,
+    YAML,
+    import_optional,
+    read_config,
+    write_config,
+)
+
+pytest.importorskip("pytest_benchmark")
+
+SAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "sample")
+SAMPLES = sorted(
+    path for path in glob.glob(os.path.join(SAMPLE_DIR, "*", "*.yaml"))
+    if os.path.basename(os.path.dirname(path)) != "sensors")
+FORMATS = [
+    YAML,
+    JSON,
+    pytest.param(MSGPACK, marks=pytest.mark.skipif(
+        import_optional("msgpack") is None, reason="msgpack not installed")),
+]
+
+
+@pytest.fixture(scope="module")
+def configs():
+    return [ClearpathConfig(path).config for path in SAMPLES]
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_load(benchmark, configs, fmt, tmp_path):
+    benchmark.group = "load"
+    paths = []
+    for i, config in enumerate(configs):
+        path = str(tmp_path / ("%d.%s" % (i, fmt)))
+        write_config(path, config, fmt)
+        paths.append(path)
+    loaded = benchmark(lambda: [read_config(path, fmt) for path in paths])
+    assert loaded == configs
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_dump(benchmark, configs, fmt, tmp_path):
+    benchmark.group = "dump"
+    paths = [str(tmp_path / ("%d.%s" % (i, fmt))) for i in range(len(configs))]
+    benchmark(lambda: [write_config(p, c, fmt) for p, c in zip(paths, configs)])
+    assert [read_config(p, fmt) for p in paths] == configs
@@ -0,0 +1,96 @@
+# Software License Agreement (BSD)
+#
+# @author    Luis Camero <lcamero@clearpathrobotics.com>
+# @copyright (c) 2023, Clearpath Robotics, Inc., All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# * Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of Clearpath Robotics nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+from copy import deepcopy
+
+import pytest
+
+from clearpath_config.common.types.list import OrderedListConfig
+from clearpath_config.sensors.sensors import Camera, SensorListConfig
+
+pytest.importorskip("pytest_benchmark")
+
+SENSOR_COUNT = 50
+
+
+def make_cameras(count: int = SENSOR_COUNT) -> list:
+    cameras = []
+    for i in range(count):
+        camera = Camera(Camera.INTEL_REALSENSE)
+        camera.from_dict({
+            "ros_parameters": {
+                "intel_realsense": {
+                    "serial_no": str(i),
+                    "enable_color": True,
+                    "rgb_camera.color_profile": "640,480,30",
+                    "enable_depth": True,
+                    "depth_module.depth_profile": "640,480,30",
+                    "pointcloud.enable": True,
+                    **{"custom.parameter_%s" % j: float(j) for j in range(40)},
+                }
+            },
+            "republishers": [
+                {"type": "compress"},
+                {"type": "rectify"},
+                {"type": "resize"},
+                {"type": "theora"},
+            ],
+        })
+        cameras.append(camera)
+    return cameras
+
+
+def deepcopy_set_all(sensors: OrderedListConfig, _list: list) -> None:
+    # Previous implementation: snapshot with deepcopy then add one-by-one
+    tmp_list = deepcopy(sensors.get_all())
+    sensors.remove_all()
+    try:
+        for obj in _list:
+            sensors.add(obj)
+    except AssertionError:
+        sensors.set_all(tmp_list)
+
+
+@pytest.fixture
+def sensors() -> SensorListConfig:
+    sensors = SensorListConfig()
+    sensors.set_all(make_cameras())
+    return sensors
+
+
+@pytest.mark.benchmark(group="set_all")
+def test_set_all_staged(benchmark, sensors):
+    cameras = make_cameras()
+    benchmark(sensors.set_all, cameras)
+    assert len(sensors.get_all()) == SENSOR_COUNT
+
+
+@pytest.mark.benchmark(group="set_all")
+def test_set_all_deepcopy(benchmark, sensors):
+    cameras = make_cameras()
+    benchmark(deepcopy_set_all, sensors, cameras)
+    assert len(sensors.get_all()) == SENSOR_COUNT
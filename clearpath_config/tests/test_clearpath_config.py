@@ -0,0 +1,215 @@
+# Software License Agreement (BSD)
+#
+# @author    Luis Camero <lcamero@clearpathrobotics.com>
+# @copyright (c) 2023, Clearpath Robotics, Inc., All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# * Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of Clearpath Robotics nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+import glob
+import marshal
+import os
+import pytest
+from clearpath_config.clearpath_config import ClearpathConfig
+from clearpath_config.common.utils import snapshot
+from clearpath_config.system.hosts import HostConfig
+from clearpath_config.system.system import SystemConfig
+
+sample = os.path.dirname(os.path.realpath(__file__)) + "/../sample"
+
+A200_SAMPLE = sample + "/a200/a200_sample.yaml"
+J100_SAMPLE = sample + "/j100/j100_sample.yaml"
+GPS_SAMPLE = sample + "/sensors/garmin_18x.yaml"
+
+
+class TestClearpathConfig:
+
+    def test_config_reflects_changes(self):
+        cc = ClearpathConfig(A200_SAMPLE)
+        config = cc.config
+        assert cc.config is config
+        # Change through a held sensor reference
+        lidar = cc.sensors.get_all_lidar_2d()[0]
+        lidar.set_xyz([1.0, 2.0, 3.0])
+        assert cc.config["sensors"]["lidar2d"][0]["xyz"] == [1.0, 2.0, 3.0]
+        # Change through list mutation
+        cc.sensors.remove_lidar_2d(0)
+        count = len(cc.sensors.get_all_lidar_2d())
+        assert len(cc.config["sensors"]["lidar2d"]) == count
+        # Change through sub-config setter
+        cc.system.username = "robot"
+        assert cc.config["system"]["username"] == "robot"
+
+    def test_configs_are_independent(self):
+        defaults = dict(SystemConfig.DEFAULTS)
+        a200 = ClearpathConfig(A200_SAMPLE)
+        j100 = ClearpathConfig(J100_SAMPLE)
+        assert a200.serial_number == "a200-0000"
+        assert j100.serial_number == "j100-0000"
+        assert a200.system.namespace == "a200_0000"
+        assert j100.system.namespace == "j100_0000"
+        lidar = a200.sensors.get_all_lidar_2d()[0]
+        assert lidar.get_topic("scan").startswith("a200_0000/")
+        # Changing one robot leaves the other untouched
+        j100.system.namespace = "robot"
+        assert a200.system.namespace == "a200_0000"
+        assert lidar.get_topic("scan").startswith("a200_0000/")
+        assert SystemConfig.DEFAULTS == defaults
+
+    def test_default_hosts(self):
+        # Config without hosts keeps the default host, on every load
+        default = HostConfig.DEFAULTS[HostConfig.HOSTNAME]
+        for path in (GPS_SAMPLE, A200_SAMPLE, GPS_SAMPLE):
+            cc = ClearpathConfig(path)
+        assert cc.serial_number == "a200-0000"
+        assert cc.config["system"]["hosts"][0]["hostname"] == default
+        assert cc.config["system"]["ros2"]["namespace"] == "cpr_a200_0000"
+        assert HostConfig.DEFAULTS[HostConfig.HOSTNAME] == default
+
+    def test_concurrent_loading(self):
+        def sections(path: str) -> tuple:
+            # Copy on load, later loads must not change an earlier config
+            config = deepcopy(ClearpathConfig(path).config)
+            return (
+                config["serial_number"],
+                config["system"]["ros2"],
+                config["platform"],
+                config["sensors"],
+            )
+        # Samples with and without attachments, across all platforms
+        paths = sorted(glob.glob(sample + "/*/*.yaml"))
+        expected = {path: sections(path) for path in paths}
+        # Alternate samples with and without attachments, nothing may leak between them
+        attached = [path for path in paths if expected[path][2]["attachments"]]
+        detached = [path for path in paths if path not in attached]
+        paths = [path for pair in zip(attached * 4, detached * 2) for path in pair]
+        with ThreadPoolExecutor(16) as executor:
+            loaded = list(executor.map(sections, paths))
+        for path, result in zip(paths, loaded):
+            assert result == expected[path]
+
+    def test_attachments_are_independent(self):
+        a200 = ClearpathConfig(A200_SAMPLE)
+        gps = ClearpathConfig(GPS_SAMPLE)
+        assert gps.config["platform"]["attachments"] == []
+        j100 = ClearpathConfig(J100_SAMPLE)
+        names = [a.get_name() for a in a200.platform.attachments.get_all()]
+        assert "front_bumper" in names
+        assert "front_fender" not in names
+        assert [a.get_name() for a in j100.platform.attachments.get_all()] == [
+            "front_fender", "rear_fender"]
+        assert ClearpathConfig(A200_SAMPLE).config["platform"] == a200.config["platform"]
+
+    def test_lazy_sections(self):
+        cc = ClearpathConfig(A200_SAMPLE, lazy=True)
+        assert cc.materialized == []
+        assert cc.system.namespace == "a200_0000"
+        assert cc.materialized == ["system"]
+        # Serial number changes apply to sections built later
+        cc.serial_number = "j100-0001"
+        eager = ClearpathConfig(A200_SAMPLE)
+        eager.serial_number = "j100-0001"
+        assert cc.platform.battery.model == eager.platform.battery.model
+        assert cc.materialized == ["system", "platform"]
+        # Full config builds everything
+        assert cc.config.keys() == eager.config.keys()
+        assert cc.config["sensors"] == eager.config["sensors"]
+        assert cc.materialized == list(ClearpathConfig.SECTIONS)
+
+    @pytest.mark.parametrize("path", [A200_SAMPLE, J100_SAMPLE])
+    def test_lazy_sensors_first(self, path):
+        eager = ClearpathConfig(path)
+        lazy = ClearpathConfig(path, lazy=True)
+        # Namespace is known before the system section is built
+        assert lazy.get_namespace() == eager.get_namespace()
+        topics = [s.get_topic(t) for s in eager.sensors.get_all_sensors() for t in s.TOPICS.NAME]
+        assert [
+            s.get_topic(t) for s in lazy.sensors.get_all_sensors() for t in s.TOPICS.NAME
+        ] == topics
+        assert lazy.materialized == ["sensors"]
+        assert lazy.config == eager.config
+        # Serial number without a namespace in the config
+        eager = ClearpathConfig({"serial_number": "j100-0042"})
+        lazy = ClearpathConfig({"serial_number": "j100-0042"}, lazy=True)
+        assert lazy.get_namespace() == eager.get_namespace() == "cpr_j100_0042"
+        lazy.serial_number = "a200-0001"
+        assert lazy.get_namespace() == "cpr_a200_0001"
+        assert lazy.system.namespace == "cpr_a200_0001"
+
+    def test_snapshot(self, tmp_path):
+        cc = ClearpathConfig(A200_SAMPLE)
+        path = str(tmp_path / "a200.snapshot")
+        cc.to_snapshot(path)
+        restored = ClearpathConfig.from_snapshot(path)
+        assert restored.config == cc.config
+        assert restored.context is not cc.context
+        # Restored config is tracked like a loaded one
+        restored.sensors.get_all_lidar_2d()[0].set_xyz([1.0, 2.0, 3.0])
+        restored.serial_number = "a200-0042"
+        assert restored.config["sensors"]["lidar2d"][0]["xyz"] == [1.0, 2.0, 3.0]
+        assert restored.config["serial_number"] == "a200-0042"
+        assert cc.config["serial_number"] == "a200-0000"
+
+    def test_snapshot_mismatch(self):
+        data = ClearpathConfig(J100_SAMPLE).to_snapshot()
+        header, body = marshal.loads(data[len(snapshot.SNAPSHOT_MAGIC):])
+        for i, message in enumerate(("schema", "package", "python")):
+            changed = list(header)
+            changed[i] = "other"
+            other = snapshot.SNAPSHOT_MAGIC + marshal.dumps((tuple(changed), body))
+            with pytest.raises(AssertionError, match=message):
+                ClearpathConfig.from_snapshot(other)
+        with pytest.raises(AssertionError):
+            ClearpathConfig.from_snapshot(data[:-8])
+
+    def test_snapshot_untrusted(self):
+        data = ClearpathConfig(J100_SAMPLE).to_snapshot()
+        header, _ = marshal.loads(data[len(snapshot.SNAPSHOT_MAGIC):])
+        forged = (
+            (snapshot.OBJECT, 0, ("os", "system"), (snapshot.DICT, 1, [])),
+            (snapshot.CLASS, 0, ("subprocess", "Popen")),
+            (snapshot.CLASS, 0, ("clearpath_config.common.utils.snapshot", "import_module")),
+            (snapshot.CLASS, 0, ("clearpath_config.common.utils.snapshot", "sys")),
+            (snapshot.CLASS, 0, ("clearpath_config.common.utils", "snapshot.marshal")),
+            (snapshot.PROPERTY, 0, ("clearpath_config.clearpath_config", "os", "path")),
+            (8, 0, ("clearpath_config.common.utils.snapshot", "dumps")),
+        )
+        for body in forged:
+            other = snapshot.SNAPSHOT_MAGIC + marshal.dumps((header, body))
+            with pytest.raises(AssertionError):
+                ClearpathConfig.from_snapshot(other)
+
+    def test_fingerprint(self):
+        a = ClearpathConfig(A200_SAMPLE)
+        b = ClearpathConfig(A200_SAMPLE, lazy=True)
+        assert a.fingerprint() == b.fingerprint()
+        assert a.fingerprint() != ClearpathConfig(J100_SAMPLE).fingerprint()
+        sections = a.section_fingerprints()
+        assert list(sections) == list(ClearpathConfig.SECTIONS)
+        # Equal values hash equal, changes only affect their own section
+        a.sensors.get_all_lidar_2d()[0].set_xyz([0.5, 0.0, 0.25])
+        b.sensors.get_all_lidar_2d()[0].set_xyz([0.5, -0.0, 0.25 + 1e-12])
+        assert a.fingerprint() == b.fingerprint()
+        changed = a.section_fingerprints()
+        assert [key for key in sections if sections[key] != changed[key]] == ["sensors"]
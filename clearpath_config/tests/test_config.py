@@ -0,0 +1,121 @@
+# Software License Agreement (BSD)
+#
+# @author    Luis Camero <lcamero@clearpathrobotics.com>
+# @copyright (c) 2023, Clearpath Robotics, Inc., All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# * Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of Clearpath Robotics nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+from copy import deepcopy
+import os
+
+import pytest
+
+from clearpath_config.clearpath_config import ClearpathConfig
+from clearpath_config.common.types.config import BaseConfig
+from clearpath_config.common.utils.dictionary import (
+    flatten_dict,
+    get_from_dict,
+    is_in_dict,
+    unflatten_dict
+)
+from clearpath_config.platform.platform import PlatformConfig
+from clearpath_config.system.hosts import HostConfig
+
+SAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "sample")
+SAMPLES = [
+    os.path.join(SAMPLE_DIR, "a200", "a200_sample.yaml"),
+    os.path.join(SAMPLE_DIR, "j100", "j100_sample.yaml"),
+]
+
+GENERIC = {
+    "serial_number": "generic",
+    "platform": {
+        "description": {"package": "robot_description", "path": "urdf/robot.urdf.xacro"},
+    },
+}
+
+
+# Template walk of the uncompiled implementation, for comparison
+def template_get(config: BaseConfig) -> dict:
+    for _, prop in flatten_dict(d=config.template, dlim=BaseConfig.DLIM).items():
+        config.getter(prop)()
+    return config._config
+
+
+def template_set(config: BaseConfig, value: dict) -> None:
+    if config._parent_key is not None and config._parent_key not in value:
+        value = {config._parent_key: value}
+    value = unflatten_dict(value)
+    for key, prop in flatten_dict(d=config.template, dlim=BaseConfig.DLIM).items():
+        keys = key.split(BaseConfig.DLIM)
+        if is_in_dict(value, keys):
+            config.setter(prop)(get_from_dict(value, keys))
+
+
+def sections(cc: ClearpathConfig) -> list:
+    return [getattr(cc, key) for key in ClearpathConfig.SECTIONS]
+
+
+class TestTemplateTable:
+
+    def test_shared_per_class_and_template(self):
+        a = HostConfig(hostname="cpr-a")
+        b = HostConfig(hostname="cpr-b")
+        assert a._template_table is b._template_table
+        first, second = (ClearpathConfig(path) for path in SAMPLES)
+        for x, y in zip(sections(first), sections(second)):
+            assert x._template_table is y._template_table
+        # Keyed on class and template
+        table = BaseConfig._TEMPLATE_TABLES[
+            (HostConfig, BaseConfig._template_signature(a.template))]
+        assert table is a._template_table
+
+    def test_generic_platform_recompiled(self):
+        a200 = ClearpathConfig(SAMPLES[0])
+        generic = ClearpathConfig(deepcopy(GENERIC))
+        getters = [fget for _, fget, _ in generic.platform._template_table]
+        assert PlatformConfig.description.fget in getters
+        assert PlatformConfig.description.fget not in [
+            fget for _, fget, _ in a200.platform._template_table]
+        description = generic.config["platform"]["description"]
+        assert description["package"] == "robot_description"
+        assert description["path"] == "urdf/robot.urdf.xacro"
+        assert "description" not in a200.config["platform"]
+        # Switching platform model recompiles the template of the instance
+        generic.serial_number = "a200-0001"
+        assert PlatformConfig.description.fget not in [
+            fget for _, fget, _ in generic.platform._template_table]
+
+    @pytest.mark.parametrize("path", SAMPLES + [GENERIC], ids=["a200", "j100", "generic"])
+    def test_config_matches_template(self, path):
+        cc = ClearpathConfig(deepcopy(path))
+        for section in sections(cc):
+            # Get
+            expected = deepcopy(template_get(section))
+            assert section.config == expected
+            # Set
+            value = deepcopy(expected)
+            compiled, walked = deepcopy(section), deepcopy(section)
+            compiled.config = deepcopy(value)
+            template_set(walked, deepcopy(value))
+            assert compiled.config == walked.config == expected
@@ -0,0 +1,117 @@
+# Software License Agreement (BSD)
+#
+# @author    Luis Camero <lcamero@clearpathrobotics.com>
+# @copyright (c) 2023, Clearpath Robotics, Inc., All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# * Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of Clearpath Robotics nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+from clearpath_config.clearpath_config import ClearpathConfig
+from clearpath_config.dds_profile import (
+    CYCLONE_DDS,
+    FAST_DDS_NAMESPACE,
+    generate_profile,
+    middleware_fingerprint,
+    write_profile,
+)
+from xml.etree import ElementTree
+import os
+import pytest
+
+NS = {"dds": FAST_DDS_NAMESPACE}
+
+
+def robot(discovery="server"):
+    return ClearpathConfig({
+        "serial_number": "a200-0001",
+        "system": {
+            "localhost": "cpr-0",
+            "hosts": [
+                {"hostname": "cpr-0", "ip": "10.0.0.1"},
+                {"hostname": "cpr-1", "ip": "10.0.0.2"},
+            ],
+            "ros2": {"domain_id": 5, "middleware": {"discovery": discovery}},
+        },
+    })
+
+
+def test_fastdds_profile():
+    root = ElementTree.fromstring(generate_profile(robot()))
+    assert root.find(".//dds:participant/dds:domainId", NS).text == "5"
+    servers = root.findall(".//dds:RemoteServer", NS)
+    assert [s.get("prefix")[:8] for s in servers] == ["44.53.00", "44.53.01"]
+    addresses = [a.text for a in root.findall(".//dds:udpv4/dds:address", NS)]
+    assert addresses == ["127.0.0.1", "10.0.0.2"]
+    assert root.find(".//dds:publishMode/dds:kind", NS).text == "ASYNCHRONOUS"
+    # Simple discovery, no shared memory
+    profile = generate_profile(robot("simple"), shared_memory=False)
+    root = ElementTree.fromstring(profile)
+    assert root.find(".//dds:discovery_config", NS) is None
+    assert "shm_transport" not in profile
+    with pytest.raises(AssertionError):
+        generate_profile(robot(), buffer=1)
+
+
+def test_cyclonedds_profile():
+    root = ElementTree.fromstring(generate_profile(robot(), CYCLONE_DDS))
+    ns = {"c": "https://cdds.io/config"}
+    assert root.find("c:Domain", ns).get("Id") == "5"
+    peers = [p.get("address") for p in root.findall(".//c:Peer", ns)]
+    assert peers == ["127.0.0.1", "10.0.0.2"]
+
+
+def test_profile_cache(tmp_path):
+    config = robot()
+    key = middleware_fingerprint(config)
+    profile = generate_profile(config)
+    assert generate_profile(config) is profile
+    # Unrelated sections do not change the profile
+    config.sensors.get_all_sensors()
+    config.system.username = "robot"
+    assert middleware_fingerprint(config) == key
+    config.system.domain_id = 6
+    assert middleware_fingerprint(config) != key
+    # Written only when the content changes
+    path = str(tmp_path / "fastdds.xml")
+    assert write_profile(config, path)
+    mtime = os.stat(path).st_mtime_ns
+    assert not write_profile(config, path)
+    assert os.stat(path).st_mtime_ns == mtime
+    config.system.domain_id = 7
+    assert write_profile(config, path)
+    assert "<domainId>7</domainId>" in open(path).read()
+    assert os.listdir(tmp_path) == ["fastdds.xml"]
+
+
+def test_write_profile_mode(tmp_path):
+    config = robot()
+    path = str(tmp_path / "fastdds.xml")
+    umask = os.umask(0)
+    os.umask(umask)
+    # New file is readable by others like a normally created file
+    assert write_profile(config, path)
+    assert os.stat(path).st_mode & 0o777 == 0o644 & ~umask
+    # Rewritten file keeps its mode
+    os.chmod(path, 0o664)
+    config.system.domain_id = 7
+    assert write_profile(config, path)
+    assert os.stat(path).st_mode & 0o777 == 0o664
@@ -0,0 +1,66 @@
+# Software License Agreement (BSD)
+#
+# @author    Luis Camero <lcamero@clearpathrobotics.com>
+# @copyright (c) 2023, Clearpath Robotics, Inc., All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# * Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of Clearpath Robotics nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+import copy
+import os
+
+from clearpath_config.clearpath_config import ClearpathConfig
+from clearpath_config.diff import ADDED, MODIFIED, REMOVED, diff, diff_dicts
+
+SAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "sample")
+A200_SAMPLE = os.path.join(SAMPLE_DIR, "a200", "a200_sample.yaml")
+
+
+def test_diff_identical():
+    assert diff(ClearpathConfig(A200_SAMPLE), ClearpathConfig(A200_SAMPLE)) == []
+
+
+def test_diff_changes():
+    old = ClearpathConfig(A200_SAMPLE)
+    new = ClearpathConfig(A200_SAMPLE)
+    new.system.hosts.get_all()[0].ip_address = "192.168.131.2"
+    new.sensors.get_all_lidar_2d()[0].set_ip("192.168.131.30")
+    new.links.remove_box("user_bay_cover")
+    changes = {(c.op, c.path) for c in diff(old, new)}
+    assert changes == {
+        (MODIFIED, ("system", "hosts", "cpr-a200-0000", "ip")),
+        (MODIFIED, ("sensors", "lidar2d", 0, "ros_parameters", "urg_node", "ip_address")),
+        (REMOVED, ("links", "box", "user_bay_cover")),
+    }
+
+
+def test_diff_sensor_model():
+    old = ClearpathConfig(A200_SAMPLE).config
+    new = copy.deepcopy(old)
+    new["sensors"]["lidar2d"][0]["model"] = "sick_lms1xx"
+    new["sensors"]["lidar2d"].append(copy.deepcopy(old["sensors"]["lidar2d"][0]))
+    changes = [(c.op, c.path) for c in diff_dicts(old, new)]
+    assert changes == [
+        (REMOVED, ("sensors", "lidar2d", 0)),
+        (ADDED, ("sensors", "lidar2d", 0)),
+        (ADDED, ("sensors", "lidar2d", 1)),
+    ]
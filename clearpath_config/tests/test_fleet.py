@@ -0,0 +1,152 @@
+# Software License Agreement (BSD)
+#
+# @author    Luis Camero <lcamero@clearpathrobotics.com>
+# @copyright (c) 2023, Clearpath Robotics, Inc., All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# * Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of Clearpath Robotics nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+import json
+import os
+
+from clearpath_config.clearpath_config import ClearpathConfig
+from clearpath_config.fleet import (
+    ERROR,
+    OK,
+    find_configs,
+    iter_fleet,
+    load_fleet,
+    main,
+    plan_discovery,
+)
+import pytest
+
+SAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "sample")
+
+
+def test_find_configs():
+    files = find_configs([SAMPLE_DIR])
+    assert files and all(f.endswith(".yaml") for f in files)
+    assert find_configs([os.path.join(SAMPLE_DIR, "a200", "*.yaml")]) == [
+        f for f in files if os.sep + "a200" + os.sep in f]
+
+
+def test_load_fleet_matches_serial(tmp_path):
+    invalid = tmp_path / "invalid.yaml"
+    invalid.write_text("serial_number: x900-0000\n")
+    paths = find_configs([os.path.join(SAMPLE_DIR, "j100")]) + [str(invalid)]
+    serial = {r["path"]: r for r in load_fleet(paths, workers=0)}
+    parallel = {r["path"]: r for r in load_fleet(paths, workers=2, chunksize=2)}
+    assert serial.keys() == parallel.keys() == set(paths)
+    for path in paths:
+        for key in ("status", "platform", "sensors"):
+            assert serial[path].get(key) == parallel[path].get(key)
+    assert serial[str(invalid)]["status"] == ERROR
+    assert all(serial[p]["status"] == OK for p in paths[:-1])
+    assert all(serial[p]["platform"] == "j100" for p in paths[:-1])
+
+
+def test_main_report(tmp_path):
+    report = tmp_path / "report.jsonl"
+    code = main([os.path.join(SAMPLE_DIR, "a200"), "-j", "0", "-o", str(report)])
+    lines = [json.loads(line) for line in report.read_text().splitlines()]
+    assert code == 0
+    summary = lines[-1]["summary"]
+    assert summary["total"] == len(lines) - 1 == summary[OK]
+    assert summary["platforms"] == {"a200": summary[OK]}
+
+
+def robot(i, hosts, servers=(), override=False):
+    return ClearpathConfig({
+        "serial_number": "a200-%04d" % i,
+        "system": {
+            "localhost": "cpr-%d" % i,
+            "hosts": [{"hostname": "cpr-%d" % j, "ip": "10.0.%d.%d" % (j // 200, j % 200 + 1)}
+                      for j in range(hosts)],
+            "ros2": {"middleware": {
+                "discovery": "server",
+                "override_server_id": override,
+                "servers": list(servers),
+            }},
+        },
+    })
+
+
+def test_plan_discovery():
+    # Robot 2 only uses two of the servers
+    partial = robot(2, 3, [{"hostname": "cpr-2"}, {"hostname": "cpr-0"}])
+    robots = [robot(0, 3), robot(1, 3), partial]
+    plan = plan_discovery(robots)
+    assert [s["ip"] for s in plan["servers"]] == ["10.0.0.1", "10.0.0.2", "10.0.0.3"]
+    assert [s["server_id"] for s in plan["servers"]] == [0, 1, 2]
+    assert plan["robots"] == {
+        "a200-0000": "127.0.0.1:11811;10.0.0.2:11811;10.0.0.3:11811;",
+        "a200-0001": "10.0.0.1:11811;127.0.0.1:11811;10.0.0.3:11811;",
+        "a200-0002": "10.0.0.1:11811;;127.0.0.1:11811;",
+    }
+
+
+def test_plan_discovery_localhost():
+    # Same server address under another host name on the second robot
+    other = ClearpathConfig({
+        "serial_number": "a200-0001",
+        "system": {
+            "localhost": "cpr-1",
+            "hosts": [{"hostname": "cpr-1", "ip": "10.0.0.1"}],
+            "ros2": {"middleware": {"discovery": "server", "servers": [{"hostname": "cpr-1"}]}},
+        },
+    })
+    plan = plan_discovery([robot(0, 1, [{"hostname": "cpr-0"}]), other])
+    assert [s["hostname"] for s in plan["servers"]] == ["cpr-0"]
+    assert plan["robots"] == {
+        "a200-0000": "127.0.0.1:11811;",
+        "a200-0001": "127.0.0.1:11811;",
+    }
+
+
+def test_plan_discovery_pinned():
+    pinned = robot(1, 2, [{"hostname": "cpr-1", "server_id": 0},
+                          {"hostname": "cpr-0", "server_id": 5}], override=True)
+    plan = plan_discovery([robot(0, 3), pinned])
+    ids = {s["hostname"]: s["server_id"] for s in plan["servers"]}
+    assert ids == {"cpr-0": 5, "cpr-1": 0, "cpr-2": 1}
+    # More servers across the fleet than server ids
+    other = robot(1, 1, [{"ip": "10.1.0.%d" % i} for i in range(1, 61)])
+    with pytest.raises(AssertionError, match="at most"):
+        plan_discovery([robot(0, 200), other])
+
+
+def test_iter_fleet(tmp_path):
+    samples = find_configs([os.path.join(SAMPLE_DIR, "j100")])
+    stream = tmp_path / "fleet.yaml"
+    stream.write_text(
+        "\n---\n".join(open(p).read() for p in samples) + "\n---\nserial_number: x900-0000\n")
+    documents = list(iter_fleet(str(stream)))
+    assert len(documents) == len(samples) + 1
+    assert all(isinstance(d.config, ClearpathConfig) for d in documents[:-1])
+    assert documents[-1].config is None
+    assert documents[-1].error.startswith("Document %d" % len(samples))
+    report = tmp_path / "report.jsonl"
+    assert main([str(stream), "--stream", "-o", str(report)]) == 1
+    lines = [json.loads(line) for line in report.read_text().splitlines()]
+    assert [line["index"] for line in lines[:-1]] == list(range(len(samples) + 1))
+    assert lines[-1]["summary"][OK] == len(samples)
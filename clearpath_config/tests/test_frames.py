@@ -0,0 +1,73 @@
+# Software License Agreement (BSD)
+#
+# @author    Luis Camero <lcamero@clearpathrobotics.com>
+# @copyright (c) 2023, Clearpath Robotics, Inc., All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# * Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of Clearpath Robotics nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+from math import pi
+import os
+
+import pytest
+
+from clearpath_config.clearpath_config import ClearpathConfig
+from clearpath_config.frames import FrameTree
+
+SAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "sample")
+A200_SAMPLE = os.path.join(SAMPLE_DIR, "a200", "a200_sample.yaml")
+
+FIXED = {
+    "sensor_arch_mount": ("default_mount", [0.0, 0.0, 0.5], [0.0, 0.0, 0.0]),
+    "turn": ("default_mount", [1.0, 0.0, 0.0], [0.0, 0.0, pi / 2]),
+    "ahead": ("turn", [1.0, 0.0, 0.0], [0.0, 0.0, 0.0]),
+}
+
+
+def assert_positions(tree: FrameTree) -> None:
+    assert tree.get_position("ahead") == pytest.approx([1.0, 1.0, 0.0])
+    assert tree.get_position("camera_0_link") == pytest.approx([0.0, 0.0, 0.479])
+    assert tree.get_root("camera_0_link") == "default_mount"
+
+
+def test_frame_tree():
+    tree = FrameTree(ClearpathConfig(A200_SAMPLE), fixed=FIXED, use_numpy=False)
+    frames = tree.frames
+    assert frames["lidar2d_0_link"].parent == "bracket_0_mount"
+    assert frames["bracket_0_mount"].kind == "mounts"
+    assert "default_mount" in tree.get_roots()
+    # Parents are ordered before their children
+    order = tree.order
+    assert all(order.index(f.parent) < order.index(f.name)
+               for f in frames.values() if f.parent is not None)
+    assert_positions(tree)
+
+
+def test_frame_tree_numpy():
+    pytest.importorskip("numpy")
+    assert_positions(FrameTree(ClearpathConfig(A200_SAMPLE), fixed=FIXED, use_numpy=True))
+
+
+def test_frame_tree_cycle():
+    fixed = {"a": ("b", [0.0] * 3, [0.0] * 3), "b": ("a", [0.0] * 3, [0.0] * 3)}
+    with pytest.raises(AssertionError, match="cycle"):
+        FrameTree(ClearpathConfig(A200_SAMPLE), fixed=fixed)
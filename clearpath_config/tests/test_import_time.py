@@ -0,0 +1,92 @@
+# Software License Agreement (BSD)
+#
+# @author    Luis Camero <lcamero@clearpathrobotics.com>
+# @copyright (c) 2023, Clearpath Robotics, Inc., All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# * Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of Clearpath Robotics nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+import os
+import subprocess
+import sys
+
+from clearpath_config.common.utils.registry import LazyRegistry
+
+# Cumulative import budget for clearpath_config.clearpath_config in milliseconds
+IMPORT_BUDGET_MS = float(os.environ.get("CLEARPATH_CONFIG_IMPORT_BUDGET_MS", 250))
+
+DEFERRED = (
+    "clearpath_config.common.utils.cache",
+    "clearpath_config.platform.attachments.a200",
+    "clearpath_config.platform.attachments.j100",
+    "pickle",
+    "tempfile",
+)
+
+# Package root, so the subprocess finds clearpath_config regardless of cwd
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SCRIPT = "import sys, clearpath_config.clearpath_config; print(' '.join(sys.modules))"
+
+
+def import_time(runs: int = 3) -> tuple:
+    # Best of several fresh interpreters, -X importtime reports microseconds
+    best, modules = None, None
+    path = os.environ.get("PYTHONPATH")
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [PACKAGE_ROOT, path])))
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", SCRIPT],
+            capture_output=True, text=True, check=True, env=env, cwd=PACKAGE_ROOT)
+        for line in out.stderr.splitlines():
+            fields = line.split("|")
+            if len(fields) == 3 and fields[2].strip() == "clearpath_config.clearpath_config":
+                us = int(fields[1])
+                if best is None or us < best:
+                    best = us
+        modules = set(out.stdout.split())
+    return best / 1000.0, modules
+
+
+def test_import_time():
+    ms, modules = import_time()
+    assert ms < IMPORT_BUDGET_MS, (
+        "Import of clearpath_config took %.1f ms, budget is %.1f ms" % (ms, IMPORT_BUDGET_MS))
+    for name in DEFERRED:
+        assert name not in modules, "%s should not be imported by default" % name
+
+
+def test_lazy_registry():
+    registry = LazyRegistry({
+        "registry": "clearpath_config.common.utils.registry:LazyRegistry",
+        "missing": "clearpath_config.common.utils.registry:Missing",
+    }, wrap=lambda cls: cls.__name__)
+    assert list(registry) == ["registry", "missing"] and "missing" in registry
+    assert not registry.is_resolved("registry")
+    assert registry["registry"] == "LazyRegistry"
+    assert registry.resolved() == ["registry"]
+    try:
+        registry["missing"]
+        assert False, "unknown class should not resolve"
+    except AttributeError:
+        pass
+    assert registry.get("unknown") is None
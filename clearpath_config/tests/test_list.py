@@ -0,0 +1,124 @@
+# Software License Agreement (BSD)
+#
+# @author    Luis Camero <lcamero@clearpathrobotics.com>
+# @copyright (c) 2023, Clearpath Robotics, Inc., All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# * Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of Clearpath Robotics nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+from clearpath_config.common.types.list import ListConfig
+from clearpath_config.links.links import LinkListConfig
+from clearpath_config.links.types.frame import Frame
+from clearpath_config.sensors.sensors import SensorListConfig
+from clearpath_config.sensors.types.cameras import IntelRealsense
+
+
+def make_frames(count: int) -> list:
+    return [Frame(name="frame_%s" % i) for i in range(count)]
+
+
+class RejectedCamera(IntelRealsense):
+
+    def set_idx(self, idx: int) -> None:
+        raise AssertionError("Camera index %s is rejected" % idx)
+
+
+class TestListConfig:
+
+    def test_find_after_mutation(self):
+        links = LinkListConfig()
+        links.set_all(make_frames(10))
+        assert links.find("frame_7") == 7
+        links.remove("frame_3")
+        assert links.find("frame_7") == 6
+        assert links.find("frame_3") is None
+        links.add(Frame(name="frame_3"))
+        assert links.find("frame_3") == 9
+        links.remove_all()
+        assert links.find("frame_7") is None
+
+    def test_find_after_rename(self):
+        links = LinkListConfig()
+        links.set_all(make_frames(3))
+        links.get("frame_1").set_name("renamed")
+        assert links.find("frame_1") is None
+        assert links.find("renamed") == 1
+
+    def test_find_new_name_after_rename(self):
+        links = LinkListConfig()
+        links.set_all(make_frames(3))
+        links.get("frame_1").set_name("renamed")
+        # Lookup of the new name first, the old name is never hit
+        assert links.find("renamed") == 1
+        assert links.find("frame_1") is None
+        links.get("frame_2").set_name("moved")
+        try:
+            links.add(Frame(name="moved"))
+        except AssertionError:
+            pass
+        else:
+            assert False, "Duplicate uid of a renamed object was incorrectly accepted"
+        assert len(links.get_all()) == 3
+
+    def test_find_scales_linearly(self):
+        # Unique ID lookups for building a list then missing every key
+        def uid_calls(count: int) -> int:
+            calls = []
+            links = ListConfig(
+                uid=lambda obj: calls.append(obj) or obj.get_name(),
+                obj_type=Frame,
+                uid_type=str)
+            for frame in make_frames(count):
+                links.add(frame)
+            for i in range(count):
+                assert links.find("missing_%s" % i) is None
+            links.get("frame_1").set_name("renamed")
+            assert links.find("renamed") == 1
+            return len(calls)
+
+        assert uid_calls(2000) < 3 * uid_calls(1000)
+        assert uid_calls(1000) < 5 * 1000
+
+    def test_add_duplicate(self):
+        links = LinkListConfig()
+        links.set_all(make_frames(3))
+        try:
+            links.add(Frame(name="frame_2"))
+        except AssertionError:
+            pass
+        else:
+            assert False, "Duplicate uid was incorrectly accepted"
+        assert len(links.get_all()) == 3
+
+
+class TestOrderedListConfig:
+
+    def test_set_all_rollback(self):
+        sensors = SensorListConfig()
+        cameras = [IntelRealsense() for _ in range(3)]
+        sensors.set_all(cameras)
+        sensors.set_all([IntelRealsense(), "invalid"])
+        assert sensors.get_all() == cameras
+        # Rejected while indexing, restored objects are indexed again
+        sensors.set_all(cameras[::-1] + [RejectedCamera()])
+        assert sensors.get_all() == cameras
+        assert [camera.name for camera in cameras] == ["camera_0", "camera_1", "camera_2"]
@@ -0,0 +1,68 @@
+# Software License Agreement (BSD)
+#
+# @author    Luis Camero <lcamero@clearpathrobotics.com>
+# @copyright (c) 2023, Clearpath Robotics, Inc., All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# * Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of Clearpath Robotics nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+import os
+
+from clearpath_config.clearpath_config import ClearpathConfig
+from clearpath_config.restart import (
+    PLATFORM_LAUNCH,
+    SENSOR_LAUNCH,
+    URDF,
+    Artifact,
+    plan_restart
+)
+
+SAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "sample")
+A200_SAMPLE = os.path.join(SAMPLE_DIR, "a200", "a200_sample.yaml")
+
+
+def test_plan_sensor_changes():
+    old = ClearpathConfig(A200_SAMPLE)
+    new = ClearpathConfig(A200_SAMPLE)
+    assert plan_restart(old, new) == {}
+    new.sensors.get_all_lidar_2d()[0].set_ip("192.168.131.30")
+    new.sensors.get_all_cameras()[0].set_xyz([0.1, 0.0, 0.0])
+    assert set(plan_restart(old, new)) == {
+        Artifact(SENSOR_LAUNCH, "lidar2d_0"), Artifact(URDF)}
+    # Sensors without a launch file are not restarted
+    old.sensors.get_all_lidar_2d()[0].set_launch_enabled(False)
+    new.sensors.get_all_lidar_2d()[0].set_launch_enabled(False)
+    assert set(plan_restart(old, new)) == {Artifact(URDF)}
+
+
+def test_plan_system_changes():
+    old = ClearpathConfig(A200_SAMPLE)
+    new = ClearpathConfig(A200_SAMPLE)
+    new.system.domain_id = 5
+    plan = plan_restart(old, new)
+    launches = {
+        "%s_%d" % (_type, idx)
+        for _type, entries in new.config["sensors"].items()
+        for idx, entry in enumerate(entries) if entry["launch_enabled"]}
+    assert set(plan) == {Artifact(PLATFORM_LAUNCH)} | {
+        Artifact(SENSOR_LAUNCH, name) for name in launches}
+    assert all(c.path == ("system", "ros2", "domain_id") for c in plan[Artifact(PLATFORM_LAUNCH)])
@@ -0,0 +1,87 @@
+# Software License Agreement (BSD)
+#
+# @author    Luis Camero <lcamero@clearpathrobotics.com>
+# @copyright (c) 2023, Clearpath Robotics, Inc., All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# * Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of Clearpath Robotics nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+from clearpath_config.clearpath_config import ClearpathConfig
+from clearpath_config.sensors.sensors import Camera
+import os
+
+SAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "sample")
+A200_SAMPLE = os.path.join(SAMPLE_DIR, "a200", "a200_sample.yaml")
+
+
+class TestSensorROSParameters:
+
+    def test_ros_parameters_follow_properties(self):
+        camera = Camera(Camera.INTEL_REALSENSE)
+        key = "rgb_camera.color_profile"
+        assert camera.ros_parameters["intel_realsense"][key] == "640,480,30"
+        camera.set_fps(15)
+        assert camera.ros_parameters["intel_realsense"][key] == "640,480,15"
+
+    def test_ros_parameters_are_copies(self):
+        camera = Camera(Camera.INTEL_REALSENSE)
+        user = {"intel_realsense": {"custom.list": [1, 2]}}
+        camera.set_ros_parameters(user)
+        user["intel_realsense"]["custom.list"].append(3)
+        params = camera.ros_parameters
+        params["intel_realsense"]["custom.list"].append(4)
+        params["intel_realsense"]["custom.new"] = True
+        params = camera.ros_parameters
+        assert params["intel_realsense"]["custom.list"] == [1, 2]
+        assert "custom.new" not in params["intel_realsense"]
+
+
+class TestTopicTable:
+
+    def test_topic_table_cached(self):
+        config = ClearpathConfig(A200_SAMPLE)
+        sensors = config.sensors
+        table = sensors.topic_table()
+        # Changes that do not affect topics keep the table
+        sensors.get_lidar_2d(0).set_xyz([1.0, 0.0, 0.0])
+        assert sensors.topic_table() is table
+        sensors.add_ust()
+        assert "a200_0000/sensors/lidar2d_1/scan" in sensors.topic_table()
+
+    def test_topic_table(self):
+        config = ClearpathConfig(A200_SAMPLE)
+        sensors = config.sensors
+        lidar = sensors.get_lidar_2d(0)
+        table = sensors.topic_table()
+        topic = lidar.get_topic("scan")
+        assert table[topic].sensor == lidar.name
+        assert table[topic].rate == lidar.get_topic_rate("scan")
+        assert sensors.get_sensor_by_topic(topic) is lidar
+        assert sensors.topic_table() is table
+        # Namespace change
+        config.system.namespace = "robot"
+        table = sensors.topic_table()
+        assert topic not in table
+        assert sensors.get_sensor_by_topic("robot/sensors/lidar2d_0/scan") is lidar
+        # Sensor list change
+        sensors.remove_lidar_2d(lidar)
+        assert sensors.get_sensor_by_topic("robot/sensors/lidar2d_0/scan") is None
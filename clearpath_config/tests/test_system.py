@@ -25,6 +25,10 @@
 # CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
+from clearpath_config.system.hosts import HostConfig, HostListConfig
+from clearpath_config.system.middleware import MiddlewareConfig
+import pytest
+
 IP = "ip"
 HOSTNAME = "hostname"
 
@@ -53,3 +57,47 @@ VALID = {
     HOSTNAME: ["cpr-x999-9999", "cpr-proj01"],
     IP: ["192.168.131.1"]
 }
+
+
+def middleware(servers, localhost="cpr-0"):
+    hosts = HostListConfig()
+    hosts.set_all([
+        HostConfig(hostname="cpr-%d" % i, ip_address="10.0.0.%d" % (i + 1)) for i in range(3)])
+    return MiddlewareConfig(
+        config={"discovery": "server", "servers": servers},
+        hosts=hosts,
+        localhost=localhost)
+
+
+def test_servers_string():
+    m = middleware([
+        {"hostname": "cpr-2"},
+        {"hostname": "cpr-0"},
+        {"ip": "10.0.0.9", "port": 11812, "enabled": False},
+    ])
+    ids = {s.ip_address: s.server_id for s in m.servers.get_all()}
+    # Servers without a host name are numbered first
+    assert ids == {"10.0.0.9": 0, "10.0.0.1": 1, "10.0.0.3": 2}
+    assert m.get_servers_string() == ";127.0.0.1:11811;10.0.0.3:11811;"
+    m.servers.get(2).enabled = False
+    assert m.get_servers_string() == ";127.0.0.1:11811;"
+
+
+def test_servers_string_override():
+    # Pinned server ids keep list order, only padded up to the first id
+    m = middleware([{"hostname": "cpr-0"}, {"hostname": "cpr-2"}])
+    m.override_server_id = True
+    m.servers = [
+        {"hostname": "cpr-0", "server_id": 3},
+        {"hostname": "cpr-2", "server_id": 1},
+    ]
+    # Servers are sorted by host name, ids are out of order
+    assert [s.server_id for s in m.servers.get_all()] == [3, 1]
+    assert m.get_servers_string() == ";;;127.0.0.1:11811;10.0.0.3:11811;"
+
+
+def test_servers_duplicate():
+    with pytest.raises(AssertionError, match="conflicts"):
+        middleware([{"hostname": "cpr-1"}, {"ip": "10.0.0.2"}])
+    with pytest.raises(AssertionError, match="not listed"):
+        middleware([{"hostname": "cpr-9"}])
@@ -0,0 +1,79 @@
+# Software License Agreement (BSD)
+#
+# @author    Luis Camero <lcamero@clearpathrobotics.com>
+# @copyright (c) 2023, Clearpath Robotics, Inc., All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# * Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of Clearpath Robotics nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+import os
+
+from clearpath_config.clearpath_config import ClearpathConfig
+from clearpath_config.validation import CYCLE, DUPLICATE_NAME, UNKNOWN_PARENT, validate
+
+SAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "sample")
+A200_SAMPLE = os.path.join(SAMPLE_DIR, "a200", "a200_sample.yaml")
+
+
+def issues(cc: ClearpathConfig) -> set:
+    return {(issue.kind, issue.path) for issue in validate(cc)}
+
+
+def test_valid_sample():
+    assert validate(ClearpathConfig(A200_SAMPLE)) == []
+
+
+def test_unknown_parent():
+    cc = ClearpathConfig(A200_SAMPLE)
+    cc.sensors.get_all_lidar_2d()[0].set_parent("bracket_9_mount")
+    assert issues(cc) == {(UNKNOWN_PARENT, "sensors.lidar2d.0.parent")}
+    # Frames generated from accessories are known
+    cc.sensors.get_all_lidar_2d()[0].set_parent("fath_pivot_0_mount")
+    assert validate(cc) == []
+    cc.sensors.get_all_lidar_2d()[0].set_parent("bracket_9_mount")
+    assert validate(cc, frames=["bracket_9_mount"]) == []
+
+
+def test_cycle_and_duplicate():
+    cc = ClearpathConfig(A200_SAMPLE)
+    cc.links.add_frame(name="first", parent="second_link")
+    cc.links.add_box(name="second", parent="first_link")
+    cc.links.add_sphere(name="camera_0")
+    found = issues(cc)
+    assert (DUPLICATE_NAME, "sensors.camera.0.name") in found
+    assert len([kind for kind, _ in found if kind == CYCLE]) == 1
+
+
+def test_misspelled_parent():
+    cc = ClearpathConfig(A200_SAMPLE)
+    lidar = cc.sensors.get_all_lidar_2d()[0]
+    # Only frames generated from an accessory are known, not its name or other suffixes
+    for parent in ("bracket_0_mout", "bracket_0", "camera_0_whatever", "camera_0",
+                   "top_plate_mount_d", "fath_pivot_0_mount_link"):
+        lidar.set_parent(parent)
+        assert issues(cc) == {(UNKNOWN_PARENT, "sensors.lidar2d.0.parent")}, parent
+    for parent in ("bracket_0_vertical_mount", "camera_0_link", "top_plate_mount_a1"):
+        lidar.set_parent(parent)
+        assert validate(cc) == [], parent
+    # Frame generated by the entry itself
+    lidar.set_parent(lidar.get_name() + "_link")
+    assert issues(cc) == {(CYCLE, "sensors.lidar2d.0.parent")}
@@ -0,0 +1,335 @@
+# Software License Agreement (BSD)
+#
+# @author    Luis Camero <lcamero@clearpathrobotics.com>
+# @copyright (c) 2023, Clearpath Robotics, Inc., All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# * Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of Clearpath Robotics nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+import glob
+import os
+import subprocess
+import sys
+
+import pytest
+import tracemalloc
+import yaml
+
+from clearpath_config.clearpath_config import ClearpathConfig
+from clearpath_config.common.utils.cache import ParsedFileCache
+from clearpath_config.common.utils.yaml import (
+    JSON,
+    MSGPACK,
+    CNoAliasDumper,
+    NoAliasDumper,
+    CACHE_DIR_ENV,
+    disable_yaml_cache,
+    enable_yaml_cache,
+    enable_yaml_cache_from_env,
+    get_yaml_cache,
+    is_c_dumper_safe,
+    iter_documents,
+    read_config,
+    read_yaml,
+    write_config,
+    write_json,
+    write_yaml,
+    yaml_cache_stats,
+)
+
+SAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "sample")
+SAMPLES = sorted(glob.glob(os.path.join(SAMPLE_DIR, "*", "*.yaml")))
+ROBOT_SAMPLES = [path for path in SAMPLES if os.path.basename(os.path.dirname(path)) != "sensors"]
+
+
+def python_dump(config: dict) -> str:
+    return yaml.dump(
+        config,
+        Dumper=NoAliasDumper,
+        sort_keys=False,
+        default_flow_style=False,
+        allow_unicode=True,
+    )
+
+
+@pytest.mark.parametrize("path", SAMPLES, ids=os.path.basename)
+def test_read_matches_python_loader(path):
+    with open(path) as yaml_file:
+        assert read_yaml(path) == yaml.load(yaml_file, Loader=yaml.SafeLoader)
+
+
+@pytest.mark.parametrize("path", ROBOT_SAMPLES, ids=os.path.basename)
+def test_write_matches_python_dumper(path, tmp_path):
+    config = ClearpathConfig(path).config
+    assert is_c_dumper_safe(config)
+    write_yaml(tmp_path / "robot.yaml", config)
+    assert (tmp_path / "robot.yaml").read_text() == python_dump(config)
+
+
+@pytest.mark.parametrize("config", [
+    {"": 1},
+    {"long key " * 10: 1},
+    {"key": "line\nbreak"},
+    {"key": ["tab\t"]},
+    {"key": "\ufeffbom"},
+    {"key": "\U0001F642"},
+])
+def test_write_fallback(config, tmp_path):
+    assert not is_c_dumper_safe(config)
+    write_yaml(tmp_path / "robot.yaml", config)
+    assert (tmp_path / "robot.yaml").read_text() == python_dump(config)
+
+
+@pytest.mark.skipif(CNoAliasDumper is None, reason="libyaml is not available")
+def test_write_no_aliases(tmp_path):
+    shared = {"a": [1, 2]}
+    write_yaml(tmp_path / "robot.yaml", {"x": shared, "y": shared})
+    assert "&" not in (tmp_path / "robot.yaml").read_text()
+    # Global dumper is left untouched
+    assert yaml.Dumper.ignore_aliases is yaml.representer.SafeRepresenter.ignore_aliases
+
+
+@pytest.fixture
+def yaml_cache(tmp_path):
+    cache = enable_yaml_cache(str(tmp_path / "cache"))
+    yield cache
+    disable_yaml_cache()
+
+
+def test_cache_hits(yaml_cache, tmp_path):
+    path = str(tmp_path / "robot.yaml")
+    write_yaml(path, {"serial_number": "a200-0000", "sensors": {"lidar2d": []}})
+    first = read_yaml(path)
+    second = read_yaml(path)
+    assert first == second
+    assert yaml_cache_stats()["misses"] == 1
+    assert yaml_cache_stats()["hits"] == 1
+    # Callers get copies
+    second["sensors"]["lidar2d"].append("modified")
+    assert read_yaml(path) == first
+
+
+def test_cache_invalidated_on_change(yaml_cache, tmp_path):
+    path = str(tmp_path / "robot.yaml")
+    write_yaml(path, {"serial_number": "a200-0000"})
+    read_yaml(path)
+    write_yaml(path, {"serial_number": "a200-0001"})
+    assert read_yaml(path)["serial_number"] == "a200-0001"
+    assert yaml_cache_stats()["misses"] == 2
+
+
+def test_cache_on_disk(yaml_cache, tmp_path):
+    path = str(tmp_path / "robot.yaml")
+    write_yaml(path, {"serial_number": "a200-0000"})
+    config = read_yaml(path)
+    # New process-level cache on the same directory
+    enable_yaml_cache(yaml_cache.directory)
+    assert read_yaml(path) == config
+    assert yaml_cache_stats()["disk_hits"] == 1
+    assert yaml_cache_stats()["misses"] == 0
+
+
+def test_cache_errors_not_cached(yaml_cache, tmp_path):
+    path = tmp_path / "robot.yaml"
+    path.write_text("- not a dictionary\n")
+    for _ in range(2):
+        with pytest.raises(AssertionError):
+            read_yaml(str(path))
+    assert yaml_cache_stats()["misses"] == 2
+
+
+def test_cache_directory_trusted(tmp_path):
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    shared.chmod(0o777)
+    with pytest.raises(AssertionError, match="writable"):
+        enable_yaml_cache(str(shared))
+    disable_yaml_cache()
+
+
+def test_cache_directory_from_env(tmp_path, monkeypatch):
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    shared.chmod(0o777)
+    monkeypatch.setenv(CACHE_DIR_ENV, str(shared))
+    with pytest.warns(RuntimeWarning, match="YAML cache disabled"):
+        assert enable_yaml_cache_from_env() is None
+    assert get_yaml_cache() is None
+    # Import is not broken by it
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(SAMPLE_DIR)))
+    out = subprocess.run(
+        [sys.executable, "-c", "import clearpath_config.clearpath_config"],
+        capture_output=True, text=True, env=env)
+    assert out.returncode == 0 and "YAML cache disabled" in out.stderr
+
+
+def test_cache_python_version(yaml_cache, tmp_path, monkeypatch):
+    path = str(tmp_path / "robot.yaml")
+    write_yaml(path, {"serial_number": "a200-0000"})
+    read_yaml(path)
+    monkeypatch.setattr(sys.implementation, "cache_tag", "other-00")
+    enable_yaml_cache(yaml_cache.directory)
+    read_yaml(path)
+    assert yaml_cache_stats()["disk_hits"] == 0
+    assert yaml_cache_stats()["misses"] == 1
+
+
+def test_cache_disk_pruned(tmp_path):
+    cache = ParsedFileCache(str(tmp_path / "cache"), disk_size=2)
+    paths = [str(tmp_path / ("robot_%d.yaml" % i)) for i in range(4)]
+    for i, path in enumerate(paths):
+        write_yaml(path, {"serial_number": "a200-%04d" % i})
+        cache.load(path, read_yaml)
+
+    def entries():
+        return [n for n in os.listdir(cache.directory) if n.endswith(cache.SUFFIX)]
+
+    assert len(entries()) == 2
+    assert cache.stats()["disk_evictions"] == 2
+    # Changed file replaces its own entry
+    write_yaml(paths[-1], {"serial_number": "a200-0042"})
+    assert cache.load(paths[-1], read_yaml)["serial_number"] == "a200-0042"
+    assert len(entries()) == 2
+    assert cache.stats()["disk_evictions"] == 2
+
+
+def test_cache_builtin_types_only(yaml_cache, tmp_path):
+    path = tmp_path / "robot.yaml"
+    path.write_text("serial_number: a200-0000\ndate: 2024-01-01\n")
+    for _ in range(2):
+        assert str(read_yaml(str(path))["date"]) == "2024-01-01"
+    assert yaml_cache_stats()["misses"] == 2
+    assert yaml_cache_stats()["entries"] == 0
+
+
+FLEET_YAML = """\
+# fleet
+serial_number: a200-0001
+---
+serial_number: a200-0002
+system:
+  hosts: [
+--- # empty document
+...
+---
+- not a dictionary
+--- {serial_number: j100-0003}
+"""
+
+
+def test_iter_yaml_documents(tmp_path):
+    path = tmp_path / "fleet.yaml"
+    path.write_text(FLEET_YAML)
+    documents = list(iter_documents(str(path)))
+    assert [d.index for d in documents] == [0, 1, 2, 3]
+    assert documents[0].config == {"serial_number": "a200-0001"}
+    assert documents[1].config is None
+    assert documents[1].error.startswith("Document 1 (line 7)")
+    assert documents[2].line == 9
+    assert "not a dictionary" in documents[2].error
+    assert documents[3].config == {"serial_number": "j100-0003"}
+    assert documents[3].line == 11
+
+
+EMPTY_DOCUMENTS_YAML = """\
+%YAML 1.1
+---
+serial_number: a200-0001
+---
+---
+# note
+---
+serial_number: j100-0002
+---
+"""
+
+
+def test_iter_yaml_empty_documents(tmp_path):
+    path = tmp_path / "fleet.yaml"
+    path.write_text(EMPTY_DOCUMENTS_YAML)
+    documents = list(iter_documents(str(path)))
+    assert [d.error for d in documents] == [None, None]
+    assert [d.config for d in documents] == [
+        {"serial_number": "a200-0001"}, {"serial_number": "j100-0002"}]
+    assert [d.line for d in documents] == [1, 7]
+    # Same robots as PyYAML, without its empty documents
+    loaded = [d for d in yaml.safe_load_all(EMPTY_DOCUMENTS_YAML) if d is not None]
+    assert [d.config for d in documents] == loaded
+
+
+def test_iter_jsonl_documents(tmp_path):
+    path = tmp_path / "fleet.jsonl"
+    path.write_text('{"serial_number": "a200-0001"}\n\n{"serial_number": \n[1]\n')
+    documents = list(iter_documents(str(path)))
+    assert documents[0].config == {"serial_number": "a200-0001"}
+    assert documents[1].error.startswith("Document 1 (line 3)")
+    assert documents[2].error.startswith("Document 2 (line 4)")
+
+
+def test_iter_documents_memory(tmp_path):
+    document = read_yaml(ROBOT_SAMPLES[0])
+
+    def peak(count):
+        path = tmp_path / ("fleet_%d.yaml" % count)
+        with open(path, "w") as f:
+            yaml.dump_all([document] * count, f, Dumper=NoAliasDumper)
+        tracemalloc.start()
+        for _ in iter_documents(str(path)):
+            pass
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return peak
+
+    assert peak(500) < 2 * peak(50)
+
+
+@pytest.mark.parametrize("extension", [".json", ".msgpack"])
+@pytest.mark.parametrize("path", ROBOT_SAMPLES, ids=os.path.basename)
+def test_format_round_trip(path, extension, tmp_path):
+    if extension == ".msgpack":
+        pytest.importorskip("msgpack")
+    config = ClearpathConfig(path)
+    out = str(tmp_path / ("robot" + extension))
+    config.write(out)
+    assert read_config(out) == config.config
+    assert ClearpathConfig(out).config == config.config
+
+
+def test_format_argument(tmp_path):
+    config = {"a": 1.0, "b": [1, "x", None, True], "c": {"d": float("nan")}}
+    path = str(tmp_path / "robot.data")
+    write_config(path, config, JSON)
+    loaded = read_config(path, JSON)
+    assert loaded["a"] == 1.0 and isinstance(loaded["a"], float)
+    assert loaded["c"]["d"] != loaded["c"]["d"]
+    write_json(path, {"a": 1})
+    with pytest.raises(AssertionError, match="not a dictionary"):
+        write_config(path, [1], JSON)
+        read_config(path, JSON)
+    with pytest.raises(AssertionError, match="could not be found"):
+        read_config(str(tmp_path / "missing.json"))
+    with pytest.raises(AssertionError, match="invalid"):
+        read_config(path, "toml")
+    msgpack = pytest.importorskip("msgpack")
+    write_config(path, {1: b"x"}, MSGPACK)
+    assert read_config(path, MSGPACK) == {1: b"x"}
+    assert msgpack is not None
@@ -0,0 +1,233 @@
+# Software License Agreement (BSD)
+#
+# @author    Luis Camero <lcamero@clearpathrobotics.com>
+# @copyright (c) 2023, Clearpath Robotics, Inc., All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# * Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# * Neither the name of Clearpath Robotics nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+from clearpath_config.clearpath_config import ClearpathConfig
+from clearpath_config.common.types.platform import Platform
+from clearpath_config.frames import ARMS, ATTACHMENTS, GRIPPERS, LINKS, MOUNTS, SENSORS, SUFFIX
+from clearpath_config.mounts.types.pacs import PACS
+from clearpath_config.platform.attachments.a200 import A200SensorArch, A200TopPlate
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+import re
+
+
+# Validation
+#  - checks the parent of every accessory before the URDF is built
+#  - frame index over links, mounts, sensors, arms, grippers and attachments
+#  - an accessory provides the frames the description generates from its
+#    name, by kind and model (e.g. "fath_pivot_0_mount", "top_plate_mount_d1"),
+#    any other name is not a frame
+#  - reports unknown parents, duplicate names and parent cycles with the
+#    key path of the offending entry
+UNKNOWN_PARENT = "unknown_parent"
+DUPLICATE_NAME = "duplicate_name"
+CYCLE = "cycle"
+
+# Frames provided by the platform description
+# - every platform
+# - per platform, as exact names or patterns
+BASE_FRAMES = ("base_link", "chassis_link", "default_mount")
+INDEXED_MOUNTS = re.compile(r"^(front|rear)_\d+_mount$")
+PLATFORM_FRAMES = {
+    Platform.A200: (
+        "front_bumper_mount",
+        "rear_bumper_mount",
+        "top_plate_front_mount",
+        re.compile(r"^top_plate_mount_[a-z]\d+$"),
+    ),
+    Platform.DD100: (INDEXED_MOUNTS,),
+    Platform.DO100: (INDEXED_MOUNTS,),
+    Platform.DD150: (INDEXED_MOUNTS,),
+    Platform.DO150: (INDEXED_MOUNTS,),
+    Platform.J100: (INDEXED_MOUNTS,),
+    Platform.W200: ("left_diff_unit_link", "right_diff_unit_link"),
+}
+
+
+# Frames generated from an accessory name
+# - by kind, the first is the frame of the accessory itself
+# - extra frames by mount or attachment model, as suffixes or patterns
+GENERATED = {
+    LINKS: (SUFFIX[LINKS],),
+    MOUNTS: (SUFFIX[MOUNTS],),
+    SENSORS: (SUFFIX[SENSORS],),
+    ARMS: (SUFFIX[ARMS], "_end_effector_link"),
+    GRIPPERS: (SUFFIX[GRIPPERS],),
+    ATTACHMENTS: (SUFFIX[ATTACHMENTS],),
+}
+MODEL_GENERATED = {
+    PACS.Bracket.MOUNT_MODEL: ("_vertical_mount",),
+    PACS.Riser.MOUNT_MODEL: (re.compile(r"_mount_[a-z]\d+$"),),
+    A200SensorArch.ATTACHMENT_MODEL: ("_mount",),
+    A200TopPlate.ATTACHMENT_MODEL: (re.compile(r"_mount_[a-z]\d+$"),),
+}
+
+
+class Issue(NamedTuple):
+    kind: str
+    path: str
+    message: str
+
+
+class Entry(NamedTuple):
+    name: str
+    parent: str
+    # Key path of the entry in the configuration
+    path: str
+    # Generated frame names and patterns matched after the name
+    frames: Tuple[str, ...] = ()
+    patterns: Tuple[re.Pattern, ...] = ()
+
+
+def generated(name: str, kind: str, model: str = None) -> Tuple[tuple, tuple]:
+    frames = []
+    patterns = []
+    for suffix in GENERATED[kind] + MODEL_GENERATED.get(model, ()):
+        if isinstance(suffix, str):
+            frames.append(name + suffix)
+        else:
+            patterns.append(suffix)
+    return tuple(frames), tuple(patterns)
+
+
+def make_entry(accessory, kind: str, path: str, model: str = None) -> Entry:
+    name = accessory.get_name()
+    return Entry(name, accessory.get_parent(), path, *generated(name, kind, model))
+
+
+def collect_entries(config: ClearpathConfig) -> List[Entry]:
+    entries = []
+
+    def add(section: str, group: str, accessories: Iterable, kind: str, model=None) -> None:
+        for i, accessory in enumerate(accessories):
+            path = "%s.%s.%s" % (section, group, i) if group else "%s.%s" % (section, i)
+            entries.append(make_entry(accessory, kind, path, model and model(accessory)))
+
+    def grouped(accessories: Iterable, key) -> Dict[str, list]:
+        groups = {}
+        for accessory in accessories:
+            groups.setdefault(key(accessory), []).append(accessory)
+        return groups
+
+    links = config.links.get_all_links()
+    for group, items in grouped(links, lambda a: a.get_link_type()).items():
+        add(ClearpathConfig.LINKS, group, items, LINKS)
+    mounts = config.mounts.get_all_mounts()
+    for group, items in grouped(mounts, lambda a: a.get_mount_model()).items():
+        add(ClearpathConfig.MOUNTS, group, items, MOUNTS, lambda a: a.get_mount_model())
+    sensors = config.sensors.get_all_sensors()
+    for group, items in grouped(sensors, lambda a: a.get_sensor_type()).items():
+        add(ClearpathConfig.SENSORS, group, items, SENSORS)
+    for i, arm in enumerate(config.manipulators.get_all_arms()):
+        path = "%s.arms.%s" % (ClearpathConfig.MANIPULATORS, i)
+        entries.append(make_entry(arm, ARMS, path))
+        if arm.gripper:
+            entries.append(make_entry(arm.gripper, GRIPPERS, path + ".gripper"))
+    add(ClearpathConfig.PLATFORM, "attachments", config.platform.attachments.get_all(),
+        ATTACHMENTS, lambda a: a.ATTACHMENT_MODEL)
+    return entries
+
+
+def is_platform_frame(platform: str, frame: str) -> bool:
+    if frame in BASE_FRAMES:
+        return True
+    for known in PLATFORM_FRAMES.get(platform, ()):
+        if known == frame if isinstance(known, str) else known.match(frame):
+            return True
+    return False
+
+
+def owner(index: Dict[str, Entry], patterns: List[Entry], frame: str) -> Entry:
+    # Accessory that generates frame
+    entry = index.get(frame)
+    if entry is not None:
+        return entry
+    for entry in patterns:
+        for pattern in entry.patterns:
+            if frame.startswith(entry.name) and pattern.match(frame, len(entry.name)):
+                return entry
+    return None
+
+
+def validate(config: ClearpathConfig, frames: Iterable[str] = ()) -> List[Issue]:
+    """Return all parent issues, frames are extra known frame names."""
+    issues = []
+    platform = config.get_platform_model()
+    known = set(frames)
+    entries = collect_entries(config)
+    # Name and frame index, first entry wins
+    index = {}
+    frames = {}
+    patterns = []
+    for entry in entries:
+        first = index.setdefault(entry.name, entry)
+        if first is not entry:
+            issues.append(Issue(
+                DUPLICATE_NAME, entry.path + ".name",
+                "Name '%s' is already used by '%s'" % (entry.name, first.path)))
+            continue
+        for frame in entry.frames:
+            frames.setdefault(frame, entry)
+        if entry.patterns:
+            patterns.append(entry)
+    # Parent of every named entry, None when provided by the platform
+    parents = {}
+    for entry in entries:
+        parent = owner(frames, patterns, entry.parent)
+        if parent is entry:
+            issues.append(Issue(
+                CYCLE, entry.path + ".parent", "'%s' is its own parent" % entry.name))
+            parent = None
+        elif entry.parent in known:
+            parent = None
+        elif parent is None and not (
+                platform == Platform.GENERIC or is_platform_frame(platform, entry.parent)):
+            issues.append(Issue(
+                UNKNOWN_PARENT, entry.path + ".parent",
+                "Parent '%s' of '%s' is not a known frame" % (entry.parent, entry.name)))
+        if index[entry.name] is entry:
+            parents[entry.name] = parent.name if parent is not None else None
+    # Cycles: follow parents once from every entry, each name is visited once
+    state = {}
+    for start in parents:
+        chain = []
+        name = start
+        while name is not None and name not in state:
+            state[name] = start
+            chain.append(name)
+            name = parents[name]
+        if name is not None and state[name] == start:
+            cycle = chain[chain.index(name):]
+            issues.append(Issue(
+                CYCLE, index[name].path + ".parent",
+                "Parents form a cycle: '%s'" % "' -> '".join(cycle + [name])))
+    return issues
+
+
+def assert_valid(config: ClearpathConfig, frames: Iterable[str] = ()) -> None:
+    issues = validate(config, frames)
+    assert not issues, "\n".join(
+        "%s: %s" % (issue.path, issue.message) for issue in issues)
@@ -71,9 +71,14 @@ setup(
         'importlib-metadata; python_version == "3.8"',
     ],
     zip_safe=True,
+    entry_points={
+        "console_scripts": [
+            "clearpath_fleet = clearpath_config.fleet:main",
+        ],
+    },
     maintainer="Luis Camero",
     maintainer_email="lcamero@clearpathrobotics.com",
     description="Clearpath Configuration YAML Parser and Writer",
     license="BSD-3",
-    tests_require=['pytest']
+    tests_require=['pytest', 'pytest-benchmark']
 )